@@ -0,0 +1,209 @@
+"""
+Kompresi response HTTP (gzip / brotli)
+
+CompressionMiddleware mengompres response HTML, JSON, CSV, CSS/JS sesuai
+Accept-Encoding client:
+- brotli (jika modul brotli ter-install) lebih diutamakan, lalu gzip
+- Body kecil (< COMPRESSION_MINIMUM_SIZE) dikirim apa adanya: header gzip
+  dan CPU-nya tidak sebanding dengan bytes yang dihemat
+- StreamingResponse (mis. export CSV) dikompres per chunk dan di-flush,
+  sehingga client tetap menerima data sedikit demi sedikit
+- Response yang sudah punya Content-Encoding (static hasil build, halaman
+  dari page cache) dilewati
+
+Body terkompres memakai ETag lemah (W/"...") karena bytes-nya berbeda
+dengan versi asli; http_cache tetap mencocokkannya untuk 304.
+"""
+
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import config
+from .static_assets import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli opsional
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Encoding terbaik yang diterima client: "br", "gzip", atau None"""
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """
+    Kompres seluruh body.
+
+    Args:
+        body: Bytes asli
+        encoding: "br" atau "gzip"
+        best: Level maksimum (untuk hasil yang di-cache dan dipakai ulang)
+    """
+    if encoding == "br":
+        # Quality 10-11 terlalu lambat untuk request yang sedang menunggu
+        quality = 9 if best else config.COMPRESSION_BROTLI_QUALITY
+        return brotli.compress(body, quality=quality)
+    level = 9 if best else config.COMPRESSION_GZIP_LEVEL
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def is_compressible(media_type: str) -> bool:
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def weak_etag(etag: str) -> str:
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class _StreamCompressor:
+    """Kompresi bertahap: setiap chunk langsung di-flush ke client"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(
+                quality=config.COMPRESSION_BROTLI_QUALITY
+            )
+        else:
+            # wbits 31 = format gzip (header + trailer CRC)
+            self._compressor = zlib.compressobj(
+                config.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31
+            )
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Middleware ASGI: gzip/brotli per request (lihat docstring modul)"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        extensions = scope.get("extensions") or {}
+        if "http.response.pathsend" in extensions:
+            # FileResponse harus mengirim body lewat message biasa agar bisa dikompres
+            extensions = dict(extensions)
+            del extensions["http.response.pathsend"]
+            scope = {**scope, "extensions": extensions}
+        await _CompressedResponder(self.app, encoding, self.minimum_size)(
+            scope, receive, send
+        )
+
+
+class _CompressedResponder:
+    """State 1 response: tunda header sampai chunk body pertama terlihat"""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.start = message
+            self.passthrough = (
+                "content-encoding" in headers
+                or "content-range" in headers
+                or message["status"] in (204, 206, 304)
+                or not is_compressible(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is not None:
+            data = self.stream.chunk(body) if body else b""
+            if not more_body:
+                data += self.stream.finish()
+            await self.send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+
+        if not more_body:
+            # Body lengkap dalam 1 message
+            if len(body) < self.minimum_size:
+                await self.send(self.start)
+                await self.send(message)
+                return
+            body = compress(body, self.encoding)
+            self._mark_encoded(headers)
+            headers["Content-Length"] = str(len(body))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        # Streaming: panjang total belum diketahui
+        self.stream = _StreamCompressor(self.encoding)
+        self._mark_encoded(headers)
+        if "content-length" in headers:
+            del headers["content-length"]
+        await self.send(self.start)
+        await self.send(
+            {
+                "type": "http.response.body",
+                "body": self.stream.chunk(body),
+                "more_body": True,
+            }
+        )
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        if "etag" in headers:
+            headers["ETag"] = weak_etag(headers["etag"])
@@ -17,6 +17,35 @@ DATABASE_URL = os.getenv(
     "DATABASE_URL", "mysql+mysqlconnector://root:@localhost/comparely"
 )
 
+# URL untuk engine async (AsyncSession). Jika kosong, diturunkan otomatis
+# dari DATABASE_URL dengan driver async (aiosqlite / aiomysql).
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+
+# Connection Pool Configuration (tidak berlaku untuk SQLite)
+# Total koneksi maksimal per worker = DB_POOL_SIZE + DB_MAX_OVERFLOW
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))  # Koneksi yang selalu dijaga
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # Koneksi tambahan saat ramai
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Detik menunggu koneksi
+# Recycle koneksi sebelum kena wait_timeout MySQL (default server: 8 jam)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Cek koneksi (ping) sebelum dipakai, supaya koneksi basi tidak bikin error
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# Read Replica Configuration
+# URL replica dipisah koma. Jika kosong, semua query memakai primary.
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+# Replica dengan lag lebih dari ini (detik) tidak dipakai untuk read
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+# Interval (detik) cek ulang kesehatan + lag setiap replica
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "10"))
+# Query custom untuk mengukur lag (hasil: detik), mis. dari tabel heartbeat.
+# Jika kosong, dipakai query bawaan sesuai database (SHOW REPLICA STATUS, dll).
+DB_REPLICA_LAG_QUERY = os.getenv("DB_REPLICA_LAG_QUERY", "")
+
 # AI Configuration
 AI_API_KEY = os.getenv("AI_API_KEY", "")
 AI_API_URL = "https://api.x.ai/v1/chat/completions"
@@ -25,6 +54,11 @@ AI_MODEL = "grok-4-latest"
 # AI Settings
 AI_TEMPERATURE = 0.7  # Kreativitas AI (0.0 = strict, 1.0 = creative)
 AI_MAX_TOKENS = 500  # Maksimal panjang response
+AI_TIMEOUT = float(os.getenv("AI_TIMEOUT", "30"))  # Timeout HTTP ke AI (detik)
+# Latency budget: request menunggu AI maksimal sekian detik, lalu menjawab
+# dengan analisis lokal; jawaban AI yang terlambat tetap masuk cache
+AI_DEADLINE_SECONDS = float(os.getenv("AI_DEADLINE_SECONDS", "2"))
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", "21600"))  # Cache jawaban AI (detik)
 
 # Use Case Options
 USE_CASES = ["gaming", "fotografi", "kerja", "kuliah", "multimedia"]
@@ -33,3 +67,127 @@ USE_CASES = ["gaming", "fotografi", "kerja", "kuliah", "multimedia"]
 N8N_WEBHOOK_URL = os.getenv("N8N_WEBHOOK_URL", "")
 N8N_ENABLED = os.getenv("N8N_ENABLED", "false").lower() == "true"
 N8N_TIMEOUT = int(os.getenv("N8N_TIMEOUT", "10"))
+# Hasil n8n di-cache (detik); request /compare/ tidak menunggu n8n
+N8N_CACHE_TTL = int(os.getenv("N8N_CACHE_TTL", "21600"))
+# Jika n8n gagal, pasangan device yang sama baru dicoba lagi setelah ini (detik)
+N8N_RETRY_AFTER = int(os.getenv("N8N_RETRY_AFTER", "60"))
+
+# Outbound Resilience (AI API & n8n)
+# Circuit breaker: terbuka jika >= UPSTREAM_FAILURE_RATE dari
+# UPSTREAM_WINDOW_SIZE panggilan terakhir gagal (atau hampir semua lambat),
+# lalu menolak panggilan selama UPSTREAM_OPEN_SECONDS sebelum dicoba lagi
+UPSTREAM_WINDOW_SIZE = int(os.getenv("UPSTREAM_WINDOW_SIZE", "20"))
+UPSTREAM_MIN_CALLS = int(os.getenv("UPSTREAM_MIN_CALLS", "5"))
+UPSTREAM_FAILURE_RATE = float(os.getenv("UPSTREAM_FAILURE_RATE", "0.5"))
+UPSTREAM_OPEN_SECONDS = float(os.getenv("UPSTREAM_OPEN_SECONDS", "30"))
+# Batas panggilan paralel adaptif (AIMD) per upstream
+UPSTREAM_INITIAL_CONCURRENCY = int(os.getenv("UPSTREAM_INITIAL_CONCURRENCY", "4"))
+UPSTREAM_MAX_CONCURRENCY = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "32"))
+# Panggilan lebih lama dari ini dihitung "lambat" (detik)
+AI_SLOW_CALL_SECONDS = float(os.getenv("AI_SLOW_CALL_SECONDS", "10"))
+N8N_SLOW_CALL_SECONDS = float(os.getenv("N8N_SLOW_CALL_SECONDS", "5"))
+
+# Comparison Matrix
+# Maksimal jumlah device di /compare/matrix
+COMPARE_MATRIX_MAX_DEVICES = int(os.getenv("COMPARE_MATRIX_MAX_DEVICES", "10"))
+
+# Percentile Index (badge "Top X% di kategori")
+# Batas rentang harga (Rupiah) untuk ranking per price band
+PERCENTILE_PRICE_BANDS = [
+    float(value)
+    for value in os.getenv(
+        "PERCENTILE_PRICE_BANDS", "2000000,4000000,7000000,12000000"
+    ).split(",")
+    if value.strip()
+]
+PERCENTILE_BADGE_TOP = int(os.getenv("PERCENTILE_BADGE_TOP", "25"))  # Top X% -> badge
+PERCENTILE_MIN_DEVICES = int(os.getenv("PERCENTILE_MIN_DEVICES", "5"))
+# Rebuild penuh berkala (detik) untuk menangkap perubahan dari worker lain
+PERCENTILE_INDEX_MAX_AGE = float(os.getenv("PERCENTILE_INDEX_MAX_AGE", "300"))
+
+# Index katalog: commit yang mengubah lebih dari sekian device (mis. import
+# massal) tidak diterapkan per device, index dibangun ulang di background
+CATALOG_INCREMENTAL_MAX_CHANGES = int(
+    os.getenv("CATALOG_INCREMENTAL_MAX_CHANGES", "200")
+)
+
+# Similar Devices (k-NN index untuk /devices/{id}/similar)
+# Jumlah tetangga yang disimpan per device (batas maksimal k)
+SIMILAR_INDEX_K = int(os.getenv("SIMILAR_INDEX_K", "20"))
+SIMILAR_INDEX_MAX_AGE = float(os.getenv("SIMILAR_INDEX_MAX_AGE", "300"))
+
+# Devices API (/devices/): ukuran halaman maksimal (pagination cursor)
+DEVICES_PAGE_MAX_LIMIT = int(os.getenv("DEVICES_PAGE_MAX_LIMIT", "100"))
+# Jumlah ID maksimal per request /devices/batch
+DEVICES_BATCH_MAX_IDS = int(os.getenv("DEVICES_BATCH_MAX_IDS", "300"))
+
+# Recommendation Scoring (skor per use case untuk /recommendation/)
+# Device disimpan per (use case, kategori, price band PERCENTILE_PRICE_BANDS)
+RECOMMENDATION_TOP_K = int(os.getenv("RECOMMENDATION_TOP_K", "50"))
+RECOMMENDATION_INDEX_MAX_AGE = float(os.getenv("RECOMMENDATION_INDEX_MAX_AGE", "300"))
+# Pareto frontier harga vs performa (/recommendation/best-value)
+VALUE_FRONTIER_MAX_AGE = float(os.getenv("VALUE_FRONTIER_MAX_AGE", "300"))
+
+# Facet Index (filter + jumlah per opsi dropdown di halaman /devices)
+FACET_INDEX_MAX_AGE = float(os.getenv("FACET_INDEX_MAX_AGE", "300"))
+
+# HTTP Conditional GET (ETag / Last-Modified) untuk detail & perbandingan device
+# max-age=0: browser selalu revalidasi (murah, 304); s-maxage: lama cache di
+# reverse proxy/CDN; stale-while-revalidate: proxy boleh kirim versi lama
+# sambil revalidasi di background
+HTTP_CACHE_CONTROL_API = os.getenv(
+    "HTTP_CACHE_CONTROL_API",
+    "public, max-age=0, s-maxage=60, stale-while-revalidate=300",
+)
+HTTP_CACHE_CONTROL_PAGES = os.getenv(
+    "HTTP_CACHE_CONTROL_PAGES",
+    "public, max-age=0, s-maxage=300, stale-while-revalidate=600",
+)
+# Ikut di-hash ke ETag; kosong = dihitung dari isi kode & template app/
+HTTP_CACHE_BUILD_ID = os.getenv("HTTP_CACHE_BUILD_ID", "")
+
+# Template Jinja2 (lihat core/templates.py)
+# Folder bytecode cache template; kosong = nonaktif
+TEMPLATE_BYTECODE_CACHE_DIR = os.getenv("TEMPLATE_BYTECODE_CACHE_DIR", ".cache/jinja2")
+# Cek perubahan file template setiap render (set false di production)
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "true").lower() == "true"
+# Compile semua template saat startup (request pertama tidak menunggu compile)
+TEMPLATE_PRECOMPILE = os.getenv("TEMPLATE_PRECOMPILE", "true").lower() == "true"
+
+# Static assets hasil build (python scripts/build_static.py): nama ber-hash,
+# manifest.json, varian .gz/.br. Jika folder belum ada, app/static di-serve apa adanya
+STATIC_BUILD_DIR = os.getenv("STATIC_BUILD_DIR", "build/static")
+
+# Kompresi response (gzip, atau brotli jika modul brotli ter-install)
+# Body lebih kecil dari ini (bytes) dikirim tanpa kompresi
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Page Cache (HTML halaman publik yang sudah di-render, per worker)
+# Total ukuran HTML yang disimpan (bytes, LRU); 0 = nonaktif
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# Umur maksimum halaman katalog (homepage, /devices), karena perubahan dari
+# worker lain tidak terlihat oleh cache di worker ini
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "60"))
+
+# Comparison Traffic & Precompute
+# Traffic perbandingan ditulis ke database tiap N request / N detik
+COMPARISON_TRAFFIC_FLUSH_EVERY = int(os.getenv("COMPARISON_TRAFFIC_FLUSH_EVERY", "50"))
+COMPARISON_TRAFFIC_FLUSH_INTERVAL = float(
+    os.getenv("COMPARISON_TRAFFIC_FLUSH_INTERVAL", "60")
+)
+# Batch job precompute analisis AI (scripts/precompute_comparisons.py)
+PRECOMPUTE_TOP_PAIRS = int(os.getenv("PRECOMPUTE_TOP_PAIRS", "50"))
+PRECOMPUTE_NEW_DEVICES = int(os.getenv("PRECOMPUTE_NEW_DEVICES", "20"))
+PRECOMPUTE_RIVALS = int(os.getenv("PRECOMPUTE_RIVALS", "3"))
+PRECOMPUTE_CONCURRENCY = int(os.getenv("PRECOMPUTE_CONCURRENCY", "4"))
+
+# Background Jobs
+# Jumlah thread untuk pekerjaan di luar request (enrichment n8n, dll)
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", "4"))
+
+# App Settings Cache
+# Interval (detik) untuk cek ulang versi settings di database.
+# Worker lain yang mengubah settings akan terlihat paling lambat setelah interval ini.
+SETTINGS_CACHE_CHECK_INTERVAL = float(os.getenv("SETTINGS_CACHE_CHECK_INTERVAL", "5"))
@@ -1,11 +1,19 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import SessionLocal
+from ..database import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_read_session,
+    read_session,
+)
+from .pool_metrics import tag_session_route
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_db(request: Request = None) -> Generator[Session, None, None]:
     """
     Dependency function untuk mendapatkan database session.
 
@@ -21,9 +29,69 @@ def get_db() -> Generator[Session, None, None]:
             return db.query(Item).all()
     """
     db = SessionLocal()
+
+    # Label route untuk metrik pool (durasi checkout per route)
+    _tag_route(db, request)
+
     try:
         # Yield session ke router
         yield db
     finally:
         # Pastikan session selalu di-close, bahkan jika ada error
         db.close()
+
+
+async def get_async_db(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency untuk mendapatkan AsyncSession (tidak memblokir event loop).
+
+    Dipakai oleh handler `async def` di router publik. Relationship
+    tidak bisa di-lazy load di AsyncSession, jadi gunakan fungsi di
+    `crud/device_async.py` yang sudah eager-load relasi yang dibutuhkan.
+
+    Contoh penggunaan di router:
+        @router.get("/")
+        async def read_items(db: AsyncSession = Depends(get_async_db)):
+            return await device_async.get_devices(db)
+    """
+    async with AsyncSessionLocal() as db:
+        _tag_route(db.sync_session, request)
+        yield db
+
+
+def get_read_db(request: Request = None) -> Generator[Session, None, None]:
+    """
+    Dependency session untuk endpoint read-only (analytics, export).
+
+    Query diarahkan ke read replica jika ada yang sehat dan lag-nya masih
+    dalam batas DB_REPLICA_MAX_LAG; jika tidak, ke primary. Jangan dipakai
+    untuk endpoint yang menulis ke database.
+    """
+    db = read_session()
+    _tag_route(db, request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    request: Request = None,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Versi async dari `get_read_db`, untuk router publik.
+
+    Contoh penggunaan di router:
+        @router.get("/")
+        async def read_items(db: AsyncSession = Depends(get_async_read_db)):
+            return await device_async.get_devices(db)
+    """
+    async with await async_read_session() as db:
+        _tag_route(db.sync_session, request)
+        yield db
+
+
+def _tag_route(db: Session, request: Optional[Request]) -> None:
+    route = request.scope.get("route") if request is not None else None
+    if route is not None:
+        tag_session_route(db, f"{request.method} {route.path}")
@@ -0,0 +1,172 @@
+"""
+HTTP Conditional GET (ETag / Last-Modified)
+
+Halaman dan API detail device dihitung ulang setiap request, padahal data
+device jarang berubah. Setiap Phone punya `revision` (naik setiap UPDATE)
+dan `updated_at`, sehingga versi response bisa diketahui tanpa render:
+
+- ETag kuat = hash dari (build, jenis response, revision device + data
+  turunan yang ikut tampil, mis. badge percentile atau status enrichment)
+- Last-Modified = updated_at terbaru dari device yang ditampilkan, atau
+  waktu build jika lebih baru. Hanya dikirim jika isi response murni dari
+  data device itu sendiri: data turunan (badge percentile, status
+  enrichment n8n) bisa berubah tanpa mengubah updated_at, sehingga
+  response seperti itu hanya memakai ETag
+
+Jika client/proxy mengirim If-None-Match (atau If-Modified-Since) yang
+cocok, endpoint langsung membalas 304 sebelum render template/serialisasi.
+
+Build ID ikut di-hash supaya deploy kode/template baru tidak menjawab 304
+untuk HTML lama. Set HTTP_CACHE_BUILD_ID (mis. git SHA) agar semua worker
+memakai nilai yang sama tanpa membaca source code.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+from fastapi import Request, Response
+
+from .. import models
+from . import config, static_assets
+
+_APP_DIR = Path(__file__).resolve().parents[1]
+_build_id: Optional[str] = None
+_build_time: Optional[datetime] = None
+
+
+class Validators(NamedTuple):
+    """Header validator untuk 1 representasi response"""
+
+    etag: str
+    last_modified: Optional[datetime]
+    cache_control: str
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def build_id() -> str:
+    """ID build: HTTP_CACHE_BUILD_ID, atau hash isi kode & template app/"""
+    global _build_id
+    if _build_id is None:
+        _build_id = config.HTTP_CACHE_BUILD_ID or _fingerprint_sources()
+    return _build_id
+
+
+def build_time() -> datetime:
+    """
+    Waktu build: mtime terbaru kode & template app/ dan manifest static.
+
+    Ikut menentukan Last-Modified, supaya client yang revalidasi hanya
+    dengan If-Modified-Since tidak mendapat 304 untuk response dari build
+    lama setelah deploy.
+    """
+    global _build_time
+    if _build_time is None:
+        paths = list(_source_files())
+        paths.append(Path(config.STATIC_BUILD_DIR) / static_assets.MANIFEST_NAME)
+        mtimes = [path.stat().st_mtime for path in paths if path.exists()]
+        _build_time = datetime.fromtimestamp(max(mtimes), timezone.utc).replace(
+            microsecond=0
+        )
+    return _build_time
+
+
+def _source_files():
+    for path in sorted(_APP_DIR.rglob("*")):
+        if path.suffix in (".py", ".html") and "__pycache__" not in path.parts:
+            yield path
+
+
+def _fingerprint_sources() -> str:
+    digest = hashlib.sha1()
+    # URL asset ber-hash di HTML ikut berubah setiap build static
+    digest.update(repr(sorted(static_assets.load_manifest().items())).encode())
+    for path in _source_files():
+        digest.update(path.relative_to(_APP_DIR).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def device_validators(
+    kind: str,
+    devices: Iterable[models.Phone],
+    *extra: Any,
+    cache_control: str,
+) -> Validators:
+    """
+    Hitung ETag & Last-Modified untuk response yang menampilkan `devices`.
+
+    Args:
+        kind: Jenis representasi (mis. "device-page"), agar HTML dan JSON
+            untuk device yang sama tidak berbagi ETag
+        devices: Device yang ditampilkan (kategori sudah ter-load)
+        extra: Data lain yang ikut menentukan isi response (harus repr-able).
+            Jika ada, Last-Modified tidak dikirim (hanya ETag)
+        cache_control: Nilai header Cache-Control
+
+    Returns:
+        Validators untuk not_modified() dan header response 200
+    """
+    devices = list(devices)
+    parts = [(device.id, device.revision, _category_name(device)) for device in devices]
+    digest = hashlib.sha1(
+        repr((build_id(), kind, parts, extra)).encode("utf-8")
+    ).hexdigest()
+
+    stamps = [device.updated_at for device in devices]
+    # Device lama (sebelum kolom updated_at ada) = waktu ubah tidak diketahui;
+    # data turunan (extra) tidak punya waktu ubah yang bisa dibandingkan
+    last_modified = None
+    if not extra and stamps and None not in stamps:
+        newest = max(stamps).replace(microsecond=0, tzinfo=timezone.utc)
+        last_modified = max(newest, build_time())
+
+    return Validators(f'"{digest[:32]}"', last_modified, cache_control)
+
+
+def _category_name(device: models.Phone) -> Optional[str]:
+    # Nama kategori ikut tampil jika relasinya sudah di-load (joinedload);
+    # jangan memicu lazy load hanya untuk ETag
+    category = device.__dict__.get("category")
+    return category.name if category is not None else None
+
+
+def is_fresh(request: Request, validators: Validators) -> bool:
+    """
+    True jika salinan milik client masih sama (RFC 9110 section 13.2.2).
+
+    If-None-Match lebih diutamakan; If-Modified-Since hanya dipakai jika
+    client tidak mengirim If-None-Match.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # GET memakai perbandingan lemah: W/"x" cocok dengan "x"
+        tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        return validators.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or validators.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return validators.last_modified <= since
+
+
+def not_modified(request: Request, validators: Validators) -> Optional[Response]:
+    """Response 304 jika salinan client masih berlaku, selain itu None"""
+    if is_fresh(request, validators):
+        return Response(status_code=304, headers=validators.headers())
+    return None
@@ -0,0 +1,134 @@
+"""
+Migrasi schema database bernomor versi
+
+Schema tidak lagi dibuat saat import app (create_all di main.py), tapi
+lewat command terpisah yang dijalankan sekali saat deploy:
+
+    python scripts/migrate.py            # jalankan migrasi yang belum
+    python scripts/migrate.py status     # daftar migrasi + status
+    python scripts/migrate.py stamp 0003 # tandai sudah jalan tanpa eksekusi
+
+Setiap migrasi adalah modul di app/migrations bernama NNNN_nama.py dengan
+fungsi upgrade(connection). Versi yang sudah dijalankan dicatat di tabel
+schema_migrations; setiap migrasi berjalan dalam transaksinya sendiri
+(catatan: DDL MySQL auto-commit, jadi migrasi ditulis idempotent).
+"""
+
+import importlib
+import pkgutil
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional, Set
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+MIGRATIONS_PACKAGE = "app.migrations"
+
+# MetaData terpisah: tabel versi tidak ikut Base.metadata (models)
+version_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    version_metadata,
+    Column("version", String(32), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: str
+    name: str
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def discover() -> List[Migration]:
+    """Semua migrasi di app/migrations, urut versi"""
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    migrations = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        version, _, name = module_info.name.partition("_")
+        if not version.isdigit():
+            continue
+        module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{module_info.name}")
+        description = (module.__doc__ or name).strip().splitlines()[0]
+        migrations.append(Migration(version, name, description, module.upgrade))
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Versi migrasi ganda di {MIGRATIONS_PACKAGE}: {versions}")
+    return migrations
+
+
+def applied_versions(engine: Engine) -> Set[str]:
+    """Versi yang sudah dijalankan (kosong jika tabel versi belum ada)"""
+    with engine.connect() as connection:
+        if not inspect(connection).has_table(schema_migrations.name):
+            return set()
+        return set(connection.scalars(select(schema_migrations.c.version)))
+
+
+def pending(engine: Engine) -> List[Migration]:
+    """Migrasi yang belum dijalankan, urut versi"""
+    applied = applied_versions(engine)
+    return [migration for migration in discover() if migration.version not in applied]
+
+
+def upgrade(
+    engine: Engine, target: Optional[str] = None, log: Callable[[str], None] = print
+) -> List[str]:
+    """
+    Jalankan migrasi yang belum sampai versi target.
+
+    Args:
+        engine: Engine database tujuan
+        target: Versi terakhir yang dijalankan (default: semua)
+        log: Fungsi untuk menampilkan progress
+
+    Returns:
+        Versi yang dijalankan
+    """
+    version_metadata.create_all(engine)
+    executed = []
+    for migration in pending(engine):
+        if target is not None and migration.version > target:
+            break
+        log(f"Applying {migration.version}_{migration.name}: {migration.description}")
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(
+                schema_migrations.insert().values(
+                    version=migration.version, applied_at=datetime.utcnow()
+                )
+            )
+        executed.append(migration.version)
+    return executed
+
+
+def stamp(engine: Engine, version: str) -> List[str]:
+    """
+    Tandai migrasi sampai versi tertentu sebagai sudah jalan, tanpa eksekusi
+    (mis. database yang schema-nya sudah diubah manual dengan script SQL).
+
+    Returns:
+        Versi yang baru ditandai
+    """
+    known = [migration.version for migration in discover()]
+    if version not in known:
+        raise ValueError(f"Versi migrasi '{version}' tidak ada (tersedia: {known})")
+
+    version_metadata.create_all(engine)
+    stamped = []
+    with engine.begin() as connection:
+        applied = set(connection.scalars(select(schema_migrations.c.version)))
+        for migration_version in known:
+            if migration_version > version:
+                break
+            if migration_version not in applied:
+                connection.execute(
+                    schema_migrations.insert().values(
+                        version=migration_version, applied_at=datetime.utcnow()
+                    )
+                )
+                stamped.append(migration_version)
+    return stamped
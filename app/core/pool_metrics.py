@@ -0,0 +1,225 @@
+"""
+Instrumentasi connection pool SQLAlchemy.
+
+Mencatat:
+- Jumlah koneksi checked-out, overflow, ukuran pool (live dari pool)
+- Histogram waktu tunggu saat mengambil koneksi dari pool
+- Lama koneksi dipegang (checkout -> checkin) per route
+- Jumlah timeout pool dan koneksi yang di-invalidate
+
+Data ditampilkan di endpoint admin `/admin/tools/pool-stats`.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Batas atas bucket histogram (milidetik); bucket terakhir = +Inf
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Label route untuk koneksi yang tidak berasal dari request (script, background job)
+UNKNOWN_ROUTE = "other"
+
+
+class Histogram:
+    """Histogram sederhana dengan bucket tetap (thread-safe)"""
+
+    def __init__(self, buckets_ms=DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * (len(self.buckets_ms) + 1)
+            self.count = 0
+            self.total_ms = 0.0
+            self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect_left(self.buckets_ms, ms)] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"<={b}ms" for b in self.buckets_ms] + ["+Inf"]
+            return {
+                "count": self.count,
+                "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "buckets": dict(zip(labels, self.counts)),
+            }
+
+
+class PoolMetrics:
+    """Kumpulan metrik untuk 1 engine"""
+
+    def __init__(self):
+        self.engine: Optional[Engine] = None
+        self.wait_time = Histogram()
+        self.checkout_duration: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self.timeouts = 0
+        self.invalidated = 0
+        self.connects = 0
+
+    # ==================== RECORDING ====================
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_time.observe(seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_checkout_duration(self, route: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.checkout_duration.get(route)
+            if histogram is None:
+                histogram = self.checkout_duration[route] = Histogram()
+        histogram.observe(seconds)
+
+    def reset(self) -> None:
+        """Reset semua counter (pool state live tidak terpengaruh)"""
+        self.wait_time.reset()
+        with self._lock:
+            self.checkout_duration = {}
+            self.timeouts = 0
+            self.invalidated = 0
+            self.connects = 0
+
+    # ==================== WIRING ====================
+
+    def attach(self, engine: Engine) -> None:
+        """
+        Pasang event listener pool ke engine.
+
+        Untuk AsyncEngine, berikan `async_engine.sync_engine`.
+        """
+        self.engine = engine
+        pool = engine.pool
+        if isinstance(pool, _WaitTimeInstrumentation):
+            pool.metrics = self
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            connection_record.info["checkout_at"] = time.perf_counter()
+
+        @event.listens_for(engine, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            started = connection_record.info.pop("checkout_at", None)
+            route = connection_record.info.pop("route", None) or UNKNOWN_ROUTE
+            if started is not None:
+                self.record_checkout_duration(route, time.perf_counter() - started)
+
+        @event.listens_for(engine, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidated += 1
+
+    # ==================== REPORT ====================
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State pool saat ini + metrik yang terkumpul"""
+        pool = self.engine.pool if self.engine is not None else None
+        state: Dict[str, Any] = {"pool_class": type(pool).__name__ if pool else None}
+
+        if isinstance(pool, QueuePool):
+            state.update(
+                {
+                    "size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                    "max_overflow": pool._max_overflow,
+                    "timeout": pool.timeout(),
+                }
+            )
+        elif pool is not None:
+            state["status"] = pool.status()
+
+        with self._lock:
+            routes: List[str] = sorted(self.checkout_duration)
+            counters = {
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "invalidated": self.invalidated,
+            }
+
+        return {
+            "pool": state,
+            **counters,
+            "wait_time": self.wait_time.snapshot(),
+            "checkout_duration_by_route": {
+                route: self.checkout_duration[route].snapshot() for route in routes
+            },
+        }
+
+
+class _WaitTimeInstrumentation:
+    """
+    Mixin untuk QueuePool yang mengukur waktu tunggu pengambilan koneksi.
+
+    Event pool bawaan SQLAlchemy hanya memberi tahu *setelah* koneksi
+    didapat, jadi waktu antri di pool diukur langsung di `_do_get`.
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        # Dipanggil saat engine.dispose(); metrics tetap terpasang di pool baru
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_WaitTimeInstrumentation, QueuePool):
+    """QueuePool (engine sync) dengan pengukuran waktu tunggu"""
+
+
+class InstrumentedAsyncQueuePool(_WaitTimeInstrumentation, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool (engine async) dengan pengukuran waktu tunggu"""
+
+
+def tag_session_route(session: Session, route: str) -> None:
+    """
+    Tandai session dengan nama route.
+
+    Saat session mengambil koneksi, label ini disalin ke connection record
+    sehingga lama checkout bisa dikelompokkan per route.
+    """
+    session.info["route"] = route
+
+
+@event.listens_for(Session, "after_begin")
+def _copy_route_to_connection(session, transaction, connection):
+    route = session.info.get("route")
+    if route:
+        connection.info["route"] = route
@@ -10,7 +10,8 @@ from fastapi import Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db
-from app.models import Role, User
+from app.crud import user as user_crud
+from app.models import User
 
 
 def get_current_user_with_role(
@@ -23,11 +24,9 @@ def get_current_user_with_role(
     user_id = request.session.get("user_id") if hasattr(request, "session") else None
 
     if user_id:
-        user = db.query(User).filter(User.id == user_id).first()
+        # Role di-load sekaligus via JOIN
+        user = user_crud.get_user_with_role(db, user_id)
         if user:
-            # Load role relationship
-            if user.role_id:
-                user.role = db.query(Role).filter(Role.id == user.role_id).first()
             return user
 
     return None
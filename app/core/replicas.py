@@ -0,0 +1,226 @@
+"""
+Routing query read ke read replica.
+
+Write (admin CRUD, import, log) selalu ke primary. Read-only (router
+publik, analytics, export) bisa memakai replica lewat `ReplicaRouter`:
+- Replica dipilih bergantian (round robin)
+- Replica yang down atau lag-nya > `max_lag` dilewati
+- Status replica di-cache selama `check_interval` detik
+- Jika tidak ada replica yang layak, read kembali ke primary
+
+Status ditampilkan di endpoint admin `/admin/tools/replicas`.
+"""
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Fungsi pengukur lag: menerima koneksi ke replica, mengembalikan lag (detik).
+# None = lag tidak diketahui (bukan replica / database tidak mendukung).
+LagProbe = Callable[[Connection], Optional[float]]
+
+
+def default_lag_probe(connection: Connection) -> Optional[float]:
+    """
+    Ukur lag replica dengan query bawaan database.
+
+    - MySQL: `Seconds_Behind_Source` dari SHOW REPLICA STATUS
+    - PostgreSQL: selisih now() dengan transaksi terakhir yang di-replay
+    - Lainnya (SQLite): None, hanya cek koneksi
+
+    Replica yang replikasinya berhenti (nilai NULL) dianggap tidak sehat.
+    """
+    backend = connection.dialect.name
+
+    if backend == "mysql":
+        for query, column in (
+            ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+            ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),  # MySQL < 8.0.22
+        ):
+            try:
+                row = connection.execute(text(query)).mappings().first()
+            except Exception:
+                continue
+            if row is None:
+                return None
+            lag = row.get(column)
+            if lag is None:
+                raise RuntimeError(f"Replikasi berhenti ({column} NULL)")
+            return float(lag)
+        return None
+
+    if backend == "postgresql":
+        lag = connection.execute(
+            text("SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())")
+        ).scalar()
+        return None if lag is None else max(float(lag), 0.0)
+
+    return None
+
+
+def query_lag_probe(query: str) -> LagProbe:
+    """
+    Buat lag probe dari query SQL custom (hasil: 1 angka, detik).
+
+    Berguna untuk tabel heartbeat yang ditulis berkala di primary, mis.
+    `SELECT (julianday('now') - julianday(max(ts))) * 86400 FROM heartbeat`.
+    """
+
+    def probe(connection: Connection) -> Optional[float]:
+        lag = connection.execute(text(query)).scalar()
+        return None if lag is None else float(lag)
+
+    return probe
+
+
+@dataclass
+class Replica:
+    """1 read replica beserta status kesehatan terakhirnya"""
+
+    engine: Engine
+    async_engine: Optional[AsyncEngine] = None
+    healthy: bool = False
+    lag: Optional[float] = None
+    error: Optional[str] = None
+    checked_at: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaRouter:
+    """
+    Memilih engine untuk query read-only.
+
+    Contoh:
+        router = ReplicaRouter(engine, async_engine, replicas, max_lag=5)
+        db = SessionLocal(bind=router.read_engine())
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        async_primary: Optional[AsyncEngine] = None,
+        replicas: Optional[List[Replica]] = None,
+        max_lag: float = 5.0,
+        check_interval: float = 10.0,
+        lag_probe: LagProbe = default_lag_probe,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.primary = primary
+        self.async_primary = async_primary
+        self.replicas = list(replicas or [])
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self._clock = clock
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+
+    # ==================== ROUTING ====================
+
+    def read_engine(self) -> Engine:
+        """Engine untuk read (sync): replica yang layak, atau primary"""
+        for replica in self._rotation():
+            if self._is_stale(replica):
+                self._apply(replica, self._probe_sync(replica))
+            if self._usable(replica):
+                self._count(fallback=False)
+                return replica.engine
+        if self.replicas:
+            self._count(fallback=True)
+        return self.primary
+
+    async def async_read_engine(self) -> AsyncEngine:
+        """Engine untuk read (async). Probe replica tidak memblokir event loop."""
+        for replica in self._rotation():
+            if replica.async_engine is None:
+                continue
+            if self._is_stale(replica):
+                self._apply(replica, await self._probe_async(replica))
+            if self._usable(replica):
+                self._count(fallback=False)
+                return replica.async_engine
+        if self.replicas:
+            self._count(fallback=True)
+        return self.async_primary
+
+    def invalidate(self) -> None:
+        """Paksa cek ulang semua replica pada read berikutnya"""
+        for replica in self.replicas:
+            replica.checked_at = None
+
+    # ==================== HEALTH CHECK ====================
+
+    def _rotation(self) -> List[Replica]:
+        if not self.replicas:
+            return []
+        start = next(self._next) % len(self.replicas)
+        return self.replicas[start:] + self.replicas[:start]
+
+    def _is_stale(self, replica: Replica) -> bool:
+        return (
+            replica.checked_at is None
+            or self._clock() - replica.checked_at >= self.check_interval
+        )
+
+    def _usable(self, replica: Replica) -> bool:
+        return replica.healthy and (replica.lag is None or replica.lag <= self.max_lag)
+
+    def _probe_sync(self, replica: Replica) -> Dict[str, Any]:
+        try:
+            with replica.engine.connect() as connection:
+                return {"lag": self.lag_probe(connection)}
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _probe_async(self, replica: Replica) -> Dict[str, Any]:
+        try:
+            async with replica.async_engine.connect() as connection:
+                return {"lag": await connection.run_sync(self.lag_probe)}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _apply(self, replica: Replica, result: Dict[str, Any]) -> None:
+        replica.checked_at = self._clock()
+        replica.error = result.get("error")
+        replica.healthy = replica.error is None
+        replica.lag = result.get("lag")
+
+    def _count(self, fallback: bool) -> None:
+        with self._lock:
+            if fallback:
+                self.primary_fallbacks += 1
+            else:
+                self.replica_reads += 1
+
+    # ==================== REPORT ====================
+
+    def status(self) -> Dict[str, Any]:
+        """Status setiap replica + jumlah read per tujuan"""
+        return {
+            "max_lag": self.max_lag,
+            "check_interval": self.check_interval,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [
+                {
+                    "url": replica.name,
+                    "healthy": replica.healthy,
+                    "usable": self._usable(replica),
+                    "lag": replica.lag,
+                    "error": replica.error,
+                    "checked": replica.checked_at is not None,
+                }
+                for replica in self.replicas
+            ],
+        }
@@ -0,0 +1,45 @@
+"""
+Response JSON cepat untuk list data besar
+
+`FastJSONResponse` langsung men-serialize list/dict biasa (mis. hasil
+SELECT beberapa kolom) tanpa melewati validasi Pydantic per baris.
+Memakai orjson jika ter-install, jika tidak kembali ke modul json bawaan.
+
+Decimal (harga) ditulis sebagai string, sama seperti response Pydantic,
+sehingga client tidak melihat perbedaan format.
+"""
+
+import json
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson opsional
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Tipe {type(value).__name__} tidak bisa di-serialize")
+
+
+def dumps(content: Any) -> bytes:
+    """Object -> JSON bytes (orjson jika ada)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse yang memakai `dumps` di atas"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,254 @@
+"""
+Registry untuk App Settings (tabel app_settings).
+
+Semua baris app_settings di-load sekali ke memory, lalu semua pembacaan
+dilayani dari cache. Setiap penulisan menaikkan baris versi
+(`_settings_version`) dalam transaksi yang sama, sehingga worker lain
+tahu cache-nya basi dan me-reload di pengecekan berikutnya.
+
+Contoh:
+    from app.core.settings_registry import settings_registry
+
+    per_page = settings_registry.get(db, "items_per_page")  # -> int
+    settings_registry.set_many(db, {"items_per_page": 50, "date_format": "DD/MM/YYYY"})
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.settings import AppSettings
+
+from .config import SETTINGS_CACHE_CHECK_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Key khusus untuk version stamp (tidak ikut dikembalikan sebagai setting)
+VERSION_KEY = "_settings_version"
+
+
+@dataclass(frozen=True)
+class SettingSpec:
+    """Definisi 1 setting: key, tipe, default, dan deskripsi"""
+
+    key: str
+    type: type
+    default: Any
+    description: str = ""
+
+
+# Daftar setting yang dikenal aplikasi
+SETTINGS: Dict[str, SettingSpec] = {
+    spec.key: spec
+    for spec in [
+        SettingSpec("site_name", str, "COMPARELY", "Nama aplikasi"),
+        SettingSpec(
+            "site_description",
+            str,
+            "Platform Perbandingan Perangkat Terlengkap",
+            "Deskripsi aplikasi",
+        ),
+        SettingSpec("maintenance_mode", bool, False, "Mode maintenance"),
+        SettingSpec("ai_api_key", str, "", "AI API Key for recommendations"),
+        SettingSpec("enable_ai", bool, True, "Aktifkan fitur AI recommendation"),
+        SettingSpec("enable_notifications", bool, True, "Aktifkan sistem notifikasi"),
+        SettingSpec("items_per_page", int, 20, "Number of items per page"),
+        SettingSpec("date_format", str, "YYYY-MM-DD", "Date format for display"),
+        SettingSpec("max_comparison", int, 5, "Maksimal device untuk compare"),
+        SettingSpec("session_timeout", int, 3600, "Session timeout dalam detik"),
+        SettingSpec("max_upload_size", int, 5242880, "Maksimal ukuran upload (bytes)"),
+        SettingSpec("default_currency", str, "IDR", "Mata uang default"),
+        SettingSpec("last_backup_date", str, "Never", "Waktu backup database terakhir"),
+    ]
+}
+
+
+def _parse(spec: Optional[SettingSpec], raw: Optional[str], default: Any) -> Any:
+    """Convert nilai string dari database ke tipe yang didefinisikan spec"""
+    if raw is None:
+        return default
+    if spec is None or spec.type is str:
+        return raw
+    if spec.type is bool:
+        return raw.strip().lower() in ("1", "true", "yes", "on")
+    try:
+        return spec.type(raw)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for setting {spec.key!r}: {raw!r}")
+        return default
+
+
+def _serialize(value: Any) -> str:
+    """Convert nilai Python ke string untuk disimpan di database"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else str(value)
+
+
+class SettingsRegistry:
+    """
+    Cache in-memory untuk app_settings dengan version stamp.
+
+    - Load: 1 query untuk semua baris.
+    - Read: dari memory; versi dicek ulang (1 query ringan) paling sering
+      setiap `check_interval` detik.
+    - Write: semua key dalam 1 transaksi + kenaikan versi.
+    """
+
+    def __init__(self, check_interval: float = SETTINGS_CACHE_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._values: Dict[str, str] = {}
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+
+    # ==================== READ ====================
+
+    def get(self, db: Session, key: str, default: Any = None) -> Any:
+        """Ambil 1 setting (sudah di-convert ke tipenya)"""
+        self._ensure_fresh(db)
+        spec = SETTINGS.get(key)
+        if default is None and spec is not None:
+            default = spec.default
+        return _parse(spec, self._values.get(key), default)
+
+    def get_many(self, db: Session, keys: Iterable[str]) -> Dict[str, Any]:
+        """Ambil beberapa setting sekaligus"""
+        self._ensure_fresh(db)
+        return {key: self.get(db, key) for key in keys}
+
+    def all(self, db: Session) -> Dict[str, Any]:
+        """Semua setting yang terdaftar + yang ada di database"""
+        self._ensure_fresh(db)
+        keys = set(SETTINGS) | set(self._values)
+        return {key: self.get(db, key) for key in sorted(keys)}
+
+    @property
+    def version(self) -> Optional[int]:
+        """Versi cache saat ini (None jika belum pernah di-load)"""
+        return self._version
+
+    # ==================== WRITE ====================
+
+    def set(self, db: Session, key: str, value: Any) -> None:
+        """Simpan 1 setting"""
+        self.set_many(db, {key: value})
+
+    def set_many(
+        self,
+        db: Session,
+        values: Dict[str, Any],
+        descriptions: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Simpan beberapa setting dalam 1 transaksi.
+
+        Baris versi dikunci (SELECT ... FOR UPDATE di MySQL) dan dinaikkan
+        di transaksi yang sama, jadi worker lain akan me-reload cache.
+
+        Args:
+            db: Database session
+            values: {key: nilai}
+            descriptions: Deskripsi per key (opsional). Tanpa ini, baris baru
+                memakai deskripsi dari SETTINGS dan baris lama tidak diubah.
+        """
+        if not values:
+            return
+        descriptions = descriptions or {}
+
+        serialized = {key: _serialize(value) for key, value in values.items()}
+
+        try:
+            version_row = (
+                db.query(AppSettings)
+                .filter(AppSettings.key == VERSION_KEY)
+                .with_for_update()
+                .first()
+            )
+            existing = {
+                row.key: row
+                for row in db.query(AppSettings).filter(
+                    AppSettings.key.in_(list(serialized))
+                )
+            }
+
+            for key, value in serialized.items():
+                row = existing.get(key)
+                if row is not None:
+                    row.value = value
+                    if key in descriptions:
+                        row.description = descriptions[key]
+                else:
+                    spec = SETTINGS.get(key)
+                    db.add(
+                        AppSettings(
+                            key=key,
+                            value=value,
+                            description=descriptions.get(
+                                key, spec.description if spec else None
+                            ),
+                        )
+                    )
+
+            if version_row is None:
+                version_row = AppSettings(
+                    key=VERSION_KEY, value="0", description="Settings cache version"
+                )
+                db.add(version_row)
+            new_version = int(version_row.value or 0) + 1
+            version_row.value = str(new_version)
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        with self._lock:
+            if self._version is not None and self._version + 1 == new_version:
+                # Tidak ada writer lain di antaranya: cukup update cache lokal
+                self._values.update(serialized)
+                self._version = new_version
+            else:
+                # Ada perubahan dari worker lain, reload penuh di read berikutnya
+                self._version = None
+            self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Paksa reload di pembacaan berikutnya"""
+        with self._lock:
+            self._version = None
+
+    # ==================== INTERNAL ====================
+
+    def _ensure_fresh(self, db: Session) -> None:
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+
+        with self._lock:
+            if self._version is None:
+                self._reload(db)
+            else:
+                row = (
+                    db.query(AppSettings.value)
+                    .filter(AppSettings.key == VERSION_KEY)
+                    .first()
+                )
+                db_version = int(row[0] or 0) if row else 0
+                if db_version != self._version:
+                    self._reload(db)
+            self._checked_at = now
+
+    def _reload(self, db: Session) -> None:
+        rows = db.query(AppSettings.key, AppSettings.value).all()
+        values = {key: value for key, value in rows}
+        self._version = int(values.pop(VERSION_KEY, None) or 0)
+        self._values = values
+
+
+# Instance global (1 per worker process)
+settings_registry = SettingsRegistry()
@@ -0,0 +1,224 @@
+"""
+Static asset pipeline: fingerprint + precompress + serve
+
+Build (scripts/build_static.py, sekali saat deploy):
+- Setiap file di app/static disalin ke STATIC_BUILD_DIR dengan nama asli
+  dan nama ber-hash isi, mis. css/style.css -> css/style.3f2a1b9c.css
+- manifest.json memetakan nama asli -> nama ber-hash
+- File teks (CSS, JS, SVG, ...) dikompres ke .gz dan .br (jika modul
+  brotli ter-install); varian hanya disimpan jika lebih kecil
+
+Runtime:
+- Template memakai {{ static_url('css/style.css') }} -> URL ber-hash dari
+  manifest (atau nama asli jika belum di-build, mis. saat development)
+- PrecompressedStaticFiles mengirim varian .br / .gz sesuai
+  Accept-Encoding, tanpa kompresi per request. File ber-hash isinya tidak
+  pernah berubah, jadi boleh di-cache selamanya (immutable).
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import stat
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Scope
+
+from . import config
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli opsional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+SOURCE_DIR = Path(__file__).resolve().parents[1] / "static"
+MANIFEST_NAME = "manifest.json"
+STATIC_PREFIX = "/static/"
+
+# Ekstensi yang dikompres (gambar PNG/JPG sudah terkompres)
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".json", ".txt", ".html", ".ico"}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Nama asli bisa berubah isi kapan saja: selalu revalidasi (ETag -> 304)
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# (Content-Encoding, suffix file), urutan = prioritas
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+# ==================== BUILD ====================
+
+
+def fingerprint(path: Path, content: bytes) -> str:
+    """css/style.css -> css/style.<8 hex hash isi>.css"""
+    digest = hashlib.md5(content).hexdigest()[:8]
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+
+def _write_compressed(target: Path, content: bytes) -> List[str]:
+    """Tulis varian .gz / .br jika lebih kecil dari aslinya"""
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+
+    written = []
+    for suffix, data in variants.items():
+        if len(data) < len(content):
+            target.with_name(target.name + suffix).write_bytes(data)
+            written.append(suffix)
+    return written
+
+
+def build(source: Path = SOURCE_DIR, target: Optional[Path] = None) -> Dict[str, str]:
+    """
+    Bangun folder static siap deploy.
+
+    Args:
+        source: Folder asset asli (app/static)
+        target: Folder hasil build (default STATIC_BUILD_DIR). File ber-hash
+            dari build sebelumnya tidak dihapus, supaya halaman yang
+            di-render sebelum deploy (cache browser/proxy) tetap bisa
+            memuat asset lamanya
+
+    Returns:
+        Manifest {nama asli: nama ber-hash}, path relatif dengan "/"
+    """
+    target = Path(target or config.STATIC_BUILD_DIR)
+
+    manifest = {}
+    for path in sorted(source.rglob("*")):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(source)
+        content = path.read_bytes()
+        hashed = fingerprint(relative, content)
+        manifest[relative.as_posix()] = hashed
+
+        for name in (relative.as_posix(), hashed):
+            destination = target / name
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            destination.write_bytes(content)
+            if path.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+                _write_compressed(destination, content)
+
+    (target / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+# ==================== RUNTIME ====================
+
+_manifest: Optional[Dict[str, str]] = None
+
+
+def static_dir() -> str:
+    """Folder yang di-serve di /static: hasil build jika ada, jika tidak app/static"""
+    if (Path(config.STATIC_BUILD_DIR) / MANIFEST_NAME).is_file():
+        return str(config.STATIC_BUILD_DIR)
+    return str(SOURCE_DIR)
+
+
+def load_manifest() -> Dict[str, str]:
+    """Manifest hasil build (dibaca sekali per proses), {} jika belum di-build"""
+    global _manifest
+    if _manifest is None:
+        path = Path(config.STATIC_BUILD_DIR) / MANIFEST_NAME
+        try:
+            _manifest = json.loads(path.read_text())
+        except FileNotFoundError:
+            _manifest = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Static manifest {path} tidak terbaca: {e}")
+            _manifest = {}
+    return _manifest
+
+
+def static_url(path: str) -> str:
+    """
+    URL asset untuk template: static_url('css/style.css').
+
+    Returns:
+        /static/css/style.<hash>.css jika sudah di-build, jika tidak
+        /static/css/style.css
+    """
+    path = path.lstrip("/")
+    return STATIC_PREFIX + load_manifest().get(path, path)
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """Encoding yang diterima client (q=0 berarti ditolak)"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles yang mengirim varian .br / .gz hasil build.
+
+    - Varian dipilih dari Accept-Encoding (br > gzip > asli)
+    - File ber-hash (ada di manifest): Cache-Control immutable 1 tahun
+    - File lain: no-cache (browser revalidasi dengan ETag)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable = set(load_manifest().values())
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = None
+        relative = path.replace(os.sep, "/")
+        if scope["method"] in ("GET", "HEAD"):
+            accepted = accepted_encodings(
+                Headers(scope=scope).get("accept-encoding", "")
+            )
+            response = await self._precompressed(path, scope, accepted)
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = (
+                IMMUTABLE_CACHE_CONTROL
+                if relative in self.immutable
+                else REVALIDATE_CACHE_CONTROL
+            )
+            if Path(path).suffix.lower() in COMPRESSIBLE_SUFFIXES:
+                response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    async def _precompressed(
+        self, path: str, scope: Scope, accepted: set
+    ) -> Optional[Response]:
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                full_path, stat_result = await anyio.to_thread.run_sync(
+                    self.lookup_path, path + suffix
+                )
+            except (OSError, ValueError):
+                return None
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                # Content-Type tetap dari nama asli (mimetypes: style.css.gz
+                # -> text/css), ETag dari file varian
+                response = self.file_response(full_path, stat_result, scope)
+                response.headers["Content-Encoding"] = encoding
+                return response
+        return None
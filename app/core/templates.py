@@ -0,0 +1,77 @@
+"""
+Environment Jinja2 bersama untuk semua router
+
+Sebelumnya setiap router membuat `Jinja2Templates(directory=...)` sendiri,
+sehingga template yang sama di-compile berkali-kali per worker (sekali per
+environment) dan baru saat request pertama ke halaman tersebut.
+
+Sekarang semua router memakai 1 `environment` dengan:
+- Bytecode cache di disk (TEMPLATE_BYTECODE_CACHE_DIR): worker baru / restart
+  cukup memuat bytecode, tidak parse + compile ulang source template
+- precompile(): compile semua template saat startup (TEMPLATE_PRECOMPILE),
+  jadi request pertama tidak menanggung biaya compile
+- Cache bisa disiapkan saat deploy: python scripts/precompile_templates.py
+"""
+
+import logging
+import time
+from pathlib import Path
+
+import jinja2
+from fastapi.templating import Jinja2Templates
+
+from . import config
+from .static_assets import static_url
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "templates"
+
+
+def create_environment() -> jinja2.Environment:
+    """Environment Jinja2 (setara default Jinja2Templates + bytecode cache)"""
+    bytecode_cache = None
+    if config.TEMPLATE_BYTECODE_CACHE_DIR:
+        cache_dir = Path(config.TEMPLATE_BYTECODE_CACHE_DIR)
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(str(cache_dir))
+        except OSError as e:
+            # Mis. filesystem read-only: tetap jalan tanpa bytecode cache
+            logger.warning(f"Template bytecode cache disabled: {e}")
+
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(str(TEMPLATES_DIR)),
+        autoescape=jinja2.select_autoescape(),
+        bytecode_cache=bytecode_cache,
+        # False di production: tidak stat file template setiap render
+        auto_reload=config.TEMPLATE_AUTO_RELOAD,
+    )
+    # URL asset ber-hash dari manifest build (lihat static_assets.py)
+    env.globals["static_url"] = static_url
+    return env
+
+
+def precompile(env: jinja2.Environment = None) -> int:
+    """
+    Compile semua template (dan tulis bytecode cache jika aktif).
+
+    Returns:
+        Jumlah template yang di-compile
+    """
+    env = env or environment
+    started = time.perf_counter()
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    logger.info(
+        f"Precompiled {len(names)} templates in "
+        f"{(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    return len(names)
+
+
+environment = create_environment()
+
+# Untuk router yang tidak butuh cache halaman (admin, dll)
+templates = Jinja2Templates(env=environment)
@@ -0,0 +1,215 @@
+"""
+CRUD untuk traffic perbandingan dan analisis AI yang tersimpan.
+
+Semua fungsi menerima pasangan device dalam urutan apa pun;
+urutan dinormalisasi dengan `canonical_pair`.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import ComparisonAnalysis, ComparisonTraffic, Phone
+
+Pair = Tuple[int, int]
+
+
+def canonical_pair(device_id_1: int, device_id_2: int) -> Pair:
+    """(ID kecil, ID besar) - pasangan A vs B sama dengan B vs A"""
+    return (min(device_id_1, device_id_2), max(device_id_1, device_id_2))
+
+
+# ==================== TRAFFIC ====================
+
+
+def add_comparison_counts(
+    db: Session, counts: Dict[Pair, int], requested_at: Optional[datetime] = None
+) -> None:
+    """
+    Tambahkan jumlah request per pasangan (hasil buffer in-memory) ke tabel.
+
+    Penambahan dilakukan atomik di database (request_count = request_count
+    + n, upsert untuk pasangan baru), sehingga flush dari beberapa worker
+    sekaligus tidak saling menimpa atau bentrok di uq_traffic_pair.
+
+    Args:
+        db: Database session (primary)
+        counts: {(low_id, high_id): jumlah request}
+        requested_at: Waktu request terakhir (default: sekarang)
+    """
+    if not counts:
+        return
+    requested_at = requested_at or datetime.utcnow()
+    table = ComparisonTraffic.__table__
+    # Urutan tetap: worker yang flush bersamaan mengunci baris dengan urutan sama
+    rows = [
+        {
+            "device_low_id": low,
+            "device_high_id": high,
+            "request_count": count,
+            "last_requested_at": requested_at,
+        }
+        for (low, high), count in sorted(counts.items())
+    ]
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        insert = mysql.insert(table)
+        statement = insert.on_duplicate_key_update(
+            request_count=table.c.request_count + insert.inserted.request_count,
+            last_requested_at=insert.inserted.last_requested_at,
+        )
+        db.execute(statement, rows)
+    elif dialect in ("sqlite", "postgresql"):
+        insert = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(table)
+        statement = insert.on_conflict_do_update(
+            index_elements=[table.c.device_low_id, table.c.device_high_id],
+            set_={
+                "request_count": table.c.request_count + insert.excluded.request_count,
+                "last_requested_at": insert.excluded.last_requested_at,
+            },
+        )
+        db.execute(statement, rows)
+    else:
+        for row in rows:
+            _increment_or_insert(db, row)
+
+    db.commit()
+
+
+def _increment_or_insert(db: Session, row: Dict) -> None:
+    """Fallback tanpa upsert: UPDATE atomik, INSERT jika pasangan belum ada"""
+    table = ComparisonTraffic.__table__
+    pair_filter = (
+        table.c.device_low_id == row["device_low_id"],
+        table.c.device_high_id == row["device_high_id"],
+    )
+    increment = (
+        update(table)
+        .where(*pair_filter)
+        .values(
+            request_count=table.c.request_count + row["request_count"],
+            last_requested_at=row["last_requested_at"],
+        )
+    )
+    if db.execute(increment).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(table.insert().values(**row))
+    except IntegrityError:
+        # Worker lain baru saja meng-insert pasangan yang sama
+        db.execute(increment)
+
+
+def get_top_pairs(db: Session, limit: int = 50) -> List[Pair]:
+    """Pasangan device yang paling sering dibandingkan"""
+    rows = (
+        db.query(ComparisonTraffic.device_low_id, ComparisonTraffic.device_high_id)
+        .order_by(
+            ComparisonTraffic.request_count.desc(),
+            ComparisonTraffic.last_requested_at.desc(),
+        )
+        .limit(limit)
+        .all()
+    )
+    return [(low, high) for low, high in rows]
+
+
+# ==================== ANALYSIS STORE ====================
+
+
+def get_analysis(
+    db: Session, device_id_1: int, device_id_2: int
+) -> Optional[ComparisonAnalysis]:
+    """Analisis tersimpan untuk pasangan device (tanpa cek kebasian)"""
+    low, high = canonical_pair(device_id_1, device_id_2)
+    return (
+        db.query(ComparisonAnalysis)
+        .filter(
+            ComparisonAnalysis.device_low_id == low,
+            ComparisonAnalysis.device_high_id == high,
+        )
+        .first()
+    )
+
+
+def get_analysis_hashes(db: Session, pairs: List[Pair]) -> Dict[Pair, str]:
+    """prompt_hash analisis yang sudah tersimpan untuk list pasangan (1 query)"""
+    if not pairs:
+        return {}
+    wanted = set(pairs)
+    rows = db.query(
+        ComparisonAnalysis.device_low_id,
+        ComparisonAnalysis.device_high_id,
+        ComparisonAnalysis.prompt_hash,
+    ).filter(ComparisonAnalysis.device_low_id.in_({low for low, _ in wanted}))
+    return {
+        (low, high): prompt_hash
+        for low, high, prompt_hash in rows
+        if (low, high) in wanted
+    }
+
+
+def save_analysis(
+    db: Session,
+    pair: Pair,
+    prompt_hash: str,
+    analysis: str,
+    model: Optional[str] = None,
+) -> ComparisonAnalysis:
+    """Simpan / perbarui analisis untuk pasangan device"""
+    row = get_analysis(db, *pair)
+    if row is None:
+        row = ComparisonAnalysis(device_low_id=pair[0], device_high_id=pair[1])
+        db.add(row)
+    row.prompt_hash = prompt_hash
+    row.analysis = analysis
+    row.model = model
+    row.generated_at = datetime.utcnow()
+    db.commit()
+    return row
+
+
+def get_devices_without_analysis(db: Session, limit: int = 20) -> List[Phone]:
+    """
+    Device yang belum punya analisis tersimpan sama sekali (device baru),
+    yang terbaru (ID terbesar) lebih dulu.
+    """
+    analysed = (
+        db.query(ComparisonAnalysis.device_low_id.label("device_id"))
+        .union(db.query(ComparisonAnalysis.device_high_id))
+        .subquery()
+    )
+    return (
+        db.query(Phone)
+        .filter(~Phone.id.in_(db.query(analysed.c.device_id)))
+        .order_by(Phone.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def get_nearest_priced_rivals(
+    db: Session, device: Phone, limit: int = 3
+) -> List[Phone]:
+    """
+    Device lain di kategori yang sama dengan harga paling dekat.
+    """
+    if device.price is None:
+        return []
+    return (
+        db.query(Phone)
+        .filter(
+            Phone.id != device.id,
+            Phone.category_id == device.category_id,
+            Phone.price.isnot(None),
+        )
+        .order_by(func.abs(Phone.price - device.price), Phone.id)
+        .limit(limit)
+        .all()
+    )
@@ -1,9 +1,138 @@
-from typing import List, Optional
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
 
+from sqlalchemy import and_
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 
+# ==================== FILTER BUILDERS ====================
+# Dipakai bersama oleh CRUD sync (file ini) dan async (device_async.py)
+
+
+def search_conditions(search: Optional[str] = None) -> list:
+    """
+    Kondisi WHERE untuk search berdasarkan nama ATAU brand.
+
+    Menggunakan ilike() untuk case-insensitive search
+    Contoh: "samsung", "Samsung", "SAMSUNG" semua akan match
+    """
+    if not search:
+        return []
+
+    search_pattern = f"%{search}%"
+    return [
+        models.Phone.name.ilike(search_pattern)
+        | models.Phone.brand.ilike(search_pattern)
+    ]
+
+
+def filter_conditions(
+    category_id: Optional[int] = None,
+    brand: Optional[str] = None,
+    ram: Optional[str] = None,
+    storage: Optional[str] = None,
+    max_price: Optional[float] = None,
+) -> list:
+    """Kondisi WHERE untuk filter halaman /devices"""
+    conditions = []
+
+    # Filter by category
+    if category_id:
+        conditions.append(models.Phone.category_id == category_id)
+
+    # Filter by brand (case-insensitive)
+    if brand:
+        conditions.append(models.Phone.brand.ilike(brand))
+
+    # Filter by RAM (case-insensitive, partial match)
+    if ram:
+        conditions.append(models.Phone.ram.ilike(f"%{ram}%"))
+
+    # Filter by storage (case-insensitive, partial match)
+    if storage:
+        conditions.append(models.Phone.storage.ilike(f"%{storage}%"))
+
+    # Filter by max price
+    if max_price:
+        conditions.append(models.Phone.price <= max_price)
+
+    return conditions
+
+
+# Kolom urutan untuk pagination cursor (keyset) + tipe nilainya di cursor.
+# Setiap kolom punya index (kolom, id), lihat migrasi 0002
+PAGE_SORTS = {
+    "id": (models.Phone.id, int),
+    "price": (models.Phone.price, Decimal),
+    "release_year": (models.Phone.release_year, int),
+}
+
+# Posisi terakhir halaman sebelumnya: (nilai kolom sort, id)
+PageAfter = Tuple[Any, int]
+
+# Kolom yang bisa dipilih lewat parameter `fields=` (sparse fieldset)
+DEVICE_FIELDS = {
+    column.key: getattr(models.Phone, column.key)
+    for column in sa_inspect(models.Phone).column_attrs
+}
+
+
+def page_statements(
+    sort: str = "id",
+    after: Optional[PageAfter] = None,
+    search: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> list:
+    """
+    Query keyset untuk 1 halaman, urut (kolom sort, id).
+
+    Jika `fields` diisi, hanya kolom tersebut yang di-SELECT (hasilnya Row,
+    bukan object Phone). `fields` harus memuat "id" dan kolom sort.
+
+    Device dengan nilai sort NULL (mis. harga belum ada) ditaruh di akhir:
+    query pertama membaca nilai yang tidak NULL, query kedua (dipakai jika
+    halaman belum penuh) membaca yang NULL urut id. Setiap query hanya
+    membaca baris setelah `after`, sehingga bisa dilayani index tanpa OFFSET.
+
+    Returns:
+        List statement SELECT (tanpa LIMIT), dijalankan berurutan
+    """
+    column, _ = PAGE_SORTS[sort]
+    if fields:
+        base = select(*(DEVICE_FIELDS[field] for field in fields))
+    else:
+        base = select(models.Phone)
+    base = base.where(*search_conditions(search))
+    if sort == "id":
+        after_id = [] if after is None else [models.Phone.id > after[1]]
+        return [base.where(*after_id).order_by(models.Phone.id)]
+
+    statements = []
+    if after is None or after[0] is not None:
+        conditions = [column.isnot(None)]
+        if after is not None:
+            value, after_id = after
+            conditions.append(
+                or_(column > value, and_(column == value, models.Phone.id > after_id))
+            )
+        statements.append(base.where(*conditions).order_by(column, models.Phone.id))
+
+    after_id = (
+        [] if after is None or after[0] is not None else [models.Phone.id > after[1]]
+    )
+    statements.append(base.where(column.is_(None), *after_id).order_by(models.Phone.id))
+    return statements
+
+
+def page_position(device: Any, sort: str) -> PageAfter:
+    """Posisi device (object Phone atau Row) untuk cursor halaman berikutnya"""
+    column, _ = PAGE_SORTS[sort]
+    return (getattr(device, column.key), device.id)
+
+
 # ==================== READ OPERATIONS ====================
 
 
@@ -21,6 +150,26 @@ def get_device(db: Session, device_id: int) -> Optional[models.Phone]:
     return db.query(models.Phone).filter(models.Phone.id == device_id).first()
 
 
+def get_devices_by_ids(db: Session, device_ids: List[int]) -> List[models.Phone]:
+    """
+    Mengambil beberapa device sekaligus (1 query).
+
+    Args:
+        db: Database session
+        device_ids: List ID device
+
+    Returns:
+        List device yang ditemukan, urut sesuai `device_ids`
+    """
+    if not device_ids:
+        return []
+    found = {
+        device.id: device
+        for device in db.query(models.Phone).filter(models.Phone.id.in_(device_ids))
+    }
+    return [found[device_id] for device_id in device_ids if device_id in found]
+
+
 def get_devices(
     db: Session, skip: int = 0, limit: int = 100, search: Optional[str] = None
 ) -> List[models.Phone]:
@@ -36,21 +185,43 @@ def get_devices(
     Returns:
         List of Device objects
     """
-    query = db.query(models.Phone)
-
     # Jika ada keyword search, filter berdasarkan nama ATAU brand
-    # Menggunakan ilike() untuk case-insensitive search
-    # Contoh: "samsung", "Samsung", "SAMSUNG" semua akan match
-    if search:
-        search_pattern = f"%{search}%"
-        search_filter = models.Phone.name.ilike(
-            search_pattern
-        ) | models.Phone.brand.ilike(search_pattern)
-        query = query.filter(search_filter)
+    query = db.query(models.Phone).filter(*search_conditions(search))
 
     return query.offset(skip).limit(limit).all()
 
 
+def get_devices_page(
+    db: Session,
+    sort: str = "id",
+    after: Optional[PageAfter] = None,
+    limit: int = 100,
+    search: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[list, bool]:
+    """
+    Mengambil 1 halaman devices dengan pagination keyset (cursor).
+
+    Args:
+        db: Database session
+        sort: Kolom urutan (lihat PAGE_SORTS)
+        after: Posisi device terakhir halaman sebelumnya (None = halaman pertama)
+        limit: Maksimal berapa data yang diambil
+        search: Keyword untuk search berdasarkan nama device ATAU brand
+        fields: Kolom yang diambil (lihat page_statements), None = object Phone
+
+    Returns:
+        (list device / Row, True jika masih ada halaman berikutnya)
+    """
+    devices: list = []
+    for statement in page_statements(sort, after, search, fields):
+        result = db.execute(statement.limit(limit + 1 - len(devices)))
+        devices += result.all() if fields else result.scalars().all()
+        if len(devices) > limit:
+            break
+    return devices[:limit], len(devices) > limit
+
+
 def get_devices_filtered(
     db: Session,
     category_id: Optional[int] = None,
@@ -77,27 +248,9 @@ def get_devices_filtered(
     Returns:
         List of filtered Device objects
     """
-    query = db.query(models.Phone)
-
-    # Filter by category
-    if category_id:
-        query = query.filter(models.Phone.category_id == category_id)
-
-    # Filter by brand (case-insensitive)
-    if brand:
-        query = query.filter(models.Phone.brand.ilike(brand))
-
-    # Filter by RAM (case-insensitive, partial match)
-    if ram:
-        query = query.filter(models.Phone.ram.ilike(f"%{ram}%"))
-
-    # Filter by storage (case-insensitive, partial match)
-    if storage:
-        query = query.filter(models.Phone.storage.ilike(f"%{storage}%"))
-
-    # Filter by max price
-    if max_price:
-        query = query.filter(models.Phone.price <= max_price)
+    query = db.query(models.Phone).filter(
+        *filter_conditions(category_id, brand, ram, storage, max_price)
+    )
 
     return query.offset(skip).limit(limit).all()
 
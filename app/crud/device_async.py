@@ -0,0 +1,197 @@
+"""
+Versi async dari operasi CRUD device (untuk AsyncSession).
+
+Fungsi di sini punya nama dan parameter yang sama dengan `crud/device.py`,
+tapi harus di-`await`. Filter (search, kategori, brand, dll) memakai
+builder yang sama dengan versi sync supaya hasilnya identik.
+
+Relasi `category` di-eager load (JOIN), karena AsyncSession tidak bisa
+lazy load saat response di-serialize.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from .. import models, schemas
+from .device import PageAfter, filter_conditions, page_statements, search_conditions
+
+# ==================== READ OPERATIONS ====================
+
+
+async def get_device(db: AsyncSession, device_id: int) -> Optional[models.Phone]:
+    """
+    Mengambil 1 device berdasarkan ID (beserta kategorinya).
+
+    Args:
+        db: Async database session
+        device_id: ID device yang dicari
+
+    Returns:
+        Device object jika ditemukan, None jika tidak ada
+    """
+    result = await db.execute(
+        select(models.Phone)
+        .options(joinedload(models.Phone.category))
+        .where(models.Phone.id == device_id)
+    )
+    return result.scalars().first()
+
+
+async def get_devices_by_ids(
+    db: AsyncSession, device_ids: List[int]
+) -> List[models.Phone]:
+    """
+    Mengambil beberapa device sekaligus (1 query, beserta kategorinya).
+
+    Args:
+        db: Async database session
+        device_ids: List ID device
+
+    Returns:
+        List device yang ditemukan, urut sesuai `device_ids`
+    """
+    if not device_ids:
+        return []
+    result = await db.execute(
+        select(models.Phone)
+        .options(joinedload(models.Phone.category))
+        .where(models.Phone.id.in_(device_ids))
+    )
+    found = {device.id: device for device in result.scalars().unique()}
+    return [found[device_id] for device_id in device_ids if device_id in found]
+
+
+async def get_devices(
+    db: AsyncSession, skip: int = 0, limit: int = 100, search: Optional[str] = None
+) -> List[models.Phone]:
+    """
+    Mengambil list devices dengan pagination dan search.
+
+    Args:
+        db: Async database session
+        skip: Berapa data yang di-skip (untuk pagination)
+        limit: Maksimal berapa data yang diambil
+        search: Keyword untuk search berdasarkan nama device ATAU brand
+
+    Returns:
+        List of Device objects
+    """
+    result = await db.execute(
+        select(models.Phone)
+        .options(joinedload(models.Phone.category))
+        .where(*search_conditions(search))
+        .offset(skip)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def get_devices_page(
+    db: AsyncSession,
+    sort: str = "id",
+    after: Optional[PageAfter] = None,
+    limit: int = 100,
+    search: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[list, bool]:
+    """
+    Mengambil 1 halaman devices dengan pagination keyset (cursor).
+
+    Args:
+        db: Async database session
+        sort: Kolom urutan (lihat PAGE_SORTS di crud/device.py)
+        after: Posisi device terakhir halaman sebelumnya (None = halaman pertama)
+        limit: Maksimal berapa data yang diambil
+        search: Keyword untuk search berdasarkan nama device ATAU brand
+        fields: Kolom yang diambil (tanpa JOIN kategori), None = object Phone
+
+    Returns:
+        (list device / Row, True jika masih ada halaman berikutnya)
+    """
+    devices: list = []
+    for statement in page_statements(sort, after, search, fields):
+        if not fields:
+            statement = statement.options(joinedload(models.Phone.category))
+        result = await db.execute(statement.limit(limit + 1 - len(devices)))
+        devices += result.all() if fields else result.scalars().all()
+        if len(devices) > limit:
+            break
+    return devices[:limit], len(devices) > limit
+
+
+async def get_devices_filtered(
+    db: AsyncSession,
+    category_id: Optional[int] = None,
+    brand: Optional[str] = None,
+    ram: Optional[str] = None,
+    storage: Optional[str] = None,
+    max_price: Optional[float] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[models.Phone]:
+    """
+    Mengambil list devices dengan multiple filters.
+
+    Args:
+        db: Async database session
+        category_id: Filter by category ID
+        brand: Filter by brand name
+        ram: Filter by RAM (e.g., "8GB")
+        storage: Filter by storage (e.g., "256GB")
+        max_price: Filter by maximum price
+        skip: Pagination offset
+        limit: Maximum results
+
+    Returns:
+        List of filtered Device objects
+    """
+    result = await db.execute(
+        select(models.Phone)
+        .options(joinedload(models.Phone.category))
+        .where(*filter_conditions(category_id, brand, ram, storage, max_price))
+        .offset(skip)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def get_unique_brands(db: AsyncSession) -> List[str]:
+    """
+    Mengambil list brand yang unik dari database.
+
+    Args:
+        db: Async database session
+
+    Returns:
+        List of unique brand names, sorted alphabetically
+    """
+    result = await db.execute(
+        select(models.Phone.brand).distinct().where(models.Phone.brand.isnot(None))
+    )
+    return sorted(brand for brand in result.scalars().all() if brand)
+
+
+# ==================== CREATE OPERATIONS ====================
+
+
+async def create_device(db: AsyncSession, device: schemas.PhoneCreate) -> models.Phone:
+    """
+    Membuat device baru di database.
+
+    Args:
+        db: Async database session
+        device: Data device dari request (PhoneCreate schema)
+
+    Returns:
+        Device object yang baru dibuat (dengan ID dan kategori)
+    """
+    db_device = models.Phone(**device.dict())
+    db.add(db_device)
+    await db.commit()
+
+    # Load kategori supaya response bisa di-serialize tanpa lazy load
+    await db.refresh(db_device, ["category"])
+    return db_device
@@ -0,0 +1,159 @@
+"""
+CRUD operations untuk Users dan Roles (admin panel)
+
+Author: Kelompok COMPARELY
+"""
+
+from math import ceil
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.role import Role
+from app.models.user import User
+
+
+def _paginate(query, page: int, per_page: int) -> Tuple[list, int]:
+    """
+    Jalankan COUNT + SELECT untuk 1 halaman.
+
+    Returns:
+        Tuple (items, total_pages)
+    """
+    total_items = query.order_by(None).count()
+    total_pages = ceil(total_items / per_page) if total_items > 0 else 1
+
+    offset = (max(page, 1) - 1) * per_page
+    items = query.offset(offset).limit(per_page).all()
+    return items, total_pages
+
+
+def get_user_with_role(db: Session, user_id: int) -> Optional[User]:
+    """
+    Ambil user berdasarkan ID, sekaligus role-nya (1 query JOIN).
+
+    Args:
+        db: Database session
+        user_id: ID user
+
+    Returns:
+        User object (dengan role sudah ter-load) atau None
+    """
+    return (
+        db.query(User).options(joinedload(User.role)).filter(User.id == user_id).first()
+    )
+
+
+def get_users_page(
+    db: Session,
+    page: int = 1,
+    per_page: int = 20,
+    search: Optional[str] = None,
+    sort: str = "id",
+    order: str = "asc",
+) -> Tuple[List[User], int]:
+    """
+    Ambil 1 halaman users untuk admin listing.
+
+    Role di-load sekaligus via JOIN (joinedload), jadi template bisa
+    akses `user.role.name` tanpa query tambahan per user.
+
+    Args:
+        db: Database session
+        page: Nomor halaman (mulai dari 1)
+        per_page: Jumlah user per halaman
+        search: Keyword username/email
+        sort: Nama kolom untuk sorting
+        order: "asc" atau "desc"
+
+    Returns:
+        Tuple (users, total_pages)
+    """
+    query = db.query(User).options(joinedload(User.role))
+
+    if search:
+        query = query.filter(
+            (User.username.ilike(f"%{search}%")) | (User.email.ilike(f"%{search}%"))
+        )
+
+    sort_column = getattr(User, sort, User.id)
+    if order == "desc":
+        query = query.order_by(sort_column.desc())
+    else:
+        query = query.order_by(sort_column.asc())
+
+    return _paginate(query, page, per_page)
+
+
+def count_users_by_role(
+    db: Session, role_ids: Optional[Iterable[int]] = None
+) -> Dict[int, int]:
+    """
+    Hitung jumlah user per role dalam 1 query GROUP BY.
+
+    Args:
+        db: Database session
+        role_ids: Batasi ke role tertentu (None = semua role)
+
+    Returns:
+        Dict {role_id: jumlah_user}. Role tanpa user bernilai 0
+        (jika role_ids diberikan).
+    """
+    query = db.query(User.role_id, func.count(User.id)).group_by(User.role_id)
+
+    if role_ids is not None:
+        role_ids = list(role_ids)
+        if not role_ids:
+            return {}
+        query = query.filter(User.role_id.in_(role_ids))
+
+    counts = {role_id: count for role_id, count in query.all() if role_id is not None}
+
+    if role_ids is not None:
+        for role_id in role_ids:
+            counts.setdefault(role_id, 0)
+
+    return counts
+
+
+def get_roles_page(
+    db: Session,
+    page: int = 1,
+    per_page: int = 20,
+    search: Optional[str] = None,
+    sort: str = "id",
+    order: str = "asc",
+) -> Tuple[List[Role], int, Dict[int, int]]:
+    """
+    Ambil 1 halaman roles beserta jumlah user per role.
+
+    Total query tetap: COUNT + SELECT roles + 1 GROUP BY users,
+    berapapun jumlah role di halaman.
+
+    Args:
+        db: Database session
+        page: Nomor halaman (mulai dari 1)
+        per_page: Jumlah role per halaman
+        search: Keyword nama role
+        sort: Nama kolom untuk sorting
+        order: "asc" atau "desc"
+
+    Returns:
+        Tuple (roles, total_pages, user_counts)
+    """
+    query = db.query(Role)
+
+    if search:
+        query = query.filter(Role.name.ilike(f"%{search}%"))
+
+    sort_column = getattr(Role, sort, Role.id)
+    if order == "desc":
+        query = query.order_by(sort_column.desc())
+    else:
+        query = query.order_by(sort_column.asc())
+
+    roles, total_pages = _paginate(query, page, per_page)
+    user_counts = count_users_by_role(db, [role.id for role in roles])
+
+    return roles, total_pages, user_counts
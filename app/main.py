@@ -1,20 +1,26 @@
 import os
 
-from dotenv import load_dotenv
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 
-from .database import engine
-from .models import Base  # Import Base dari models package baru
+from .core import config
+from .core.compression import CompressionMiddleware
+from .core.static_assets import PrecompressedStaticFiles, static_dir
+from .core.templates import precompile as precompile_templates
 from .routers import (admin, categories, compare, devices, frontend,
                       recommendation)
-
-# Load environment variables
-load_dotenv()
-
-# Membuat tabel database otomatis
-Base.metadata.create_all(bind=engine)
+from .services import background
+from .services.comparison_store import comparison_traffic
+from .services.facet_index import facet_index
+from .services.percentile_index import percentile_index
+from .services.similarity_index import similarity_index
+from .services.use_case_scoring import use_case_index
+from .services.value_frontier import value_frontier
+
+# .env sudah di-load sekali oleh core/config.py.
+# Tabel database TIDAK dibuat di sini: jalankan `python scripts/migrate.py`
+# saat deploy (lihat core/migrations.py), supaya worker bisa langsung serve
+# tanpa DDL / reflection ke database.
 
 app = FastAPI(
     title="COMPARELY", description="Aplikasi Perbandingan Perangkat", version="1.0.0"
@@ -25,6 +31,11 @@ app = FastAPI(
 SECRET_KEY = os.getenv("SECRET_KEY", "comparely-secret-key-change-in-production-please")
 app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
 
+# Kompresi gzip/brotli untuk HTML, JSON, CSV (lihat core/compression.py)
+app.add_middleware(
+    CompressionMiddleware, minimum_size=config.COMPRESSION_MINIMUM_SIZE
+)
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -57,6 +68,34 @@ async def startup_event():
 
     print("=" * 60 + "\n")
 
+    # Bangun index katalog (badge "Top X%", device serupa, skor use case,
+    # frontier best value, filter /devices) di background
+    percentile_index.ensure_fresh()
+    similarity_index.ensure_fresh()
+    use_case_index.ensure_fresh()
+    value_frontier.ensure_fresh()
+    facet_index.ensure_fresh()
+
+    # Compile semua template sekarang, bukan saat request pertama
+    # (memakai bytecode cache di disk jika sudah disiapkan saat deploy)
+    if config.TEMPLATE_PRECOMPILE:
+        precompile_templates()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Event yang dijalankan saat aplikasi berhenti.
+    Menulis sisa hitungan traffic perbandingan di buffer ke database, supaya
+    tidak hilang setiap kali worker restart.
+    """
+    # Tunggu flush background yang mungkin sedang berjalan
+    background.wait_all(timeout=10)
+    try:
+        comparison_traffic.flush()
+    except Exception:
+        pass  # Sudah di-log oleh flush()
+
 
 # Favicon route
 from fastapi.responses import FileResponse
@@ -68,8 +107,9 @@ async def favicon():
     return FileResponse("app/static/images/favicon.ico")
 
 
-# Folder untuk file CSS/Gambar
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# Folder untuk file CSS/Gambar (hasil build ber-hash + .br/.gz jika sudah
+# di-build dengan scripts/build_static.py, jika tidak app/static apa adanya)
+app.mount("/static", PrecompressedStaticFiles(directory=static_dir()), name="static")
 
 # Menambahkan router (halaman/fitur)
 # Frontend router harus di-include PERTAMA agar route "/" bisa handle HTML
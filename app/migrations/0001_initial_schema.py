@@ -0,0 +1,159 @@
+"""
+Schema awal: tabel katalog, user, log aktivitas, notifikasi, cache komparasi
+
+Snapshot schema saat migrasi diperkenalkan (sama dengan create_all yang dulu
+dijalankan saat import app/main.py), minus phones.updated_at/revision dan
+index pagination yang ditambahkan oleh 0002/0003. Sengaja tidak memakai
+app.models: perubahan model berikutnya harus lewat migrasi baru. Pada
+database yang sudah ada hanya tabel yang belum ada yang dibuat.
+"""
+
+from sqlalchemy import (
+    DECIMAL,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+Table(
+    "app_settings",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("key", String(100), unique=True, nullable=False, index=True),
+    Column("value", Text, nullable=True),
+    Column("description", String(255), nullable=True),
+    Column("created_at", DateTime, server_default=func.now()),
+    Column("updated_at", DateTime, server_default=func.now()),
+)
+
+Table(
+    "categories",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(100), unique=True, index=True),
+)
+
+Table(
+    "roles",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(50), unique=True, index=True),
+    Column("description", Text),
+    Column("permissions", Text),
+)
+
+Table(
+    "phones",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), index=True),
+    Column("brand", String(100), index=True),
+    Column("category_id", Integer, ForeignKey("categories.id")),
+    Column("cpu", String(255)),
+    Column("gpu", String(255)),
+    Column("ram", String(100)),
+    Column("storage", String(100)),
+    Column("camera", String(255)),
+    Column("battery", String(100)),
+    Column("screen", String(255)),
+    Column("release_year", Integer),
+    Column("price", DECIMAL(15, 2)),
+    Column("image_url", String(500)),
+    Column("description", Text),
+    Column("source_data", String(500)),
+)
+
+Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String(50), unique=True, index=True),
+    Column("email", String(100), unique=True, index=True),
+    Column("password_hash", String(255)),
+    Column("full_name", String(100)),
+    Column("is_active", Boolean),
+    Column("is_verified", Boolean),
+    Column("role_id", Integer, ForeignKey("roles.id")),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("last_login", DateTime),
+)
+
+Table(
+    "activity_logs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("user_name", String(100), nullable=False),
+    Column("action", String(50), nullable=False),
+    Column("entity_type", String(50), nullable=False),
+    Column("entity_id", Integer),
+    Column("entity_name", String(200)),
+    Column("old_values", Text),
+    Column("new_values", Text),
+    Column("ip_address", String(50)),
+    Column("user_agent", String(500)),
+    Column("description", Text),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "comparison_analyses",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column(
+        "device_low_id", Integer, ForeignKey("phones.id"), nullable=False, index=True
+    ),
+    Column(
+        "device_high_id", Integer, ForeignKey("phones.id"), nullable=False, index=True
+    ),
+    Column("prompt_hash", String(64), nullable=False),
+    Column("analysis", Text, nullable=False),
+    Column("model", String(100)),
+    Column("generated_at", DateTime, nullable=False),
+    UniqueConstraint("device_low_id", "device_high_id", name="uq_analysis_pair"),
+)
+
+Table(
+    "comparison_traffic",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("device_low_id", Integer, ForeignKey("phones.id"), nullable=False),
+    Column("device_high_id", Integer, ForeignKey("phones.id"), nullable=False),
+    Column("request_count", Integer, nullable=False, index=True),
+    Column("last_requested_at", DateTime, nullable=False),
+    UniqueConstraint("device_low_id", "device_high_id", name="uq_traffic_pair"),
+)
+
+Table(
+    "notifications",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("type", String(50), nullable=False),
+    Column("title", String(200), nullable=False),
+    Column("message", Text, nullable=False),
+    Column("action_url", String(500)),
+    Column("action_label", String(100)),
+    Column("is_read", Boolean, nullable=False),
+    Column("read_at", DateTime),
+    Column("icon", String(50)),
+    Column("priority", Integer),
+    Column("created_at", DateTime, nullable=False),
+    Column("expires_at", DateTime),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(bind=connection)
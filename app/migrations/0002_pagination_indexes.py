@@ -0,0 +1,21 @@
+"""
+Index (price, id) dan (release_year, id) untuk pagination cursor /devices/
+
+Query keyset membaca "WHERE (kolom, id) > (nilai, id terakhir) ORDER BY
+kolom, id", sehingga butuh index gabungan (kolom, id).
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+INDEXES = {
+    "ix_phones_price_id": "price, id",
+    "ix_phones_release_year_id": "release_year, id",
+}
+
+
+def upgrade(connection: Connection) -> None:
+    existing = {index["name"] for index in inspect(connection).get_indexes("phones")}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            connection.execute(text(f"CREATE INDEX {name} ON phones ({columns})"))
@@ -0,0 +1,24 @@
+"""
+Kolom phones.updated_at dan phones.revision untuk ETag / Last-Modified
+
+`revision` naik setiap UPDATE (dijaga oleh model Phone, termasuk bulk
+update admin). Device lama tidak punya updated_at sampai diubah pertama
+kali (response tetap mendapat ETag, hanya tanpa Last-Modified).
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+COLUMNS = {
+    "updated_at": "DATETIME NULL",
+    "revision": "INTEGER NOT NULL DEFAULT 1",
+}
+
+
+def upgrade(connection: Connection) -> None:
+    existing = {column["name"] for column in inspect(connection).get_columns("phones")}
+    for name, definition in COLUMNS.items():
+        if name not in existing:
+            connection.execute(
+                text(f"ALTER TABLE phones ADD COLUMN {name} {definition}")
+            )
@@ -0,0 +1,10 @@
+"""
+Migrasi schema database (dijalankan oleh app.core.migrations)
+
+Aturan menulis migrasi baru:
+- Nama file NNNN_deskripsi_singkat.py, nomor naik dari migrasi terakhir
+- Baris pertama docstring modul = deskripsi yang tampil di "migrate status"
+- Fungsi upgrade(connection) yang idempotent (cek dulu dengan inspect),
+  karena DDL MySQL tidak bisa di-rollback
+- Migrasi yang sudah di-deploy jangan diubah; buat migrasi baru
+"""
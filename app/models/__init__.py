@@ -8,6 +8,7 @@ Contoh: from app.models import Phone, Category, User, Role
 from ..database import Base
 from .activity_log import ActivityLog
 from .category import Category
+from .comparison import ComparisonAnalysis, ComparisonTraffic
 from .notification import Notification
 from .phone import Phone
 from .role import Role
@@ -24,4 +25,6 @@ __all__ = [
     "ActivityLog",
     "Notification",
     "AppSettings",
+    "ComparisonTraffic",
+    "ComparisonAnalysis",
 ]
@@ -0,0 +1,65 @@
+"""
+Comparison Models - traffic perbandingan dan analisis AI yang tersimpan
+
+Pasangan device disimpan tanpa memperhatikan urutan:
+`device_low_id` selalu ID yang lebih kecil, `device_high_id` yang lebih besar.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+
+from ..database import Base
+
+
+class ComparisonTraffic(Base):
+    """Berapa kali pasangan device dibandingkan user"""
+
+    __tablename__ = "comparison_traffic"
+    __table_args__ = (
+        UniqueConstraint("device_low_id", "device_high_id", name="uq_traffic_pair"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    device_low_id = Column(Integer, ForeignKey("phones.id"), nullable=False)
+    device_high_id = Column(Integer, ForeignKey("phones.id"), nullable=False)
+    request_count = Column(Integer, nullable=False, default=0, index=True)
+    last_requested_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ComparisonTraffic({self.device_low_id}, {self.device_high_id}) x{self.request_count}>"
+
+
+class ComparisonAnalysis(Base):
+    """
+    Analisis AI yang sudah di-generate (oleh batch job) untuk 1 pasangan device.
+
+    `prompt_hash` adalah hash dari prompt (berisi spesifikasi + harga);
+    jika data device berubah, hash tidak cocok lagi dan analisis dianggap basi.
+    """
+
+    __tablename__ = "comparison_analyses"
+    __table_args__ = (
+        UniqueConstraint("device_low_id", "device_high_id", name="uq_analysis_pair"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    device_low_id = Column(Integer, ForeignKey("phones.id"), nullable=False, index=True)
+    device_high_id = Column(
+        Integer, ForeignKey("phones.id"), nullable=False, index=True
+    )
+    prompt_hash = Column(String(64), nullable=False)
+    analysis = Column(Text, nullable=False)
+    model = Column(String(100), nullable=True)
+    generated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ComparisonAnalysis({self.device_low_id}, {self.device_high_id})>"
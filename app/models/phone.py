@@ -1,4 +1,16 @@
-from sqlalchemy import DECIMAL, Column, ForeignKey, Integer, String, Text
+from datetime import datetime
+
+from sqlalchemy import (
+    DECIMAL,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    literal_column,
+)
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -11,6 +23,11 @@ class Phone(Base):
     """
 
     __tablename__ = "phones"
+    __table_args__ = (
+        # Pagination cursor /devices/?sort=price|release_year (keyset, urut id)
+        Index("ix_phones_price_id", "price", "id"),
+        Index("ix_phones_release_year_id", "release_year", "id"),
+    )
 
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
@@ -40,6 +57,17 @@ class Phone(Base):
     description = Column(Text)  # Deskripsi lengkap
     source_data = Column(String(500))  # URL sumber data (GSMArena, dll)
 
+    # Versi data untuk ETag / Last-Modified (HTTP conditional GET).
+    # onupdate berlaku untuk setiap UPDATE, termasuk query.update() massal.
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    revision = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("revision") + 1,
+    )
+
     # Relationships
     # Relasi ke Category (many-to-one: banyak phone, 1 category)
     category = relationship("Category", back_populates="phones")
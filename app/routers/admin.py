@@ -14,6 +14,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db
+from app.core.templates import environment
 from app.models import Category, Phone, Role, User
 
 # ============================================
@@ -74,7 +75,7 @@ class CustomJinja2Templates(Jinja2Templates):
 
 
 # Setup Custom Jinja2 Templates
-templates = CustomJinja2Templates(directory="app/templates")
+templates = CustomJinja2Templates(env=environment)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
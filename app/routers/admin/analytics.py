@@ -7,25 +7,22 @@ from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import extract, func
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db
+from app.core.deps import get_read_db
 from app.core.rbac_context import add_rbac_to_context
+from app.core.templates import templates  # Environment Jinja2 bersama
 from app.models import Category, Phone, User
 
 from .auth import get_current_user
 
-# Setup templates
-templates = Jinja2Templates(directory="app/templates")
-
 # Create router
 router = APIRouter(tags=["admin-analytics"])
 
 
 @router.get("/analytics", response_class=HTMLResponse)
-async def admin_analytics(request: Request, db: Session = Depends(get_db)):
+async def admin_analytics(request: Request, db: Session = Depends(get_read_db)):
     """Halaman analytics dengan charts dan reports"""
 
     # Get device statistics by year
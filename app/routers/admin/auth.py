@@ -8,15 +8,13 @@ from datetime import datetime
 import bcrypt
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db
+from app.core.templates import templates  # Environment Jinja2 bersama
+from app.crud import user as user_crud
 from app.models import User
 
-# Setup templates
-templates = Jinja2Templates(directory="app/templates")
-
 # Create router
 router = APIRouter(tags=["admin-auth"])
 
@@ -51,8 +49,8 @@ def get_current_user(request: Request, db: Session) -> User:
     user_id = request.session.get("user_id") if hasattr(request, "session") else None
 
     if user_id:
-        # Get user from database
-        user = db.query(User).filter(User.id == user_id).first()
+        # Get user (dan role-nya) dari database dalam 1 query
+        user = user_crud.get_user_with_role(db, user_id)
         if user:
             return user
 
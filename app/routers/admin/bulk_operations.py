@@ -7,17 +7,15 @@ import logging
 
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db
 from app.core.rbac_context import add_rbac_to_context
+from app.core.templates import templates  # Environment Jinja2 bersama
 from app.models import Category, Phone
 
 from .auth import get_current_user
 
-# Setup templates
-templates = Jinja2Templates(directory="app/templates")
 logger = logging.getLogger(__name__)
 
 # Create router
@@ -12,20 +12,21 @@ from typing import List, Optional
 from fastapi import APIRouter, Body, Depends, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import (HTMLResponse, JSONResponse, RedirectResponse,
                                Response, StreamingResponse)
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session, joinedload
 
-from app.core.deps import get_db
+from app.core.deps import get_db, get_read_db
 from app.core.rbac_context import add_rbac_to_context
+from app.core.templates import templates  # Environment Jinja2 bersama
 from app.models import Category, Phone
 
 from .auth import get_current_user
 
-# Setup templates
-templates = Jinja2Templates(directory="app/templates")
 logger = logging.getLogger(__name__)
 
+# Jumlah device per chunk CSV di /admin/devices/export
+EXPORT_BATCH_SIZE = 500
+
 # Create router
 router = APIRouter(tags=["admin-devices"])
 
@@ -167,62 +168,73 @@ async def admin_device_edit(
 
 
 @router.get("/devices/export")
-async def admin_devices_export(db: Session = Depends(get_db)):
-    """Export devices to CSV"""
-    devices = db.query(Phone).all()
-
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Write header
-    writer.writerow(
-        [
-            "ID",
-            "Name",
-            "Brand",
-            "Category",
-            "CPU",
-            "GPU",
-            "RAM",
-            "Storage",
-            "Camera",
-            "Battery",
-            "Screen",
-            "Release Year",
-            "Price",
-            "Image URL",
-            "Description",
-        ]
-    )
-
-    # Write data
-    for device in devices:
-        category_name = device.category.name if device.category else "N/A"
-        writer.writerow(
-            [
-                device.id,
-                device.name,
-                device.brand,
-                category_name,
-                device.cpu or "",
-                device.gpu or "",
-                device.ram or "",
-                device.storage or "",
-                device.camera or "",
-                device.battery or "",
-                device.screen or "",
-                device.release_year or "",
-                device.price or "",
-                device.image_url or "",
-                device.description or "",
-            ]
+async def admin_devices_export(db: Session = Depends(get_read_db)):
+    """
+    Export devices to CSV.
+
+    CSV ditulis per batch EXPORT_BATCH_SIZE device (streaming), sehingga
+    response bisa langsung dikirim dan dikompres bertahap tanpa menunggu
+    seluruh katalog dibaca.
+    """
+    header = [
+        "ID",
+        "Name",
+        "Brand",
+        "Category",
+        "CPU",
+        "GPU",
+        "RAM",
+        "Storage",
+        "Camera",
+        "Battery",
+        "Screen",
+        "Release Year",
+        "Price",
+        "Image URL",
+        "Description",
+    ]
+
+    def generate_csv():
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(header)
+
+        # Kategori ikut di-JOIN (tanpa 1 query per device)
+        devices = (
+            db.query(Phone)
+            .options(joinedload(Phone.category))
+            .order_by(Phone.id)
+            .yield_per(EXPORT_BATCH_SIZE)
         )
+        for count, device in enumerate(devices, start=1):
+            category_name = device.category.name if device.category else "N/A"
+            writer.writerow(
+                [
+                    device.id,
+                    device.name,
+                    device.brand,
+                    category_name,
+                    device.cpu or "",
+                    device.gpu or "",
+                    device.ram or "",
+                    device.storage or "",
+                    device.camera or "",
+                    device.battery or "",
+                    device.screen or "",
+                    device.release_year or "",
+                    device.price or "",
+                    device.image_url or "",
+                    device.description or "",
+                ]
+            )
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        yield output.getvalue()
 
-    # Prepare response
-    output.seek(0)
     return StreamingResponse(
-        iter([output.getvalue()]),
+        generate_csv(),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=devices_export.csv"},
     )
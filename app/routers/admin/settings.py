@@ -11,18 +11,17 @@ from pathlib import Path
 
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db
 from app.core.rbac_context import add_rbac_to_context
-from app.models import AppSettings, Category, Phone
+from app.core.settings_registry import settings_registry
+from app.core.templates import templates  # Environment Jinja2 bersama
+from app.models import Category, Phone
 
 from .auth import get_current_user
 
-# Setup templates
-templates = Jinja2Templates(directory="app/templates")
 logger = logging.getLogger(__name__)
 
 # Create router
@@ -30,25 +29,6 @@ router = APIRouter(tags=["admin-settings"])
 
 
 # Helper functions
-def get_setting(db: Session, key: str, default: str = "") -> str:
-    """Get setting value from database"""
-    setting = db.query(AppSettings).filter(AppSettings.key == key).first()
-    return setting.value if setting else default
-
-
-def set_setting(db: Session, key: str, value: str, description: str = None):
-    """Set setting value in database"""
-    setting = db.query(AppSettings).filter(AppSettings.key == key).first()
-    if setting:
-        setting.value = value
-        if description:
-            setting.description = description
-    else:
-        setting = AppSettings(key=key, value=value, description=description)
-        db.add(setting)
-    db.commit()
-
-
 def get_database_size(db: Session) -> str:
     """Get database size in MB"""
     try:
@@ -77,11 +57,14 @@ async def admin_settings(request: Request, db: Session = Depends(get_db)):
     total_categories = db.query(Category).count()
     database_size = get_database_size(db)
 
-    # Get settings from database
-    ai_api_key = get_setting(db, "ai_api_key", "")
-    items_per_page = get_setting(db, "items_per_page", "20")
-    date_format = get_setting(db, "date_format", "YYYY-MM-DD")
-    last_backup = get_setting(db, "last_backup_date", "Never")
+    # Get settings dari cache registry (tanpa query per key)
+    settings = settings_registry.get_many(
+        db, ["ai_api_key", "items_per_page", "date_format", "last_backup_date"]
+    )
+    ai_api_key = settings["ai_api_key"]
+    items_per_page = settings["items_per_page"]
+    date_format = settings["date_format"]
+    last_backup = settings["last_backup_date"]
 
     current_user = get_current_user(request, db)
     rbac_context = add_rbac_to_context(current_user)
@@ -111,7 +94,7 @@ async def update_api_settings(
     """Update API settings"""
     try:
         # Save API key to database
-        set_setting(db, "ai_api_key", ai_api_key, "AI API Key for recommendations")
+        settings_registry.set(db, "ai_api_key", ai_api_key)
 
         # Also update .env file if needed
         env_path = Path(".env")
@@ -184,7 +167,7 @@ async def backup_database(request: Request, db: Session = Depends(get_db)):
         os.system(cmd)
 
         # Save last backup date
-        set_setting(
+        settings_registry.set(
             db, "last_backup_date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         )
 
@@ -297,11 +280,10 @@ async def update_ui_preferences(
 ):
     """Update UI preferences"""
     try:
-        # Save preferences to database
-        set_setting(
-            db, "items_per_page", str(items_per_page), "Number of items per page"
+        # Save preferences to database (1 transaksi untuk semua key)
+        settings_registry.set_many(
+            db, {"items_per_page": items_per_page, "date_format": date_format}
         )
-        set_setting(db, "date_format", date_format, "Date format for display")
 
         logger.info(
             f"UI preferences updated: {items_per_page} items per page, {date_format} date format"
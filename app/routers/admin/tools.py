@@ -6,17 +6,17 @@ Handles admin tools and utilities.
 import logging
 
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db
 from app.core.rbac_context import add_rbac_to_context
+from app.core.templates import templates  # Environment Jinja2 bersama
+from app.database import async_pool_metrics, pool_metrics, replica_router
+from app.services import resilience
 
 from .auth import get_current_user
 
-# Setup templates
-templates = Jinja2Templates(directory="app/templates")
 logger = logging.getLogger(__name__)
 
 # Create router
@@ -53,3 +53,48 @@ async def clear_cache(request: Request, db: Session = Depends(get_db)):
         return RedirectResponse(
             url=f"/admin/tools?error=Failed to clear cache", status_code=303
         )
+
+
+@router.get("/tools/pool-stats")
+async def pool_stats(reset: bool = False):
+    """
+    Statistik connection pool database (JSON).
+
+    Berisi koneksi checked-out, overflow, histogram waktu tunggu pool,
+    dan durasi checkout per route. Dipakai untuk sizing DB_POOL_SIZE /
+    DB_MAX_OVERFLOW per worker. Pool engine async (router publik) ada di
+    key `async_engine`. `?reset=true` mengosongkan counter setelah
+    snapshot diambil.
+    """
+    stats = pool_metrics.snapshot()
+    stats["async_engine"] = async_pool_metrics.snapshot()
+    if reset:
+        pool_metrics.reset()
+        async_pool_metrics.reset()
+    return JSONResponse(content=stats)
+
+
+@router.get("/tools/replicas")
+async def replica_status(recheck: bool = False):
+    """
+    Status read replica (JSON): sehat/tidak, lag terakhir, dan jumlah read
+    yang dilayani replica vs fallback ke primary. `?recheck=true` memaksa
+    cek ulang semua replica pada read berikutnya.
+    """
+    if recheck:
+        replica_router.invalidate()
+    return JSONResponse(content=replica_router.status())
+
+
+@router.get("/tools/upstreams")
+async def upstream_status(reset: bool = False):
+    """
+    Status circuit breaker dan limit concurrency adaptif untuk AI API dan
+    n8n (JSON). `?reset=true` menutup circuit dan mengembalikan limit ke
+    nilai awal setelah snapshot diambil.
+    """
+    stats = resilience.snapshot()
+    if reset:
+        for upstream in resilience.upstreams.values():
+            upstream.reset()
+    return JSONResponse(content=stats)
@@ -5,21 +5,19 @@ Handles user and role management (list, create, edit, delete).
 
 import logging
 import re
-from math import ceil
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db
 from app.core.rbac_context import add_rbac_to_context
+from app.core.templates import templates  # Environment Jinja2 bersama
+from app.crud import user as user_crud
 from app.models import Role, User
 
 from .auth import get_current_user
 
-# Setup templates
-templates = Jinja2Templates(directory="app/templates")
 logger = logging.getLogger(__name__)
 
 # Create router
@@ -44,37 +42,15 @@ async def admin_users(
     ITEMS_PER_PAGE = 20
 
     try:
-        # Build query
-        query = db.query(User)
-
-        # Search
-        if search:
-            query = query.filter(
-                (User.username.ilike(f"%{search}%")) | (User.email.ilike(f"%{search}%"))
-            )
-
-        # Sorting
-        sort_column = getattr(User, sort, User.id)
-        if order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # Count total
-        total_items = query.count()
-        total_pages = ceil(total_items / ITEMS_PER_PAGE) if total_items > 0 else 1
-
-        # Paginate
-        offset = (page - 1) * ITEMS_PER_PAGE
-        users = query.offset(offset).limit(ITEMS_PER_PAGE).all()
-
-        # Manual load role untuk setiap user
-        for user in users:
-            if user.role_id:
-                try:
-                    user.role = db.query(Role).filter(Role.id == user.role_id).first()
-                except:
-                    user.role = None
+        # Role di-load via JOIN, tidak ada query tambahan per user
+        users, total_pages = user_crud.get_users_page(
+            db,
+            page=page,
+            per_page=ITEMS_PER_PAGE,
+            search=search,
+            sort=sort,
+            order=order,
+        )
 
         current_user = get_current_user(request, db)
         rbac_context = add_rbac_to_context(current_user)
@@ -175,27 +151,15 @@ async def admin_roles(
     """Halaman roles management"""
     ITEMS_PER_PAGE = 20
 
-    # Build query
-    query = db.query(Role)
-
-    # Search
-    if search:
-        query = query.filter(Role.name.ilike(f"%{search}%"))
-
-    # Sorting
-    sort_column = getattr(Role, sort, Role.id)
-    if order == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
-
-    # Count total
-    total_items = query.count()
-    total_pages = ceil(total_items / ITEMS_PER_PAGE) if total_items > 0 else 1
-
-    # Paginate
-    offset = (page - 1) * ITEMS_PER_PAGE
-    roles = query.offset(offset).limit(ITEMS_PER_PAGE).all()
+    # Roles + jumlah user per role (1 query GROUP BY)
+    roles, total_pages, user_counts = user_crud.get_roles_page(
+        db,
+        page=page,
+        per_page=ITEMS_PER_PAGE,
+        search=search,
+        sort=sort,
+        order=order,
+    )
 
     current_user = get_current_user(request, db)
     rbac_context = add_rbac_to_context(current_user)
@@ -207,6 +171,7 @@ async def admin_roles(
             "current_user": current_user,
             **rbac_context,  # Add RBAC permissions
             "roles": roles,
+            "user_counts": user_counts,
             "page": page,
             "total_pages": total_pages,
             "search": search or "",
@@ -428,7 +393,7 @@ async def admin_role_delete(role_id: int, db: Session = Depends(get_db)):
             )
 
         # Check if role has users
-        user_count = db.query(User).filter(User.role_id == role_id).count()
+        user_count = user_crud.count_users_by_role(db, [role_id])[role_id]
         if user_count > 0:
             return RedirectResponse(
                 url=f"/admin/roles?error=Cannot delete role with {user_count} users",
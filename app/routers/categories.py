@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from .. import schemas
-from ..core.deps import get_db  # Import get_db dari core.deps (centralized)
+from ..core.deps import get_db, get_read_db  # get_read_db: boleh dari replica
 from ..crud import category as category_crud
 
 router = APIRouter(prefix="/categories", tags=["categories"])
@@ -16,5 +16,5 @@ def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_
 
 
 @router.get("/", response_model=List[schemas.Category])
-def read_categories(db: Session = Depends(get_db)):
+def read_categories(db: Session = Depends(get_read_db)):
     return category_crud.get_categories(db)
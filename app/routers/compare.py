@@ -1,16 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from .. import schemas
-from ..core.deps import get_db  # Import get_db dari core.deps (centralized)
+from ..core import config
+from ..core.deps import get_read_db  # Read-only: boleh dari replica
+from ..core.http_cache import device_validators, not_modified
 from ..services import ai as ai_service
-from ..services import comparison_service
+from ..services import comparison_service, comparison_store
 
 router = APIRouter(prefix="/compare", tags=["compare"])
 
 
 @router.get("/")
-def compare_devices(id1: int, id2: int, db: Session = Depends(get_db)):
+def compare_devices(
+    id1: int,
+    id2: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+):
     """
     Endpoint untuk membandingkan 2 device.
 
@@ -20,21 +28,75 @@ def compare_devices(id1: int, id2: int, db: Session = Depends(get_db)):
 
     Returns:
         Dictionary berisi device_1, device_2, dan highlights
+        (304 jika ETag client masih berlaku)
     """
     try:
         # Panggil service layer untuk business logic
         result = comparison_service.compare_two_devices(db, id1, id2)
-        return result
     except ValueError as e:
         # Jika device tidak ditemukan
         raise HTTPException(status_code=404, detail=str(e))
 
+    comparison_store.comparison_traffic.record(id1, id2)
+
+    # Hasil n8n bisa menyusul: status enrichment ikut menentukan ETag, dan
+    # hasil "pending" tidak boleh disimpan lama oleh proxy
+    validators = device_validators(
+        "compare-api",
+        [result["device_1"], result["device_2"]],
+        result["source"],
+        result["enriched_at"],
+        result["enrichment"],
+        cache_control=(
+            "no-cache"
+            if result["enrichment"] == "pending"
+            else config.HTTP_CACHE_CONTROL_API
+        ),
+    )
+    cached = not_modified(request, validators)
+    if cached is not None:
+        return cached
+    response.headers.update(validators.headers())
+    return result
+
+
+@router.get("/matrix")
+def compare_devices_matrix(
+    ids: str = Query(..., description="ID device dipisah koma, mis. 1,2,3"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Endpoint untuk membandingkan 2 - COMPARE_MATRIX_MAX_DEVICES device sekaligus.
+
+    Query Parameters:
+        ids: ID device dipisah koma (urutan dipertahankan)
+
+    Returns:
+        Matriks perbandingan: devices, attributes, values, ranks, deltas,
+        winners (ID device terbaik per atribut), win_counts
+    """
+    try:
+        device_ids = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids harus berupa angka")
+
+    if not 2 <= len(device_ids) <= config.COMPARE_MATRIX_MAX_DEVICES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Jumlah device harus 2 - {config.COMPARE_MATRIX_MAX_DEVICES}",
+        )
+
+    try:
+        return comparison_service.compare_many_devices(db, device_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 
 @router.get("/ai")
 def compare_devices_with_ai(
     id1: int = Query(..., description="ID device pertama"),
     id2: int = Query(..., description="ID device kedua"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Endpoint untuk membandingkan 2 device dengan analisis AI dari Grok AI.
@@ -54,18 +116,27 @@ def compare_devices_with_ai(
         - device_2: Data device kedua
         - highlights: Highlight perbandingan
         - ai_analysis: Analisis lengkap dari Grok AI
+        - ai_source: "stored" (hasil batch precompute), "ai", atau "local"
+          jika AI belum menjawab dalam AI_DEADLINE_SECONDS (jawaban AI masuk
+          cache untuk request berikutnya)
+        - ai_generated_at: Waktu jawaban AI didapat
     """
     try:
         # 1. Dapatkan perbandingan dasar (rule-based)
         result = comparison_service.compare_two_devices(db, id1, id2)
 
-        # 2. Dapatkan analisis AI dari Grok AI
-        ai_analysis = ai_service.get_comparison_analysis(
+        comparison_store.comparison_traffic.record(id1, id2)
+
+        # 2. Analisis AI: dari storage (precompute) jika ada, jika tidak
+        #    dari Grok AI (maksimal AI_DEADLINE_SECONDS)
+        ai_result = comparison_store.get_stored_analysis(
+            db, result["device_1"], result["device_2"]
+        ) or ai_service.get_comparison_analysis_within_deadline(
             result["device_1"], result["device_2"]
         )
 
         # 3. Tambahkan AI analysis ke result
-        result["ai_analysis"] = ai_analysis
+        result.update(ai_result)
 
         return result
 
@@ -1,11 +1,20 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
+# get_async_db / get_async_read_db: AsyncSession, tidak memblokir event loop.
+# Read boleh dari replica, write ke primary.
 from .. import schemas
-from ..core.deps import get_db  # Import get_db dari core.deps (centralized)
-from ..crud import device as device_crud
+from ..core import config
+from ..core.deps import get_async_db, get_async_read_db
+from ..core.http_cache import device_validators, not_modified
+from ..core.responses import FastJSONResponse
+from ..crud import device_async
+from ..crud.device import DEVICE_FIELDS, PAGE_SORTS, PageAfter, page_position
+from ..services.catalog_events import IndexNotReady
+from ..services.similarity_index import similarity_index
+from ..utils.cursor import decode_cursor, encode_cursor
 
 # Membuat router (kelompok URL) untuk devices
 router = APIRouter(prefix="/devices", tags=["devices"])
@@ -13,22 +22,119 @@ router = APIRouter(prefix="/devices", tags=["devices"])
 
 # API: Tambah Phone Baru
 @router.post("/", response_model=schemas.Phone)
-def create_device(phone: schemas.PhoneCreate, db: Session = Depends(get_db)):
-    return device_crud.create_device(db=db, phone=phone)
+async def create_device(
+    phone: schemas.PhoneCreate, db: AsyncSession = Depends(get_async_db)
+):
+    return await device_async.create_device(db=db, device=phone)
 
 
-# API: Ambil Semua Phone (bisa cari nama)
+# API: Ambil Semua Phone (bisa cari nama), pagination dengan cursor
 @router.get("/", response_model=List[schemas.Phone])
-def read_devices(
-    skip: int = 0, limit: int = 100, search: str = None, db: Session = Depends(get_db)
+async def read_devices(
+    request: Request,
+    response: Response,
+    limit: int = Query(
+        config.DEVICES_PAGE_MAX_LIMIT, ge=1, le=config.DEVICES_PAGE_MAX_LIMIT
+    ),
+    search: str = None,
+    sort: str = Query("id", description=f"Urutan: {', '.join(PAGE_SORTS)}"),
+    cursor: Optional[str] = Query(
+        None, description="Token dari header X-Next-Cursor halaman sebelumnya"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Kolom yang diambil, dipisah koma (mis. id,name,price)"
+    ),
+    skip: int = Query(
+        0, ge=0, deprecated=True, description="Offset lama, pakai cursor"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    phones = device_crud.get_devices(db, skip=skip, limit=limit, search=search)
+    """
+    List device, urut `sort` lalu id (device tanpa nilai sort di akhir).
+
+    Jika masih ada halaman berikutnya, response berisi header
+    `X-Next-Cursor` (token untuk parameter `cursor`) dan `Link: <...>; rel="next"`.
+    Body tetap berupa list device.
+
+    Dengan `fields=id,name,price` hanya kolom tersebut (+ id) yang di-SELECT
+    dan dikirim, tanpa objek `category` dan tanpa validasi per baris.
+    """
+    if sort not in PAGE_SORTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sort harus salah satu dari: {', '.join(PAGE_SORTS)}",
+        )
+    selected = _parse_fields(fields) if fields else None
+    if skip:
+        if cursor or selected:
+            raise HTTPException(
+                status_code=400,
+                detail="skip tidak bisa dipakai bersama cursor / fields",
+            )
+        # Kompatibilitas client lama (tanpa cursor halaman berikutnya)
+        return await device_async.get_devices(db, skip=skip, limit=limit, search=search)
+
+    after = _decode_page_cursor(cursor, sort) if cursor else None
+    # Kolom sort ikut di-SELECT untuk cursor, walau tidak diminta
+    columns = None
+    if selected:
+        columns = selected + [sort] if sort not in selected else selected
+    phones, has_more = await device_async.get_devices_page(
+        db, sort=sort, after=after, limit=limit, search=search, fields=columns
+    )
+
+    headers = {}
+    if has_more:
+        value, last_id = page_position(phones[-1], sort)
+        next_cursor = encode_cursor({"sort": sort, "value": value, "id": last_id})
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    if selected:
+        # Fast path: baris (tuple) -> JSON langsung, tanpa Pydantic
+        return FastJSONResponse(
+            [dict(zip(selected, row)) for row in phones], headers=headers
+        )
+    response.headers.update(headers)
     return phones
 
 
+def _parse_fields(fields: str) -> List[str]:
+    """ "name,price" -> ["id", "name", "price"]; 400 jika ada kolom tidak dikenal"""
+    selected = ["id"]
+    for field in fields.split(","):
+        field = field.strip()
+        if not field or field in selected:
+            continue
+        if field not in DEVICE_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"fields harus dari: {', '.join(DEVICE_FIELDS)}",
+            )
+        selected.append(field)
+    return selected
+
+
+def _decode_page_cursor(cursor: str, sort: str) -> PageAfter:
+    """Token cursor -> posisi (nilai sort, id); 400 jika tidak valid"""
+    try:
+        payload = decode_cursor(cursor)
+        if payload["sort"] != sort:
+            raise ValueError("Cursor dibuat untuk urutan lain")
+        value = payload["value"]
+        if value is not None:
+            value = PAGE_SORTS[sort][1](value)
+        return (value, int(payload["id"]))
+    except (KeyError, TypeError, ValueError, ArithmeticError):
+        raise HTTPException(status_code=400, detail="Cursor tidak valid")
+
+
 # API: Autocomplete Search (untuk suggestions)
 @router.get("/autocomplete")
-def autocomplete_devices(query: str, db: Session = Depends(get_db)):
+async def autocomplete_devices(
+    query: str, db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Endpoint untuk autocomplete search.
 
@@ -45,7 +151,7 @@ def autocomplete_devices(query: str, db: Session = Depends(get_db)):
 
     # Cari phone yang namanya mengandung query (case insensitive)
     # Limit 5 hasil agar tidak terlalu banyak
-    phones = device_crud.get_devices(db, search=query, limit=5)
+    phones = await device_async.get_devices(db, search=query, limit=5)
 
     # Return hanya data yang diperlukan (id dan name)
     # Biar response lebih ringan
@@ -54,10 +160,112 @@ def autocomplete_devices(query: str, db: Session = Depends(get_db)):
     ]
 
 
+# API: Ambil Beberapa Phone Sekaligus (1 query)
+# Harus dideklarasikan sebelum /{device_id}, supaya "batch" tidak dibaca sebagai ID
+@router.get("/batch", response_model=schemas.PhoneBatch)
+async def read_devices_batch_get(
+    ids: str = Query(..., description="ID device dipisah koma, mis. 1,2,3"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Ambil banyak device dalam 1 request (mis. untuk tabel perbandingan).
+
+    Device dikembalikan urut sesuai `ids` (ID duplikat diabaikan), ID yang
+    tidak ditemukan ada di `missing`. Maksimal DEVICES_BATCH_MAX_IDS ID.
+    """
+    try:
+        device_ids = [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids harus berupa angka")
+    return await _read_devices_batch(db, device_ids)
+
+
+@router.post("/batch", response_model=schemas.PhoneBatch)
+async def read_devices_batch_post(
+    body: schemas.PhoneBatchRequest, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Sama dengan GET /devices/batch, untuk daftar ID yang panjang (body JSON)"""
+    return await _read_devices_batch(db, body.ids)
+
+
+async def _read_devices_batch(db: AsyncSession, device_ids: List[int]) -> dict:
+    device_ids = list(dict.fromkeys(device_ids))
+    if not 1 <= len(device_ids) <= config.DEVICES_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Jumlah ID harus 1 - {config.DEVICES_BATCH_MAX_IDS}",
+        )
+    devices = await device_async.get_devices_by_ids(db, device_ids)
+    found = {device.id for device in devices}
+    return {
+        "devices": devices,
+        "missing": [device_id for device_id in device_ids if device_id not in found],
+    }
+
+
 # API: Ambil Detail Phone per ID
 @router.get("/{device_id}", response_model=schemas.Phone)
-def read_device(device_id: int, db: Session = Depends(get_db)):
-    db_phone = device_crud.get_device(db, phone_id=device_id)
+async def read_device(
+    device_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    db_phone = await device_async.get_device(db, device_id)
     if db_phone is None:
         raise HTTPException(status_code=404, detail="Phone not found")
+
+    # ETag dari revision device: 304 tanpa serialisasi jika client sudah punya
+    validators = device_validators(
+        "device-api", [db_phone], cache_control=config.HTTP_CACHE_CONTROL_API
+    )
+    cached = not_modified(request, validators)
+    if cached is not None:
+        return cached
+    response.headers.update(validators.headers())
     return db_phone
+
+
+# API: Device Alternatif (k-NN berdasarkan spesifikasi)
+@router.get("/{device_id}/similar", response_model=List[schemas.SimilarPhone])
+async def read_similar_devices(
+    device_id: int,
+    k: int = Query(5, ge=1, le=config.SIMILAR_INDEX_K),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Device di kategori yang sama dengan spesifikasi paling mirip
+    (harga, RAM, storage, kamera, baterai, layar, tahun rilis).
+
+    Tetangga terdekat dibaca dari similarity index yang sudah dihitung,
+    database hanya dipakai untuk mengambil data device hasilnya.
+
+    503 hanya saat index belum pernah dibangun (cold start). Device yang
+    belum ada di index (mis. baru dibuat di worker lain) mendapat list
+    kosong sementara index dibangun ulang di background.
+    """
+    try:
+        similarity_index.require_ready()
+    except IndexNotReady:
+        raise HTTPException(
+            status_code=503,
+            detail="Index device serupa sedang dibangun, coba lagi",
+            headers={"Retry-After": "5"},
+        )
+    neighbors = similarity_index.similar(device_id, k)
+
+    if neighbors is None:
+        if await device_async.get_device(db, device_id) is None:
+            raise HTTPException(status_code=404, detail="Phone not found")
+        if not similarity_index.stale:
+            similarity_index.mark_stale()
+        return []
+
+    devices = await device_async.get_devices_by_ids(
+        db, [neighbor_id for _, neighbor_id in neighbors]
+    )
+    distances = {neighbor_id: distance for distance, neighbor_id in neighbors}
+    return [
+        {"device": device, "distance": round(distances[device.id], 4)}
+        for device in devices
+    ]
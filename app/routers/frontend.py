@@ -2,20 +2,37 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-
-from ..core.deps import get_db
-from ..crud import device as device_crud
-
-# Setup Jinja2 Templates
-templates = Jinja2Templates(directory="app/templates")
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core import config
+from ..core.deps import get_async_read_db  # Read-only: boleh dari replica
+from ..core.http_cache import device_validators, not_modified
+from ..core.templates import environment
+from ..crud import device_async
+from ..services.catalog_events import IndexNotReady
+from ..services.comparison_rules import highlight_engine
+from ..services.comparison_store import comparison_traffic
+from ..services.facet_index import brand_key, facet_index
+from ..services.page_cache import CachedJinja2Templates, page_cache
+from ..services.percentile_index import device_badges
+
+# Setup Jinja2 Templates: environment bersama (core/templates.py)
+# + cache HTML halaman publik (page_cache.py)
+templates = CachedJinja2Templates(env=environment, cache=page_cache)
+
+# Halaman sementara saat index katalog belum selesai dibangun (cold start)
+INDEX_WARMING_HTML = (
+    '<!DOCTYPE html><html><head><meta charset="utf-8">'
+    '<meta http-equiv="refresh" content="5"><title>COMPARELY</title></head>'
+    "<body><p>Daftar device sedang disiapkan, halaman dimuat ulang otomatis...</p>"
+    "</body></html>"
+)
 
 router = APIRouter(tags=["frontend"])
 
 
 @router.get("/", response_class=HTMLResponse)
-async def homepage(request: Request, db: Session = Depends(get_db)):
+async def homepage(request: Request, db: AsyncSession = Depends(get_async_read_db)):
     """
     Homepage COMPARELY - Menampilkan halaman utama dengan:
     - Hero section dengan search bar
@@ -25,11 +42,16 @@ async def homepage(request: Request, db: Session = Depends(get_db)):
     Penjelasan:
     - Request: Object dari FastAPI yang berisi info tentang HTTP request
     - db: Database session untuk query data
-    - templates.TemplateResponse: Render HTML template dengan data
+    - templates.render_page: Render HTML template dengan data (di-cache
+      sampai katalog berubah)
     """
+    key = templates.page_key(request, "index.html", catalog_wide=True)
+    cached = templates.cached_page(request, key)
+    if cached is not None:
+        return cached
 
     # Ambil 2 device terbaru untuk example comparison
-    devices = device_crud.get_devices(db, skip=0, limit=2)
+    devices = await device_async.get_devices(db, skip=0, limit=2)
 
     # Siapkan data untuk template
     comparison_data = {
@@ -80,14 +102,14 @@ async def homepage(request: Request, db: Session = Depends(get_db)):
         }
 
     # Render template dengan data
-    return templates.TemplateResponse(
-        "index.html", {"request": request, "comparison": comparison_data}
+    return templates.render_page(
+        key, "index.html", {"request": request, "comparison": comparison_data}
     )
 
 
 @router.get("/device/{device_id}", response_class=HTMLResponse)
 async def device_detail_page(
-    request: Request, device_id: int, db: Session = Depends(get_db)
+    request: Request, device_id: int, db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Halaman detail 1 device.
@@ -100,15 +122,37 @@ async def device_detail_page(
     """
 
     # Ambil data device dari database berdasarkan ID
-    device = device_crud.get_device(db, device_id)
+    device = await device_async.get_device(db, device_id)
 
     # Kalau device tidak ada, redirect ke halaman devices
     if not device:
         return RedirectResponse(url="/devices")
 
+    # Badge "Top X% di kategori" dari percentile index (tanpa query tambahan)
+    badges = device_badges(device)
+
+    # Badge bergantung pada device lain, jadi ikut menentukan ETag.
+    # Jika browser/proxy sudah punya versi ini: 304 tanpa render template.
+    validators = device_validators(
+        "device-page", [device], badges, cache_control=config.HTTP_CACHE_CONTROL_PAGES
+    )
+    cached = not_modified(request, validators)
+    if cached is not None:
+        return cached
+
+    # HTML yang sama (ETag sama) sudah pernah di-render di worker ini
+    key = templates.page_key(request, "device_detail.html", validators.etag)
+    cached = templates.cached_page(request, key, headers=validators.headers())
+    if cached is not None:
+        return cached
+
     # Render template device_detail.html dengan data device
-    return templates.TemplateResponse(
-        "device_detail.html", {"request": request, "device": device}
+    return templates.render_page(
+        key,
+        "device_detail.html",
+        {"request": request, "device": device, "badges": badges},
+        device_ids=[device.id],
+        headers=validators.headers(),
     )
 
 
@@ -119,66 +163,102 @@ async def devices_page(
     brand: Optional[str] = None,
     ram: Optional[str] = None,
     storage: Optional[str] = None,
+    year: Optional[str] = None,
+    min_price: Optional[str] = None,
     max_price: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     Halaman daftar semua device dengan advanced filters.
 
     Cara kerja:
     - Tampilkan semua device dalam bentuk grid atau list
-    - User bisa filter berdasarkan kategori, brand, RAM, storage, dan harga
+    - User bisa filter berdasarkan kategori, brand, RAM, storage, tahun, dan harga
+    - Setiap opsi dropdown menampilkan jumlah device jika opsi itu dipilih
     - User bisa pilih 2 device untuk dibandingkan
 
-    Filters:
+    Filters (dicari di facet index in-memory, lihat facet_index.py):
     - category: 1 (Smartphone) atau 2 (Laptop)
     - brand: Brand name (Samsung, Apple, dll)
-    - ram: RAM size (4GB, 8GB, dll)
-    - storage: Storage size (128GB, 256GB, dll)
-    - max_price: Harga maksimal (contoh: 5000000)
+    - ram: RAM tier (4GB, 8GB, dll; 10GB masuk tier 8GB)
+    - storage: Storage tier (128GB, 256GB, dll)
+    - year: Tahun rilis
+    - min_price / max_price: Rentang harga (contoh: 5000000)
     """
 
-    # Get unique brands for filter dropdown
-    brands = device_crud.get_unique_brands(db)
-
-    # Convert parameters
-    category_id = int(category) if category else None
-    max_price_float = None
-    if max_price and max_price.strip():
-        try:
-            max_price_float = float(max_price)
-        except ValueError:
-            pass
-
-    # Get filtered devices using new function
-    devices = device_crud.get_devices_filtered(
-        db=db,
-        category_id=category_id,
-        brand=brand if brand else None,
-        ram=ram if ram else None,
-        storage=storage if storage else None,
-        max_price=max_price_float,
+    def to_number(value: Optional[str], cast=float):
+        if value and value.strip():
+            try:
+                return cast(value)
+            except ValueError:
+                pass
+        return None
+
+    try:
+        facet_index.require_ready()
+    except IndexNotReady:
+        # Cold start: index dibangun di background, browser mencoba lagi sendiri
+        return HTMLResponse(
+            INDEX_WARMING_HTML, status_code=503, headers={"Retry-After": "5"}
+        )
+
+    # Hasil filter bergantung pada seluruh katalog (dan isi facet index)
+    key = templates.page_key(
+        request,
+        "devices.html",
+        category,
+        brand,
+        ram,
+        storage,
+        year,
+        min_price,
+        max_price,
+        facet_index.built_at,
+        catalog_wide=True,
+    )
+    cached = templates.cached_page(request, key)
+    if cached is not None:
+        return cached
+
+    result = facet_index.search(
+        {
+            "category": to_number(category, int),
+            "brand": brand_key(brand),
+            "ram": ram or None,
+            "storage": storage or None,
+            "year": to_number(year, int),
+        },
+        min_price=to_number(min_price),
+        max_price=to_number(max_price),
         limit=100,
     )
+    devices = await device_async.get_devices_by_ids(db, result["ids"])
 
     # Render template devices.html dengan data
-    return templates.TemplateResponse(
+    return templates.render_page(
+        key,
         "devices.html",
         {
             "request": request,
             "devices": devices,
-            "brands": brands,  # Pass brands list for dropdown
+            "total_devices": result["total"],
+            "facets": facet_index.options(result["counts"]),
+            "category_counts": result["counts"]["category"],
+            "price_counts": result["counts"]["price"],
             "category": category,
             "brand": brand,
             "ram": ram,
             "storage": storage,
+            "year": year,
             "max_price": max_price,
         },
     )
 
 
 @router.get("/search", response_class=HTMLResponse)
-async def search_devices(request: Request, query: str, db: Session = Depends(get_db)):
+async def search_devices(
+    request: Request, query: str, db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Search devices berdasarkan query dari user.
 
@@ -189,7 +269,7 @@ async def search_devices(request: Request, query: str, db: Session = Depends(get
     """
 
     # Cari devices berdasarkan query (nama atau brand)
-    devices = device_crud.get_devices(db, search=query, limit=50)
+    devices = await device_async.get_devices(db, search=query, limit=50)
 
     # Render template search_results.html dengan hasil pencarian
     return templates.TemplateResponse(
@@ -205,7 +285,7 @@ async def search_devices(request: Request, query: str, db: Session = Depends(get
 
 @router.get("/compare-page", response_class=HTMLResponse)
 async def compare_page(
-    request: Request, id1: int, id2: int, db: Session = Depends(get_db)
+    request: Request, id1: int, id2: int, db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Halaman perbandingan 2 device.
@@ -218,181 +298,59 @@ async def compare_page(
     """
 
     # Ambil data device pertama dari database
-    device1 = device_crud.get_device(db, id1)
+    device1 = await device_async.get_device(db, id1)
     # Ambil data device kedua dari database
-    device2 = device_crud.get_device(db, id2)
+    device2 = await device_async.get_device(db, id2)
 
     # Kalau salah satu device tidak ada, redirect ke homepage
     if not device1 or not device2:
         return RedirectResponse(url="/")
 
-    # Buat highlights (perbandingan sederhana)
-    # Ini logika sederhana untuk mahasiswa, bukan pakai AI dulu
-    highlights = []
-
-    # Bandingkan harga
-    if device1.price and device2.price:
-        price_diff = abs(device1.price - device2.price)
-        if device1.price < device2.price:
-            highlights.append(
-                {
-                    "category": "<i class='fa-solid fa-tag'></i> Harga",
-                    "winner": f"{device1.name} lebih murah Rp {price_diff:,.0f}",
-                }
-            )
-        elif device2.price < device1.price:
-            highlights.append(
-                {
-                    "category": "<i class='fa-solid fa-tag'></i> Harga",
-                    "winner": f"{device2.name} lebih murah Rp {price_diff:,.0f}",
-                }
-            )
-
-    # Bandingkan tahun rilis
-    if device1.release_year and device2.release_year:
-        if device1.release_year > device2.release_year:
-            highlights.append(
-                {
-                    "category": "<i class='fa-solid fa-calendar'></i> Tahun Rilis",
-                    "winner": f"{device1.name} lebih baru ({device1.release_year})",
-                }
-            )
-        elif device2.release_year > device1.release_year:
-            highlights.append(
-                {
-                    "category": "<i class='fa-solid fa-calendar'></i> Tahun Rilis",
-                    "winner": f"{device2.name} lebih baru ({device2.release_year})",
-                }
-            )
-
-    # Bandingkan RAM (extract angka dari string seperti "8GB")
-    if device1.ram and device2.ram:
-        try:
-            ram1 = int("".join(filter(str.isdigit, device1.ram)))
-            ram2 = int("".join(filter(str.isdigit, device2.ram)))
-            if ram1 > ram2:
-                highlights.append(
-                    {
-                        "category": "<i class='fa-solid fa-memory'></i> RAM",
-                        "winner": f"{device1.name} lebih besar ({device1.ram} vs {device2.ram})",
-                    }
-                )
-            elif ram2 > ram1:
-                highlights.append(
-                    {
-                        "category": "<i class='fa-solid fa-memory'></i> RAM",
-                        "winner": f"{device2.name} lebih besar ({device2.ram} vs {device1.ram})",
-                    }
-                )
-        except:
-            pass  # Skip jika format RAM tidak standar
-
-    # Bandingkan Storage (extract angka dari string seperti "256GB")
-    if device1.storage and device2.storage:
-        try:
-            storage1 = int("".join(filter(str.isdigit, device1.storage)))
-            storage2 = int("".join(filter(str.isdigit, device2.storage)))
-            if storage1 > storage2:
-                highlights.append(
-                    {
-                        "category": "<i class='fa-solid fa-hard-drive'></i> Storage",
-                        "winner": f"{device1.name} lebih besar ({device1.storage} vs {device2.storage})",
-                    }
-                )
-            elif storage2 > storage1:
-                highlights.append(
-                    {
-                        "category": "<i class='fa-solid fa-hard-drive'></i> Storage",
-                        "winner": f"{device2.name} lebih besar ({device2.storage} vs {device1.storage})",
-                    }
-                )
-        except:
-            pass
-
-    # Bandingkan Kamera (extract angka MP dari string seperti "48MP + 12MP")
-    if device1.camera and device2.camera:
-        try:
-            # Ambil angka pertama (main camera)
-            cam1 = int("".join(filter(str.isdigit, device1.camera.split("+")[0])))
-            cam2 = int("".join(filter(str.isdigit, device2.camera.split("+")[0])))
-            if cam1 > cam2:
-                highlights.append(
-                    {
-                        "category": "<i class='fa-solid fa-camera'></i> Kamera",
-                        "winner": f"{device1.name} lebih tinggi ({cam1}MP vs {cam2}MP)",
-                    }
-                )
-            elif cam2 > cam1:
-                highlights.append(
-                    {
-                        "category": "<i class='fa-solid fa-camera'></i> Kamera",
-                        "winner": f"{device2.name} lebih tinggi ({cam2}MP vs {cam1}MP)",
-                    }
-                )
-        except:
-            pass
-
-    # Bandingkan Baterai (extract angka mAh dari string seperti "5000 mAh")
-    if device1.battery and device2.battery:
-        try:
-            bat1 = int("".join(filter(str.isdigit, device1.battery)))
-            bat2 = int("".join(filter(str.isdigit, device2.battery)))
-            if bat1 > bat2:
-                highlights.append(
-                    {
-                        "category": "<i class='fa-solid fa-battery-three-quarters'></i> Baterai",
-                        "winner": f"{device1.name} lebih besar ({bat1} mAh vs {bat2} mAh)",
-                    }
-                )
-            elif bat2 > bat1:
-                highlights.append(
-                    {
-                        "category": "<i class='fa-solid fa-battery-three-quarters'></i> Baterai",
-                        "winner": f"{device2.name} lebih besar ({bat2} mAh vs {bat1} mAh)",
-                    }
-                )
-        except:
-            pass
-
-    # Bandingkan Screen (extract angka inch dari string seperti "6.7\"")
-    if device1.screen and device2.screen:
-        try:
-            screen1 = float(
-                "".join(
-                    c for c in device1.screen.split('"')[0] if c.isdigit() or c == "."
-                )
-            )
-            screen2 = float(
-                "".join(
-                    c for c in device2.screen.split('"')[0] if c.isdigit() or c == "."
-                )
-            )
-            if screen1 > screen2:
-                highlights.append(
-                    {
-                        "category": "<i class='fa-solid fa-display'></i> Layar",
-                        "winner": f'{device1.name} lebih besar ({screen1}" vs {screen2}")',
-                    }
-                )
-            elif screen2 > screen1:
-                highlights.append(
-                    {
-                        "category": "<i class='fa-solid fa-display'></i> Layar",
-                        "winner": f'{device2.name} lebih besar ({screen2}" vs {screen1}")',
-                    }
-                )
-        except:
-            pass
+    # Catat pasangan untuk batch precompute analisis AI
+    comparison_traffic.record(id1, id2)
+
+    badges1, badges2 = device_badges(device1), device_badges(device2)
+    # Highlights hanya bergantung pada kedua device (rule engine statis),
+    # jadi 304 bisa dijawab sebelum rule engine dan render template
+    validators = device_validators(
+        "compare-page",
+        [device1, device2],
+        badges1,
+        badges2,
+        cache_control=config.HTTP_CACHE_CONTROL_PAGES,
+    )
+    cached = not_modified(request, validators)
+    if cached is not None:
+        return cached
+
+    key = templates.page_key(request, "compare.html", validators.etag)
+    cached = templates.cached_page(request, key, headers=validators.headers())
+    if cached is not None:
+        return cached
+
+    # Buat highlights dengan rule engine yang sama seperti API /compare/
+    highlights = [
+        {
+            "category": f"<i class='fa-solid {highlight['icon']}'></i> {highlight['label']}",
+            "winner": highlight["text"],
+        }
+        for highlight in highlight_engine.evaluate(device1, device2)
+    ]
 
     # Render template compare.html dengan data yang sudah disiapkan
-    return templates.TemplateResponse(
+    return templates.render_page(
+        key,
         "compare.html",
         {
             "request": request,
             "device1": device1,
             "device2": device2,
             "highlights": highlights,
+            "badges1": badges1,
+            "badges2": badges2,
         },
+        device_ids=[device1.id, device2.id],
+        headers=validators.headers(),
     )
 
 
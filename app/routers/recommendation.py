@@ -1,18 +1,36 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from .. import schemas
 from ..core.config import USE_CASES
-from ..core.deps import get_db
-from ..schemas.device import Device
+from ..core.deps import get_read_db
 from ..services import ai as ai_service
 from ..services import recommendation_service
+from ..services.catalog_events import IndexNotReady
 
 router = APIRouter(prefix="/recommendation", tags=["recommendation"])
 
 
-@router.get("/", response_model=List[Device])
+def _validate_use_case(use_case: Optional[str]) -> None:
+    if use_case is not None and use_case not in USE_CASES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"use_case harus salah satu dari: {', '.join(USE_CASES)}",
+        )
+
+
+def _index_not_ready() -> HTTPException:
+    # Cold start: index dibangun di background, request tidak ikut menunggu
+    return HTTPException(
+        status_code=503,
+        detail="Index rekomendasi sedang dibangun, coba lagi",
+        headers={"Retry-After": "5"},
+    )
+
+
+@router.get("/", response_model=List[schemas.ScoredPhone])
 def get_device_recommendations(
     max_price: Optional[float] = Query(None, description="Harga maksimal (Rp)"),
     category_id: Optional[int] = Query(
@@ -21,37 +39,91 @@ def get_device_recommendations(
     min_release_year: Optional[int] = Query(
         None, description="Tahun rilis minimal (misal: 2020)"
     ),
+    use_case: Optional[str] = Query(
+        None, description=f"Use case: {', '.join(USE_CASES)}"
+    ),
     limit: int = Query(5, description="Jumlah rekomendasi maksimal", ge=1, le=20),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Endpoint untuk mendapatkan rekomendasi device.
 
     **Cara Pakai:**
-    - Tanpa parameter: Menampilkan 5 device terbaru
+    - Tanpa parameter: 5 device dengan skor umum tertinggi
     - Dengan `max_price`: Filter device dengan harga <= max_price
     - Dengan `category_id`: Filter berdasarkan kategori (1=Smartphone, 2=Laptop)
     - Dengan `min_release_year`: Filter device yang rilis >= tahun tertentu
+    - Dengan `use_case`: Ranking memakai bobot use case tersebut
 
     **Contoh:**
     - `/recommendation/?max_price=5000000` → Device dengan harga max 5 juta
     - `/recommendation/?category_id=1&max_price=10000000` → Smartphone max 10 juta
-    - `/recommendation/?min_release_year=2022&limit=10` → 10 device terbaru (2022+)
+    - `/recommendation/?use_case=gaming&limit=10` → 10 device terbaik untuk gaming
 
     **Hasil:**
-    Device akan di-sort berdasarkan:
-    1. Tahun rilis (terbaru dulu)
-    2. Harga (termurah dulu)
+    Device di-sort berdasarkan `score` (0-100): jumlah berbobot spesifikasi
+    (harga, tahun rilis, RAM, storage, kamera, baterai, layar) sesuai use case.
     """
-    recommendations = recommendation_service.get_recommendations(
-        db=db,
-        max_price=max_price,
-        category_id=category_id,
-        min_release_year=min_release_year,
-        limit=limit,
-    )
+    _validate_use_case(use_case)
+    try:
+        recommendations = recommendation_service.get_scored_recommendations(
+            db=db,
+            use_case=use_case,
+            max_price=max_price,
+            category_id=category_id,
+            min_release_year=min_release_year,
+            limit=limit,
+        )
+    except IndexNotReady:
+        raise _index_not_ready()
+
+    return [
+        schemas.ScoredPhone(
+            **schemas.Phone.model_validate(item["device"]).model_dump(),
+            score=item["score"],
+            use_case=item["use_case"],
+        )
+        for item in recommendations
+    ]
+
+
+@router.get("/best-value", response_model=List[schemas.BestValuePhone])
+def get_best_value_devices(
+    max_price: Optional[float] = Query(None, description="Harga maksimal (Rp)"),
+    category_id: Optional[int] = Query(
+        None, description="ID Kategori (1=Smartphone, 2=Laptop)"
+    ),
+    limit: int = Query(5, description="Jumlah device maksimal", ge=1, le=20),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Endpoint untuk device dengan performa terbaik di harga tertentu.
+
+    Hanya device di Pareto frontier yang dikembalikan: tidak ada device lain
+    di kategori yang sama yang lebih murah sekaligus performanya lebih tinggi.
 
-    return recommendations
+    **Contoh:**
+    - `/recommendation/best-value?max_price=5000000` → Performa terbaik max 5 juta
+    - `/recommendation/best-value?category_id=1&max_price=10000000&limit=3`
+
+    **Hasil:**
+    Device di-sort berdasarkan `performance_score` (0-100): jumlah berbobot
+    RAM, kamera, tahun rilis, storage, baterai, dan layar (tanpa harga).
+    """
+    try:
+        results = recommendation_service.get_best_value_devices(
+            db=db, max_price=max_price, category_id=category_id, limit=limit
+        )
+    except IndexNotReady:
+        raise _index_not_ready()
+
+    return [
+        schemas.BestValuePhone(
+            **schemas.Phone.model_validate(item["device"]).model_dump(),
+            performance_score=item["performance_score"],
+        )
+        for item in results
+    ]
 
 
 @router.get("/ai")
@@ -65,13 +137,13 @@ def get_ai_recommendations(
         None, description=f"Use case: {', '.join(USE_CASES)}"
     ),
     limit: int = Query(5, description="Jumlah rekomendasi maksimal", ge=1, le=10),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Endpoint untuk mendapatkan rekomendasi device dengan analisis AI dari Grok AI.
 
     **Fitur Baru dengan AI:**
-    - Filter device berdasarkan kriteria (sama seperti /recommendation/)
+    - Kandidat device dipilih dengan skor use case (sama seperti /recommendation/)
     - **Ranking & analisis dari Grok AI**
     - Penjelasan kenapa device cocok untuk use case tertentu
 
@@ -90,15 +162,26 @@ def get_ai_recommendations(
         Dictionary berisi:
         - devices: List device yang direkomendasikan
         - ai_recommendation: Analisis & ranking dari Grok AI
+        - ai_source: "ai", atau "local" jika AI belum menjawab dalam
+          AI_DEADLINE_SECONDS (jawaban AI masuk cache untuk request berikutnya)
+        - ai_generated_at: Waktu jawaban AI didapat
     """
-    # 1. Filter device berdasarkan kriteria (rule-based)
-    devices = recommendation_service.get_recommendations(
-        db=db,
-        max_price=max_price,
-        category_id=category_id,
-        min_release_year=min_release_year,
-        limit=limit,
-    )
+    # 1. Kandidat terbaik untuk use case (skor per use case)
+    _validate_use_case(use_case)
+    try:
+        devices = [
+            item["device"]
+            for item in recommendation_service.get_scored_recommendations(
+                db=db,
+                use_case=use_case,
+                max_price=max_price,
+                category_id=category_id,
+                min_release_year=min_release_year,
+                limit=limit,
+            )
+        ]
+    except IndexNotReady:
+        raise _index_not_ready()
 
     # 2. Jika tidak ada device yang match, return empty
     if not devices:
@@ -107,8 +190,8 @@ def get_ai_recommendations(
             "ai_recommendation": "Maaf, tidak ada device yang sesuai dengan kriteria Anda.",
         }
 
-    # 3. Dapatkan rekomendasi AI dari Grok AI
-    result = ai_service.get_ai_recommendation(
+    # 3. Dapatkan rekomendasi AI dari Grok AI (maksimal AI_DEADLINE_SECONDS)
+    result = ai_service.get_ai_recommendation_within_deadline(
         devices=devices, use_case=use_case, max_price=max_price
     )
 
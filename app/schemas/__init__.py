@@ -6,7 +6,16 @@ Contoh: from app.schemas import Phone, Category, PhoneCreate
 """
 
 from .category import Category, CategoryBase, CategoryCreate
-from .phone import Phone, PhoneBase, PhoneCreate
+from .phone import (
+    BestValuePhone,
+    Phone,
+    PhoneBase,
+    PhoneBatch,
+    PhoneBatchRequest,
+    PhoneCreate,
+    ScoredPhone,
+    SimilarPhone,
+)
 
 # List semua schema yang bisa di-import
 __all__ = [
@@ -18,4 +27,9 @@ __all__ = [
     "Phone",
     "PhoneCreate",
     "PhoneBase",
+    "PhoneBatch",
+    "PhoneBatchRequest",
+    "SimilarPhone",
+    "ScoredPhone",
+    "BestValuePhone",
 ]
@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -69,3 +69,46 @@ class Phone(PhoneBase):
     class Config:
         # Agar bisa convert dari SQLAlchemy model ke Pydantic
         from_attributes = True
+
+
+class PhoneBatchRequest(BaseModel):
+    """
+    Body untuk POST /devices/batch.
+    """
+
+    ids: List[int]  # ID device, urutan dipertahankan
+
+
+class PhoneBatch(BaseModel):
+    """
+    Schema untuk hasil /devices/batch: device yang ditemukan + ID yang tidak ada.
+    """
+
+    devices: List[Phone]  # Urut sesuai ID di request
+    missing: List[int]  # ID yang tidak ditemukan
+
+
+class SimilarPhone(BaseModel):
+    """
+    Schema untuk 1 device alternatif dari /devices/{id}/similar.
+    """
+
+    device: Phone
+    distance: float  # Jarak spesifikasi (0 = identik, makin kecil makin mirip)
+
+
+class ScoredPhone(Phone):
+    """
+    Schema untuk hasil /recommendation/: data Phone + skor use case.
+    """
+
+    score: float  # Skor use case 0-100 (makin tinggi makin cocok)
+    use_case: str  # Use case yang dipakai untuk skor, mis. "gaming"
+
+
+class BestValuePhone(Phone):
+    """
+    Schema untuk hasil /recommendation/best-value: data Phone + skor performa.
+    """
+
+    performance_score: float  # Skor performa 0-100 (spesifikasi selain harga)
@@ -3,23 +3,36 @@ Service untuk integrasi dengan AI.
 Menyediakan analisis perbandingan dan rekomendasi device menggunakan AI.
 """
 
+import hashlib
 import json
 import os
-from typing import Dict, List, Optional
-
-import requests
-from dotenv import load_dotenv
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
 
 from .. import models
-
-# Load environment variables
-load_dotenv()
-
-# AI Configuration - Load dari environment variable
+from ..core import config
+from ..utils import specs
+from ..utils.ttl_cache import TTLCache
+from . import background, resilience
+from .recommendation_service import calculate_device_score
+from .resilience import UpstreamRejected
+
+# AI Configuration - Load dari environment variable (.env di-load oleh core/config.py)
 AI_API_KEY = os.getenv("AI_API_KEY", "")
 AI_API_URL = "https://api.x.ai/v1/chat/completions"
 AI_MODEL = "grok-4-1-fast-reasoning"  # Model AI yang digunakan
 
+SYSTEM_PROMPT = "Kamu adalah asisten ahli teknologi yang membantu user memilih smartphone. Selalu jawab dalam format JSON yang valid."
+
+# Cache jawaban AI (key: hash dari prompt). Diisi juga oleh panggilan AI
+# yang selesai setelah deadline request lewat.
+ai_cache = TTLCache(ttl=config.AI_CACHE_TTL, max_entries=1024)
+
+
+class AINotConfigured(Exception):
+    """AI_API_KEY belum diisi"""
+
 
 def call_ai_api(messages: List[Dict], temperature: float = 0.7) -> str:
     """
@@ -32,8 +45,19 @@ def call_ai_api(messages: List[Dict], temperature: float = 0.7) -> str:
     Returns:
         Response text dari AI
     """
-    # Validasi API key
-    if not AI_API_KEY or AI_API_KEY == "":
+    # Import saat dipakai: requests cukup berat dan fitur AI opsional
+    import requests
+
+    try:
+        return request_ai_completion(messages, temperature)
+
+    except UpstreamRejected:
+        return """⏳ **AI sedang tidak tersedia**
+
+Layanan AI sedang bermasalah atau sibuk, jadi permintaan tidak dikirim.
+Silakan coba lagi dalam beberapa saat."""
+
+    except AINotConfigured:
         return """⚠️ **AI tidak tersedia**
 
 Untuk menggunakan fitur AI, silakan:
@@ -46,25 +70,6 @@ Untuk menggunakan fitur AI, silakan:
 
 Sementara itu, Anda masih bisa melihat perbandingan manual di atas."""
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {AI_API_KEY}",
-    }
-
-    payload = {
-        "messages": messages,
-        "model": AI_MODEL,
-        "stream": False,
-        "temperature": temperature,
-    }
-
-    try:
-        response = requests.post(AI_API_URL, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-
-        data = response.json()
-        return data["choices"][0]["message"]["content"]
-
     except requests.exceptions.Timeout:
         return """⏱️ **Request timeout**
 
@@ -73,6 +78,7 @@ Koneksi ke AI terlalu lama. Silakan:
 - Coba lagi dalam beberapa saat"""
 
     except requests.exceptions.HTTPError as e:
+        response = e.response
         if response.status_code == 401:
             return """🔑 **API Key tidak valid**
 
@@ -109,6 +115,49 @@ Format response dari AI tidak sesuai.
 Detail: {str(e)}"""
 
 
+def request_ai_completion(messages: List[Dict], temperature: float = 0.7) -> str:
+    """
+    Kirim request ke AI API tanpa menangkap error.
+
+    Dipakai oleh `call_ai_api` (yang mengubah error jadi pesan untuk user)
+    dan oleh panggilan AI di background (yang hanya meng-cache jawaban sukses).
+
+    Raises:
+        AINotConfigured: Jika AI_API_KEY kosong
+        UpstreamRejected: Jika circuit breaker AI terbuka / limit concurrency penuh
+        requests.exceptions.RequestException: Jika request gagal / timeout
+        KeyError, IndexError: Jika format response tidak sesuai
+    """
+    if not AI_API_KEY:
+        raise AINotConfigured()
+
+    import requests
+
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {AI_API_KEY}",
+    }
+
+    payload = {
+        "messages": messages,
+        "model": AI_MODEL,
+        "stream": False,
+        "temperature": temperature,
+    }
+
+    def post():
+        response = requests.post(
+            AI_API_URL, headers=headers, json=payload, timeout=config.AI_TIMEOUT
+        )
+        response.raise_for_status()
+        return response
+
+    # Lewat circuit breaker: saat AI down, gagal cepat tanpa menunggu timeout
+    response = resilience.ai_upstream.call(post)
+    data = response.json()
+    return data["choices"][0]["message"]["content"]
+
+
 def get_comparison_analysis(device1: models.Phone, device2: models.Phone) -> str:
     """
     Mendapatkan analisis perbandingan 2 device dari AI.
@@ -121,8 +170,20 @@ def get_comparison_analysis(device1: models.Phone, device2: models.Phone) -> str
         String berisi analisis AI dalam bahasa Indonesia
     """
     try:
-        # Buat prompt dengan format JSON strict
-        user_prompt = f"""Bandingkan 2 smartphone berikut. Output HARUS dalam format JSON yang valid.
+        # Call AI API
+        response_text = call_ai_api(
+            comparison_messages(device1, device2), temperature=0.7
+        )
+        return format_comparison_response(response_text)
+
+    except Exception as e:
+        return f"Maaf, analisis AI sedang tidak tersedia. Error: {str(e)}"
+
+
+def comparison_messages(device1: models.Phone, device2: models.Phone) -> List[Dict]:
+    """Prompt perbandingan 2 device (format JSON strict)"""
+    # Buat prompt dengan format JSON strict
+    user_prompt = f"""Bandingkan 2 smartphone berikut. Output HARUS dalam format JSON yang valid.
 
 Device 1: {device1.name} ({device1.brand}) - Rp {device1.price:,.0f} - {device1.release_year}
 CPU: {device1.cpu}, RAM: {device1.ram}, Kamera: {device1.camera}, Baterai: {device1.battery}
@@ -142,31 +203,21 @@ Kamu wajib memberikan output dalam format JSON berikut:
 
 Jangan gunakan format lain. Hanya kirim JSON yang valid. Jawab dalam bahasa Indonesia."""
 
-        messages = [
-            {
-                "role": "system",
-                "content": "Kamu adalah asisten ahli teknologi yang membantu user memilih smartphone. Selalu jawab dalam format JSON yang valid.",
-            },
-            {"role": "user", "content": user_prompt},
-        ]
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
 
-        # Call AI API
-        response_text = call_ai_api(messages, temperature=0.7)
 
-        # Parse JSON response
-        try:
-            # Clean response (hapus markdown jika ada)
-            clean_text = response_text.strip()
-            if clean_text.startswith("```json"):
-                clean_text = (
-                    clean_text.replace("```json", "").replace("```", "").strip()
-                )
-
-            # Parse JSON
-            analysis = json.loads(clean_text)
-
-            # Format ke text yang readable
-            formatted = f"""
+def format_comparison_response(response_text: str) -> str:
+    """Ubah jawaban JSON AI menjadi teks analisis yang readable"""
+    # Parse JSON response
+    try:
+        # Parse JSON (hapus markdown jika ada)
+        analysis = json.loads(_clean_json(response_text))
+
+        # Format ke text yang readable
+        formatted = f"""
 **Performa:** {analysis.get('performa', 'N/A')}
 
 **Kamera:** {analysis.get('kamera', 'N/A')}
@@ -177,14 +228,11 @@ Jangan gunakan format lain. Hanya kirim JSON yang valid. Jawab dalam bahasa Indo
 
 **Rekomendasi:** {analysis.get('rekomendasi', 'N/A')}
 """
-            return formatted.strip()
+        return formatted.strip()
 
-        except json.JSONDecodeError:
-            # Kalau gagal parse JSON, return as is
-            return response_text
-
-    except Exception as e:
-        return f"Maaf, analisis AI sedang tidak tersedia. Error: {str(e)}"
+    except json.JSONDecodeError:
+        # Kalau gagal parse JSON, return as is
+        return response_text
 
 
 def get_ai_recommendation(
@@ -204,18 +252,40 @@ def get_ai_recommendation(
         Dictionary berisi ranking devices + penjelasan AI
     """
     try:
-        # Buat daftar device untuk prompt
-        device_list = ""
-        for i, device in enumerate(devices[:3], 1):
-            device_list += (
-                f"{i}. {device.name} - Rp {device.price:,.0f} ({device.release_year})\n"
-            )
+        # Call AI API
+        response_text = call_ai_api(
+            recommendation_messages(devices, use_case, max_price), temperature=0.7
+        )
+        return {
+            "devices": devices[:3],
+            "ai_recommendation": format_recommendation_response(response_text),
+        }
 
-        # Buat prompt
-        use_case_text = f"untuk {use_case}" if use_case else ""
-        budget_text = f"budget max Rp {max_price:,.0f}" if max_price else ""
+    except Exception as e:
+        return {
+            "devices": devices[:3],
+            "ai_recommendation": f"Maaf, rekomendasi AI sedang tidak tersedia. Error: {str(e)}",
+        }
 
-        user_prompt = f"""Rekomendasi smartphone {use_case_text} {budget_text}:
+
+def recommendation_messages(
+    devices: List[models.Phone],
+    use_case: Optional[str] = None,
+    max_price: Optional[float] = None,
+) -> List[Dict]:
+    """Prompt rekomendasi untuk top 3 device"""
+    # Buat daftar device untuk prompt
+    device_list = ""
+    for i, device in enumerate(devices[:3], 1):
+        device_list += (
+            f"{i}. {device.name} - Rp {device.price:,.0f} ({device.release_year})\n"
+        )
+
+    # Buat prompt
+    use_case_text = f"untuk {use_case}" if use_case else ""
+    budget_text = f"budget max Rp {max_price:,.0f}" if max_price else ""
+
+    user_prompt = f"""Rekomendasi smartphone {use_case_text} {budget_text}:
 
 {device_list}
 
@@ -230,29 +300,19 @@ Kamu wajib memberikan output dalam format JSON berikut:
 
 Jangan gunakan format lain. Hanya kirim JSON yang valid. Jawab dalam bahasa Indonesia."""
 
-        messages = [
-            {
-                "role": "system",
-                "content": "Kamu adalah asisten ahli teknologi yang membantu user memilih smartphone. Selalu jawab dalam format JSON yang valid.",
-            },
-            {"role": "user", "content": user_prompt},
-        ]
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
 
-        # Call AI API
-        response_text = call_ai_api(messages, temperature=0.7)
 
-        # Parse JSON response
-        try:
-            clean_text = response_text.strip()
-            if clean_text.startswith("```json"):
-                clean_text = (
-                    clean_text.replace("```json", "").replace("```", "").strip()
-                )
-
-            recommendation = json.loads(clean_text)
+def format_recommendation_response(response_text: str) -> str:
+    """Ubah jawaban JSON AI menjadi teks Top 3 rekomendasi"""
+    try:
+        recommendation = json.loads(_clean_json(response_text))
 
-            # Format ke text
-            formatted = f"""
+        # Format ke text
+        formatted = f"""
 **Top 3 Rekomendasi:**
 
 1. {recommendation.get('top_1', 'N/A')}
@@ -261,17 +321,236 @@ Jangan gunakan format lain. Hanya kirim JSON yang valid. Jawab dalam bahasa Indo
 
 **Kesimpulan:** {recommendation.get('summary', 'N/A')}
 """
+        return formatted.strip()
 
-            return {"devices": devices[:3], "ai_recommendation": formatted.strip()}
+    except json.JSONDecodeError:
+        return response_text
 
-        except json.JSONDecodeError:
-            return {"devices": devices[:3], "ai_recommendation": response_text}
 
-    except Exception as e:
-        return {
-            "devices": devices[:3],
-            "ai_recommendation": f"Maaf, rekomendasi AI sedang tidak tersedia. Error: {str(e)}",
-        }
+def _clean_json(response_text: str) -> str:
+    """Hapus pembungkus markdown ```json dari jawaban AI"""
+    clean_text = response_text.strip()
+    if clean_text.startswith("```json"):
+        clean_text = clean_text.replace("```json", "").replace("```", "").strip()
+    return clean_text
+
+
+# ==================== DEADLINE MODE ====================
+
+
+def get_comparison_analysis_within_deadline(
+    device1: models.Phone,
+    device2: models.Phone,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Analisis perbandingan dengan batas waktu tunggu (latency budget).
+
+    Request hanya menunggu AI maksimal `deadline` detik (default
+    AI_DEADLINE_SECONDS). Jika AI belum menjawab, analisis lokal dari data
+    spesifikasi langsung dikembalikan, sementara panggilan AI tetap
+    berjalan di background dan mengisi cache untuk request berikutnya.
+
+    Returns:
+        Dictionary berisi:
+        - ai_analysis: Teks analisis (dari AI atau lokal)
+        - ai_source: "ai" atau "local"
+        - ai_generated_at: Waktu jawaban AI didapat (None jika lokal)
+    """
+    return _answer_within_deadline(
+        messages=comparison_messages(device1, device2),
+        formatter=format_comparison_response,
+        local_answer=lambda: local_comparison_analysis(device1, device2),
+        deadline=deadline,
+    )
+
+
+def get_ai_recommendation_within_deadline(
+    devices: List[models.Phone],
+    use_case: Optional[str] = None,
+    max_price: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Rekomendasi AI dengan batas waktu tunggu (lihat
+    `get_comparison_analysis_within_deadline`).
+
+    Returns:
+        Dictionary berisi devices, ai_recommendation, ai_source, ai_generated_at
+    """
+    answer = _answer_within_deadline(
+        messages=recommendation_messages(devices, use_case, max_price),
+        formatter=format_recommendation_response,
+        local_answer=lambda: local_recommendation(devices, use_case),
+        deadline=deadline,
+    )
+    return {
+        "devices": devices[:3],
+        "ai_recommendation": answer["ai_analysis"],
+        "ai_source": answer["ai_source"],
+        "ai_generated_at": answer["ai_generated_at"],
+    }
+
+
+def _answer_within_deadline(
+    messages: List[Dict],
+    formatter: Callable[[str], str],
+    local_answer: Callable[[], str],
+    deadline: Optional[float],
+) -> Dict[str, Any]:
+    if deadline is None:
+        deadline = config.AI_DEADLINE_SECONDS
+
+    key = _cache_key(messages)
+    entry = ai_cache.get(key)
+    if entry is not None:
+        return _ai_answer(entry.value, entry.stored_at)
+
+    if AI_API_KEY:
+        # Prompt sudah berupa teks, aman diproses di thread lain
+        future = background.submit_once(key, _fetch_and_cache, key, messages, formatter)
+        try:
+            future.result(timeout=deadline)
+        except FutureTimeoutError:
+            pass  # AI lambat: jawab lokal, hasil AI masuk cache nanti
+        except Exception:
+            pass  # AI error: jawab lokal
+
+        entry = ai_cache.get(key)
+        if entry is not None:
+            return _ai_answer(entry.value, entry.stored_at)
+
+    return {
+        "ai_analysis": local_answer(),
+        "ai_source": "local",
+        "ai_generated_at": None,
+    }
+
+
+def _fetch_and_cache(key: str, messages: List[Dict], formatter: Callable[[str], str]):
+    """Job background: panggil AI dan simpan jawaban yang sukses ke cache"""
+    text = formatter(request_ai_completion(messages, temperature=0.7))
+    ai_cache.set(key, text)
+    return text
+
+
+def _cache_key(messages: List[Dict]) -> str:
+    digest = hashlib.sha1(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+    return f"ai:{AI_MODEL}:{digest}"
+
+
+def _ai_answer(text: str, stored_at: float) -> Dict[str, Any]:
+    return {
+        "ai_analysis": text,
+        "ai_source": "ai",
+        "ai_generated_at": datetime.fromtimestamp(
+            stored_at, tz=timezone.utc
+        ).isoformat(),
+    }
+
+
+# ==================== LOCAL ANALYSIS ====================
+
+
+def local_comparison_analysis(device1: models.Phone, device2: models.Phone) -> str:
+    """
+    Analisis perbandingan tanpa AI, disusun dari data spesifikasi.
+
+    Formatnya sama dengan analisis AI (Performa, Kamera, Baterai,
+    Value for Money, Rekomendasi) supaya tampilan tidak berubah.
+    """
+    ram = _compare_spec(
+        device1, device2, "ram", specs.parse_memory_gb, "RAM lebih besar"
+    )
+    camera = _compare_spec(
+        device1,
+        device2,
+        "camera",
+        specs.parse_camera_mp,
+        "kamera utama beresolusi lebih tinggi",
+    )
+    battery = _compare_spec(
+        device1, device2, "battery", specs.parse_battery_mah, "baterai lebih besar"
+    )
+
+    price1 = specs.parse_price(device1.price)
+    price2 = specs.parse_price(device2.price)
+    if price1 and price2 and price1 != price2:
+        cheaper, pricier = (device1, device2) if price1 < price2 else (device2, device1)
+        value = (
+            f"{cheaper.name} lebih murah Rp {abs(price1 - price2):,.0f} "
+            f"dibanding {pricier.name}."
+        )
+    else:
+        value = "Harga kedua device setara atau belum tersedia."
+
+    newer = None
+    if device1.release_year and device2.release_year:
+        if device1.release_year != device2.release_year:
+            newer = device1 if device1.release_year > device2.release_year else device2
+
+    performa = (
+        f"{device1.name}: {device1.cpu or 'N/A'}, RAM {device1.ram or 'N/A'}. "
+        f"{device2.name}: {device2.cpu or 'N/A'}, RAM {device2.ram or 'N/A'}. {ram}"
+    )
+    rekomendasi = (
+        f"Pilih {newer.name} jika ingin device yang lebih baru ({newer.release_year}). "
+        if newer
+        else ""
+    ) + "Sesuaikan pilihan dengan prioritas harga, kamera, dan baterai di atas."
+
+    return f"""
+**Performa:** {performa}
+
+**Kamera:** {camera}
+
+**Baterai:** {battery}
+
+**Value for Money:** {value}
+
+**Rekomendasi:** {rekomendasi}
+
+_Analisis otomatis dari data spesifikasi._
+""".strip()
+
+
+def local_recommendation(
+    devices: List[models.Phone], use_case: Optional[str] = None
+) -> str:
+    """
+    Rekomendasi tanpa AI: top 3 device berdasarkan skor tahun rilis + harga.
+    """
+    ranked = sorted(devices, key=calculate_device_score, reverse=True)[:3]
+    lines = [
+        f"{i}. {device.name} - Rp {device.price:,.0f} ({device.release_year})"
+        for i, device in enumerate(ranked, 1)
+    ]
+    use_case_text = f" untuk {use_case}" if use_case else ""
+
+    return (
+        "**Top 3 Rekomendasi:**\n\n"
+        + "\n".join(lines)
+        + f"\n\n**Kesimpulan:** Diurutkan dari kombinasi tahun rilis terbaru dan "
+        f"harga termurah{use_case_text}.\n\n_Analisis otomatis dari data spesifikasi._"
+    )
+
+
+def _compare_spec(
+    device1: models.Phone,
+    device2: models.Phone,
+    attribute: str,
+    parser: Callable[[Optional[str]], Optional[float]],
+    better: str,
+) -> str:
+    """Kalimat perbandingan 1 spesifikasi, mis. "X unggul dengan RAM lebih besar." """
+    value1 = parser(getattr(device1, attribute))
+    value2 = parser(getattr(device2, attribute))
+    if value1 is None or value2 is None:
+        return f"Data {attribute} belum lengkap untuk dibandingkan."
+    if value1 == value2:
+        return f"Spesifikasi {attribute} kedua device setara."
+    winner = device1 if value1 > value2 else device2
+    return f"{winner.name} unggul dengan {better}."
 
 
 def test_ai_connection() -> bool:
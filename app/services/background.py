@@ -0,0 +1,70 @@
+"""
+Background jobs - menjalankan pekerjaan lambat di luar request path
+
+Dipakai untuk panggilan ke service eksternal (n8n, AI) yang hasilnya
+di-cache: request langsung dijawab, hasil service dipakai request berikutnya.
+
+Job dengan key yang sama tidak dijalankan dua kali selama masih berjalan.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Hashable, Optional
+
+from ..core import config
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=config.BACKGROUND_WORKERS, thread_name_prefix="comparely-bg"
+)
+_pending: Dict[Hashable, Future] = {}
+_lock = threading.Lock()
+
+
+def submit_once(key: Hashable, fn: Callable, *args, **kwargs) -> Future:
+    """
+    Jalankan `fn(*args, **kwargs)` di background thread.
+
+    Jika job dengan `key` yang sama masih berjalan, future yang sudah ada
+    dikembalikan (tidak di-submit ulang).
+
+    Args:
+        key: Identitas job (mis. ("n8n", id1, id2))
+        fn: Fungsi yang dijalankan
+
+    Returns:
+        Future dari job
+    """
+    with _lock:
+        future = _pending.get(key)
+        if future is not None:
+            return future
+        future = _executor.submit(_run, key, fn, *args, **kwargs)
+        _pending[key] = future
+        return future
+
+
+def _run(key: Hashable, fn: Callable, *args, **kwargs):
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        logger.exception(f"Background job {key!r} failed")
+        raise
+    finally:
+        with _lock:
+            _pending.pop(key, None)
+
+
+def is_pending(key: Hashable) -> bool:
+    """True jika job dengan `key` masih antri / berjalan"""
+    with _lock:
+        return key in _pending
+
+
+def wait_all(timeout: Optional[float] = None) -> None:
+    """Tunggu semua job yang sedang berjalan (untuk test / shutdown)"""
+    with _lock:
+        futures = list(_pending.values())
+    wait(futures, timeout=timeout)
@@ -0,0 +1,227 @@
+"""
+Catalog Events - beri tahu index in-memory saat data Phone berubah
+
+Index yang dibangun dari katalog (percentile, similar devices, dll)
+mendaftar dengan `register(listener)`. Listener harus punya:
+- entry_for(device): snapshot data device yang dibutuhkan index
+  (dipanggil saat flush, ketika atribut device masih bisa dibaca)
+- apply(changes): terapkan {device_id: snapshot, atau None jika dihapus}
+- mark_stale(): index harus dibangun ulang (perubahan massal)
+
+CatalogIndex menyediakan siklus hidup bersama (rebuild dari database di
+background, umur maksimum, status stale); subclass cukup mengisi
+rebuild / _apply / entry_for.
+
+Perubahan dikumpulkan per session saat flush dan hanya diteruskan ke
+listener jika transaksi berhasil di-commit (rollback = dibuang).
+query.update() / query.delete() pada Phone tidak melewati flush, sehingga
+listener hanya diberi tahu lewat mark_stale(). Commit yang mengubah lebih
+dari CATALOG_INCREMENTAL_MAX_CHANGES device (mis. import massal) juga
+diperlakukan sebagai perubahan massal: update per device akan lebih lambat
+daripada rebuild penuh di background.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Protocol
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core import config
+from . import background
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "catalog_changes"
+_BULK_KEY = "catalog_bulk_change"
+
+
+class CatalogListener(Protocol):
+    def entry_for(self, device: models.Phone) -> Any: ...
+
+    def apply(self, changes: Dict[int, Optional[Any]]) -> None: ...
+
+    def mark_stale(self) -> None: ...
+
+
+_listeners: List[CatalogListener] = []
+
+# Rebuild diulang paling banyak sekian kali jika katalog berubah selama
+# rebuild berjalan; setelah itu index tetap stale dan dijadwalkan lagi
+REBUILD_ATTEMPTS = 3
+
+
+class IndexNotReady(Exception):
+    """Index belum pernah selesai dibangun (cold start, rebuild di background)"""
+
+
+class CatalogIndex:
+    """
+    Basis index in-memory yang dibangun dari seluruh katalog Phone.
+
+    Index dibangun penuh di background (rebuild_from_db), lalu diperbarui
+    per device lewat apply(). ensure_fresh() hanya menjadwalkan rebuild dan
+    tidak pernah memblokir request; selama built_at masih None index belum
+    siap dipakai (require_ready() -> IndexNotReady, router menjawab 503).
+
+    Subclass mengisi entry_for(), rebuild() (memanggil _mark_built() di
+    dalam lock setelah selesai) dan _apply() (dipanggil di dalam lock).
+
+    Args:
+        name: Nama index untuk log dan key job background (mis. "facet-index")
+        max_age_setting: Nama setting di core/config.py berisi umur maksimum
+            index (detik) sebelum dibangun ulang penuh
+    """
+
+    def __init__(self, name: str, max_age_setting: str):
+        self.name = name
+        self.max_age_setting = max_age_setting
+        self._lock = threading.RLock()
+        self.built_at: Optional[float] = None
+        self.stale = True
+        # Naik setiap apply() / mark_stale(); rebuild yang melihat angka ini
+        # berubah tahu snapshot-nya tidak memuat perubahan tersebut
+        self._generation = 0
+
+    def entry_for(self, device: models.Phone) -> Any:
+        raise NotImplementedError
+
+    def rebuild(self, devices: Iterable[models.Phone]) -> None:
+        raise NotImplementedError
+
+    def _apply(self, changes: Dict[int, Optional[Any]]) -> None:
+        raise NotImplementedError
+
+    def apply(self, changes: Dict[int, Optional[Any]]) -> None:
+        """
+        Terapkan perubahan per device (incremental).
+
+        Args:
+            changes: {device_id: entry baru, atau None jika device dihapus}
+        """
+        with self._lock:
+            self._generation += 1
+            self._apply(changes)
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def _mark_built(self) -> None:
+        self.built_at = time.monotonic()
+        self.stale = False
+
+    def mark_stale(self) -> None:
+        """Tandai index basi dan jadwalkan rebuild di background"""
+        self._generation += 1
+        self.stale = True
+        self.ensure_fresh()
+
+    def rebuild_from_db(self) -> int:
+        """
+        Bangun ulang dari database primary (dipanggil di background thread).
+
+        Bukan dari replica: rebuild setelah perubahan massal tidak boleh
+        membaca data sebelum perubahan itu. apply() / mark_stale() yang
+        masuk selama rebuild tertimpa snapshot, jadi rebuild diulang.
+        """
+        from ..database import SessionLocal
+
+        for _ in range(REBUILD_ATTEMPTS):
+            generation = self._generation
+            db = SessionLocal()
+            try:
+                self.rebuild(db.query(models.Phone).yield_per(1000))
+            finally:
+                db.close()
+            with self._lock:
+                if self._generation == generation:
+                    break
+                self.stale = True
+        logger.info(f"{self.name} rebuilt: {len(self)} devices")
+        return len(self)
+
+    def ensure_fresh(self) -> None:
+        """Jadwalkan rebuild di background jika index belum ada, basi, atau kedaluwarsa"""
+        max_age = getattr(config, self.max_age_setting)
+        age_expired = (
+            self.built_at is not None and time.monotonic() - self.built_at >= max_age
+        )
+        if self.stale or age_expired:
+            background.submit_once(f"{self.name}-rebuild", self.rebuild_from_db)
+
+    def require_ready(self) -> None:
+        """
+        ensure_fresh(), lalu pastikan index sudah pernah dibangun.
+
+        Raises:
+            IndexNotReady: Build pertama masih berjalan di background
+        """
+        self.ensure_fresh()
+        if self.built_at is None:
+            raise IndexNotReady(self.name)
+
+
+def register(listener: CatalogListener) -> CatalogListener:
+    """Daftarkan index yang perlu mengikuti perubahan katalog"""
+    _listeners.append(listener)
+    return listener
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_phone_changes(session, flush_context):
+    if not _listeners or session.info.get(_BULK_KEY):
+        return
+    changed = [d for d in session.new | session.dirty if isinstance(d, models.Phone)]
+    deleted = [d for d in session.deleted if isinstance(d, models.Phone)]
+    changes = session.info.setdefault(_PENDING_KEY, {})
+    if (
+        len(changes) + len(changed) + len(deleted)
+        > config.CATALOG_INCREMENTAL_MAX_CHANGES
+    ):
+        # Terlalu banyak untuk update per device: rebuild penuh setelah commit
+        session.info.pop(_PENDING_KEY, None)
+        session.info[_BULK_KEY] = True
+        return
+    for device in changed:
+        changes[device.id] = [listener.entry_for(device) for listener in _listeners]
+    for device in deleted:
+        changes[device.id] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_phone_changes(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    bulk = session.info.pop(_BULK_KEY, False)
+    for i, listener in enumerate(_listeners):
+        try:
+            if bulk:
+                # Perubahan per device tidak perlu diterapkan, index dibangun ulang
+                listener.mark_stale()
+            elif changes:
+                listener.apply(
+                    {
+                        device_id: None if entries is None else entries[i]
+                        for device_id, entries in changes.items()
+                    }
+                )
+        except Exception:
+            # Index tidak boleh menggagalkan commit; rebuild memperbaikinya
+            logger.exception(f"Catalog listener {listener!r} failed")
+            listener.mark_stale()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_phone_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_BULK_KEY, None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _detect_bulk_phone_changes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(mapper.class_ is models.Phone for mapper in orm_execute_state.all_mappers):
+        orm_execute_state.session.info[_BULK_KEY] = True
@@ -0,0 +1,103 @@
+"""
+Comparison Matrix - perbandingan N device sekaligus (NumPy)
+
+Spesifikasi semua device diubah menjadi 1 matriks angka
+(baris = device, kolom = atribut dari COMPARISON_RULES, NaN = tidak diketahui),
+lalu pemenang, ranking, dan selisih semua atribut dihitung dalam 1 pass
+vectorized, bukan perbandingan berpasangan di Python.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .. import models
+from .comparison_rules import COMPARISON_RULES, ComparisonRule
+
+
+def spec_matrix(
+    devices: Sequence[models.Phone], rules: Sequence[ComparisonRule]
+) -> np.ndarray:
+    """Matriks (jumlah device x jumlah rule) berisi nilai atribut, NaN jika kosong"""
+    values = np.full((len(devices), len(rules)), np.nan)
+    for row, device in enumerate(devices):
+        for col, rule in enumerate(rules):
+            value = rule.parse(device)
+            if value is not None:
+                values[row, col] = value
+    return values
+
+
+def _to_list(array: np.ndarray, as_int: bool = False) -> List[List[Any]]:
+    """Matriks NumPy -> list JSON (NaN menjadi None)"""
+    return [
+        [
+            None if np.isnan(value) else (int(value) if as_int else float(value))
+            for value in row
+        ]
+        for row in array
+    ]
+
+
+def build_comparison_matrix(
+    devices: Sequence[models.Phone],
+    rules: Optional[Sequence[ComparisonRule]] = None,
+) -> Dict[str, Any]:
+    """
+    Hitung pemenang, ranking, dan selisih per atribut untuk N device.
+
+    - rank: 1 = terbaik; device dengan nilai sama mendapat rank yang sama
+    - delta: selisih nilai device terhadap nilai terbaik (0 untuk pemenang)
+    - winners: ID device terbaik per atribut (bisa lebih dari 1 jika seri);
+      kosong jika kurang dari 2 device punya nilai atribut tersebut
+
+    Args:
+        devices: List device yang dibandingkan
+        rules: Rule atribut (default: COMPARISON_RULES)
+
+    Returns:
+        Payload matriks: devices, attributes, values, ranks, deltas,
+        winners, dan win_counts. values/ranks/deltas/win_counts berurutan
+        sesuai `devices` (baris) dan `attributes` (kolom).
+    """
+    rules = list(rules or COMPARISON_RULES)
+    ids = np.array([device.id for device in devices])
+    values = spec_matrix(devices, rules)
+    known = ~np.isnan(values)
+
+    # Balik tanda atribut "lebih kecil lebih baik" -> semua kolom: besar = baik
+    direction = np.array([1.0 if rule.higher_is_better else -1.0 for rule in rules])
+    scores = np.where(known, values * direction, -np.inf)
+
+    # rank[i, k] = 1 + jumlah device yang nilainya lebih baik dari device i
+    better = scores[np.newaxis, :, :] > scores[:, np.newaxis, :]
+    ranks = np.where(known, 1 + better.sum(axis=1), np.nan)
+
+    best = scores.max(axis=0)
+    comparable = known.sum(axis=0) >= 2
+    is_winner = known & comparable & (scores == best)
+
+    best_values = np.where(comparable, best * direction, np.nan)
+    deltas = np.where(known & comparable, values - best_values, np.nan)
+
+    return {
+        "devices": [
+            {"id": device.id, "name": device.name, "brand": device.brand}
+            for device in devices
+        ],
+        "attributes": [
+            {
+                "key": rule.key,
+                "label": rule.label,
+                "higher_is_better": rule.higher_is_better,
+            }
+            for rule in rules
+        ],
+        "values": _to_list(values),
+        "ranks": _to_list(ranks, as_int=True),
+        "deltas": _to_list(deltas),
+        "winners": {
+            rule.key: ids[is_winner[:, col]].tolist() for col, rule in enumerate(rules)
+        },
+        "win_counts": is_winner.sum(axis=1).tolist(),
+    }
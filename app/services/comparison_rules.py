@@ -0,0 +1,182 @@
+"""
+Comparison Rules - aturan perbandingan atribut device (data, bukan kode)
+
+Setiap rule menjelaskan 1 atribut:
+- parse: ambil angka dari device (lihat utils/specs.py)
+- higher_is_better: arah "lebih baik" (comparator); dipakai juga oleh
+  /compare/matrix untuk ranking vectorized
+- format: teks highlight untuk pemenang
+- icon: ikon Font Awesome untuk halaman HTML
+
+`highlight_engine` mengevaluasi semua rule untuk 2 device dan dipakai
+bersama oleh API (/compare/) dan halaman HTML (/compare-page).
+Menambah atribut baru cukup dengan menambah 1 rule di COMPARISON_RULES.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .. import models
+from ..utils import specs
+
+# (pemenang, yang kalah, nilai pemenang, nilai yang kalah) -> teks highlight
+Formatter = Callable[[models.Phone, models.Phone, float, float], str]
+
+# Nilai semua rule untuk 1 device, urut sesuai rule (None = tidak diketahui)
+SpecVector = Tuple[Optional[float], ...]
+
+
+def _default_format(
+    winner: models.Phone, loser: models.Phone, winner_value: float, loser_value: float
+) -> str:
+    return f"{winner.name} lebih unggul ({winner_value:g} vs {loser_value:g})"
+
+
+@dataclass(frozen=True)
+class ComparisonRule:
+    key: str  # Nama atribut di payload, mis. "ram"
+    label: str  # Label untuk UI, mis. "RAM"
+    parse: Callable[[models.Phone], Optional[float]]
+    higher_is_better: bool = True
+    format: Formatter = _default_format
+    icon: str = "fa-circle-check"
+
+
+COMPARISON_RULES: List[ComparisonRule] = [
+    ComparisonRule(
+        "price",
+        "Harga",
+        lambda d: specs.parse_price(d.price),
+        higher_is_better=False,
+        format=lambda w, l, wv, lv: f"{w.name} lebih murah Rp {lv - wv:,.0f}",
+        icon="fa-tag",
+    ),
+    ComparisonRule(
+        "release_year",
+        "Tahun Rilis",
+        lambda d: specs.parse_number(d.release_year),
+        format=lambda w, l, wv, lv: f"{w.name} lebih baru (Rilis {wv:.0f})",
+        icon="fa-calendar",
+    ),
+    ComparisonRule(
+        "ram",
+        "RAM",
+        lambda d: specs.parse_memory_gb(d.ram),
+        format=lambda w, l, wv, lv: f"{w.name} lebih besar ({w.ram} vs {l.ram})",
+        icon="fa-memory",
+    ),
+    ComparisonRule(
+        "storage",
+        "Storage",
+        lambda d: specs.parse_memory_gb(d.storage),
+        format=lambda w, l, wv, lv: (
+            f"{w.name} lebih besar ({w.storage} vs {l.storage})"
+        ),
+        icon="fa-hard-drive",
+    ),
+    ComparisonRule(
+        "camera",
+        "Kamera",
+        lambda d: specs.parse_camera_mp(d.camera),
+        format=lambda w, l, wv, lv: f"{w.name} lebih tinggi ({wv:g}MP vs {lv:g}MP)",
+        icon="fa-camera",
+    ),
+    ComparisonRule(
+        "battery",
+        "Baterai",
+        lambda d: specs.parse_battery_mah(d.battery),
+        format=lambda w, l, wv, lv: (
+            f"{w.name} lebih besar ({wv:.0f} mAh vs {lv:.0f} mAh)"
+        ),
+        icon="fa-battery-three-quarters",
+    ),
+    ComparisonRule(
+        "screen",
+        "Layar",
+        lambda d: specs.parse_screen_inch(d.screen),
+        format=lambda w, l, wv, lv: f'{w.name} lebih besar ({wv:g}" vs {lv:g}")',
+        icon="fa-display",
+    ),
+]
+
+
+class HighlightEngine:
+    """
+    Evaluasi rule perbandingan untuk pasangan device.
+
+    Spesifikasi di-parse sekali per device (`parse`) menjadi SpecVector;
+    `evaluate` hanya membandingkan angka, sehingga vector yang sama bisa
+    dipakai untuk banyak pasangan (mis. batch / benchmark).
+    """
+
+    def __init__(self, rules: Sequence[ComparisonRule]):
+        self.rules = tuple(rules)
+        # Rule "dikompilasi" jadi (index, arah, rule): arah 1 = besar lebih baik
+        self._compiled = tuple(
+            (index, 1 if rule.higher_is_better else -1, rule)
+            for index, rule in enumerate(self.rules)
+        )
+
+    def parse(self, device: models.Phone) -> SpecVector:
+        """Nilai numerik semua rule untuk 1 device"""
+        return tuple(rule.parse(device) for rule in self.rules)
+
+    def evaluate(
+        self,
+        device1: models.Phone,
+        device2: models.Phone,
+        specs1: Optional[SpecVector] = None,
+        specs2: Optional[SpecVector] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Highlight keunggulan masing-masing device.
+
+        Args:
+            device1: Device pertama
+            device2: Device kedua
+            specs1: Hasil `parse(device1)` jika sudah ada
+            specs2: Hasil `parse(device2)` jika sudah ada
+
+        Returns:
+            List highlight (urut sesuai rule) berisi key, label, icon,
+            winner_id, dan text. Atribut yang seri atau tidak diketahui
+            di salah satu device dilewati.
+        """
+        if specs1 is None:
+            specs1 = self.parse(device1)
+        if specs2 is None:
+            specs2 = self.parse(device2)
+
+        highlights = []
+        for index, direction, rule in self._compiled:
+            value1 = specs1[index]
+            value2 = specs2[index]
+            if value1 is None or value2 is None or value1 == value2:
+                continue
+            if (value1 - value2) * direction > 0:
+                winner, loser, winner_value, loser_value = (
+                    device1,
+                    device2,
+                    value1,
+                    value2,
+                )
+            else:
+                winner, loser, winner_value, loser_value = (
+                    device2,
+                    device1,
+                    value2,
+                    value1,
+                )
+            highlights.append(
+                {
+                    "key": rule.key,
+                    "label": rule.label,
+                    "icon": rule.icon,
+                    "winner_id": winner.id,
+                    "text": rule.format(winner, loser, winner_value, loser_value),
+                }
+            )
+        return highlights
+
+
+highlight_engine = HighlightEngine(COMPARISON_RULES)
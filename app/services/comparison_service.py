@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from .. import models
 from ..crud import device as device_crud
 from . import n8n_service
+from .comparison_matrix import build_comparison_matrix
+from .comparison_rules import highlight_engine
 
 
 def compare_two_devices(
@@ -15,8 +17,9 @@ def compare_two_devices(
 
     Fitur:
     - Rule-based highlights (selalu ada)
-    - AI-enhanced highlights dari n8n (jika enabled)
-    - Fallback mechanism jika n8n error
+    - AI-enhanced highlights dari n8n (jika enabled dan sudah ada di cache)
+    - n8n tidak pernah ditunggu: pasangan device yang belum di-enrich
+      diantrikan di background, request berikutnya mendapat versi n8n
 
     Args:
         db: Database session
@@ -30,6 +33,9 @@ def compare_two_devices(
         - highlights: List keunggulan (dari AI atau rule-based)
         - ai_summary: Summary dari AI (jika tersedia)
         - scores: Scoring details (jika dari AI)
+        - source: "n8n_ai" atau "rule_based"
+        - enriched_at: Waktu hasil n8n didapat (None jika rule-based)
+        - enrichment: Status enrichment ("ready", "pending", "failed", "disabled")
 
     Raises:
         ValueError: Jika salah satu atau kedua device tidak ditemukan
@@ -45,7 +51,7 @@ def compare_two_devices(
     # Generate rule-based highlights (selalu dijalankan sebagai fallback)
     rule_based_highlights = generate_highlights(device1, device2)
 
-    # Try to get AI-enhanced highlights from n8n
+    # AI-enhanced highlights dari cache n8n (tidak memblokir request)
     ai_result = n8n_service.get_ai_enhanced_highlights(
         device1, device2, rule_based_highlights
     )
@@ -59,16 +65,39 @@ def compare_two_devices(
         "ai_summary": ai_result.get("ai_summary", ""),
         "scores": ai_result.get("scores", {}),
         "source": ai_result.get("source", "rule_based"),
+        "enriched_at": ai_result.get("enriched_at"),
+        "enrichment": ai_result.get("enrichment", "disabled"),
     }
 
 
+def compare_many_devices(db: Session, device_ids: List[int]) -> Dict[str, Any]:
+    """
+    Membandingkan N device sekaligus dalam bentuk matriks atribut.
+
+    Args:
+        db: Database session
+        device_ids: List ID device (tanpa duplikat, urutan dipertahankan)
+
+    Returns:
+        Payload matriks dari build_comparison_matrix
+
+    Raises:
+        ValueError: Jika ada device yang tidak ditemukan
+    """
+    devices = device_crud.get_devices_by_ids(db, device_ids)
+    if len(devices) != len(device_ids):
+        missing = sorted(set(device_ids) - {device.id for device in devices})
+        raise ValueError(f"Perangkat tidak ditemukan: {missing}")
+    return build_comparison_matrix(devices)
+
+
 def generate_highlights(device1: models.Phone, device2: models.Phone) -> List[str]:
     """
     Generate list highlights yang membandingkan keunggulan 2 device.
 
-    Logic sederhana untuk mahasiswa:
-    - Bandingkan harga (lebih murah = keunggulan)
-    - Bandingkan tahun rilis (lebih baru = keunggulan)
+    Memakai rule engine yang sama dengan halaman /compare-page
+    (lihat comparison_rules.COMPARISON_RULES): harga, tahun rilis, RAM,
+    storage, kamera, baterai, dan layar.
 
     Args:
         device1: Device pertama
@@ -77,35 +106,9 @@ def generate_highlights(device1: models.Phone, device2: models.Phone) -> List[st
     Returns:
         List of string highlights
     """
-    highlights = []
-
-    # 1. Bandingkan Harga
-    if device1.price and device2.price:
-        price_diff = abs(device1.price - device2.price)
-
-        if device1.price < device2.price:
-            highlights.append(f"{device1.name} lebih murah Rp {price_diff:,.0f}")
-        elif device2.price < device1.price:
-            highlights.append(f"{device2.name} lebih murah Rp {price_diff:,.0f}")
-        # Jika sama, tidak ada highlight
-
-    # 2. Bandingkan Tahun Rilis
-    if device1.release_year and device2.release_year:
-        if device1.release_year > device2.release_year:
-            highlights.append(
-                f"{device1.name} lebih baru (Rilis {device1.release_year})"
-            )
-        elif device2.release_year > device1.release_year:
-            highlights.append(
-                f"{device2.name} lebih baru (Rilis {device2.release_year})"
-            )
-
-    # TODO: Bisa ditambahkan comparison lain seperti:
-    # - RAM (perlu parsing string "8GB" -> integer)
-    # - Storage (perlu parsing string "256GB" -> integer)
-    # - Benchmark scores (jika ada)
-
-    return highlights
+    return [
+        highlight["text"] for highlight in highlight_engine.evaluate(device1, device2)
+    ]
 
 
 def calculate_price_difference(device1: models.Phone, device2: models.Phone) -> float:
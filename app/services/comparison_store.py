@@ -0,0 +1,252 @@
+"""
+Comparison Store - traffic perbandingan + analisis AI yang di-precompute
+
+Alur:
+1. Setiap request perbandingan dicatat oleh `comparison_traffic` (buffer
+   in-memory, ditulis ke tabel comparison_traffic secara berkala).
+2. Batch job `precompute_analyses` (scripts/precompute_comparisons.py)
+   membuat analisis AI untuk pasangan terpopuler dan untuk device baru vs
+   rival dengan harga terdekat, lalu menyimpannya ke comparison_analyses.
+3. `/compare/ai` mengambil analisis dari storage jika ada dan masih cocok
+   dengan data device; jika tidak, baru memanggil AI (mode deadline).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core import config
+from ..crud import comparison as comparison_crud
+from ..crud.comparison import Pair, canonical_pair
+from ..database import SessionLocal
+from . import ai, background
+from .resilience import UpstreamRejected
+
+logger = logging.getLogger(__name__)
+
+
+class ComparisonTrafficTracker:
+    """
+    Menghitung request per pasangan device di memory, lalu menulisnya ke
+    database dalam batch (tidak ada write di request path).
+
+    Flush dijalankan di background setiap `flush_every` request atau
+    setelah `flush_interval` detik sejak flush terakhir.
+    """
+
+    def __init__(self, flush_every: int = 50, flush_interval: float = 60.0):
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, device_id_1: int, device_id_2: int) -> None:
+        """Catat 1 request perbandingan (urutan device tidak berpengaruh)"""
+        if device_id_1 == device_id_2:
+            return
+        with self._lock:
+            self._counts[canonical_pair(device_id_1, device_id_2)] += 1
+            due = (
+                sum(self._counts.values()) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            background.submit_once("comparison-traffic-flush", self.flush)
+
+    def pending(self) -> Dict[Pair, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """
+        Tulis hitungan yang ter-buffer ke database.
+
+        Args:
+            db: Session primary (default: session baru dari SessionLocal)
+
+        Returns:
+            Jumlah pasangan yang ditulis
+        """
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._last_flush = time.monotonic()
+        if not counts:
+            return 0
+
+        own_session = db is None
+        if own_session:
+            db = SessionLocal()
+        try:
+            comparison_crud.add_comparison_counts(db, dict(counts))
+            return len(counts)
+        except Exception:
+            db.rollback()
+            # Kembalikan hitungan supaya tidak hilang, dicoba di flush berikutnya
+            with self._lock:
+                self._counts.update(counts)
+            logger.exception("Failed to flush comparison traffic")
+            raise
+        finally:
+            if own_session:
+                db.close()
+
+
+comparison_traffic = ComparisonTrafficTracker(
+    flush_every=config.COMPARISON_TRAFFIC_FLUSH_EVERY,
+    flush_interval=config.COMPARISON_TRAFFIC_FLUSH_INTERVAL,
+)
+
+
+# ==================== ANALYSIS STORE ====================
+
+
+def _ordered(device1: models.Phone, device2: models.Phone):
+    """Urutkan device sesuai canonical pair (ID kecil dulu)"""
+    return (device1, device2) if device1.id <= device2.id else (device2, device1)
+
+
+def _prompt_hash(messages: List[Dict]) -> str:
+    return hashlib.sha256(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+
+
+def analysis_prompt(device1: models.Phone, device2: models.Phone) -> List[Dict]:
+    """Prompt AI untuk pasangan device, selalu dalam urutan canonical"""
+    return ai.comparison_messages(*_ordered(device1, device2))
+
+
+def get_stored_analysis(
+    db: Session, device1: models.Phone, device2: models.Phone
+) -> Optional[Dict[str, Any]]:
+    """
+    Analisis tersimpan untuk pasangan device, None jika belum ada atau basi
+    (data device sudah berubah sejak analisis dibuat).
+
+    Returns:
+        Dictionary dengan format yang sama seperti mode deadline AI:
+        ai_analysis, ai_source ("stored"), ai_generated_at
+    """
+    row = comparison_crud.get_analysis(db, device1.id, device2.id)
+    if row is None or row.prompt_hash != _prompt_hash(
+        analysis_prompt(device1, device2)
+    ):
+        return None
+    return {
+        "ai_analysis": row.analysis,
+        "ai_source": "stored",
+        "ai_generated_at": row.generated_at.replace(tzinfo=timezone.utc).isoformat(),
+    }
+
+
+# ==================== BATCH PRECOMPUTE ====================
+
+
+def select_candidate_pairs(
+    db: Session, top_n: int, new_devices: int, rivals: int
+) -> List[Pair]:
+    """
+    Pasangan yang perlu dianalisis:
+    - `top_n` pasangan dengan traffic tertinggi
+    - device tanpa analisis tersimpan (device baru) vs `rivals` device
+      dengan harga terdekat di kategori yang sama
+    """
+    pairs = list(comparison_crud.get_top_pairs(db, limit=top_n))
+    for device in comparison_crud.get_devices_without_analysis(db, limit=new_devices):
+        for rival in comparison_crud.get_nearest_priced_rivals(db, device, rivals):
+            pairs.append(canonical_pair(device.id, rival.id))
+    # Hapus duplikat, urutan prioritas tetap
+    return list(dict.fromkeys(pairs))
+
+
+def _generate(messages: List[Dict], retries: int = 3) -> str:
+    """Panggil AI (lewat circuit breaker), ulangi jika limit concurrency penuh"""
+    for attempt in range(retries + 1):
+        try:
+            return ai.format_comparison_response(
+                ai.request_ai_completion(messages, temperature=0.7)
+            )
+        except UpstreamRejected:
+            if attempt == retries:
+                raise
+            time.sleep(2**attempt)
+
+
+def precompute_analyses(
+    db: Session,
+    top_n: int = 50,
+    new_devices: int = 20,
+    rivals: int = 3,
+    concurrency: int = 4,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """
+    Generate dan simpan analisis AI untuk pasangan device yang paling dibutuhkan.
+
+    Panggilan AI berjalan paralel (maksimal `concurrency`); semua akses
+    database tetap di thread pemanggil.
+
+    Args:
+        db: Session primary
+        top_n: Jumlah pasangan terpopuler
+        new_devices: Jumlah device baru (tanpa analisis) yang diproses
+        rivals: Jumlah rival harga terdekat per device baru
+        concurrency: Maksimal panggilan AI paralel
+        dry_run: Hanya hitung kandidat, tanpa memanggil AI
+
+    Returns:
+        Ringkasan: candidates, fresh (sudah up to date), generated, failed
+    """
+    pairs = select_candidate_pairs(db, top_n, new_devices, rivals)
+    ids = {device_id for pair in pairs for device_id in pair}
+    devices = {
+        device.id: device
+        for device in db.query(models.Phone).filter(models.Phone.id.in_(ids))
+    }
+    stored_hashes = comparison_crud.get_analysis_hashes(db, pairs)
+
+    jobs = {}
+    for pair in pairs:
+        if pair[0] not in devices or pair[1] not in devices:
+            continue
+        messages = analysis_prompt(devices[pair[0]], devices[pair[1]])
+        prompt_hash = _prompt_hash(messages)
+        if stored_hashes.get(pair) != prompt_hash:
+            jobs[pair] = (messages, prompt_hash)
+
+    summary = {
+        "candidates": len(pairs),
+        "fresh": len(pairs) - len(jobs),
+        "generated": 0,
+        "failed": 0,
+    }
+    if dry_run or not jobs:
+        return summary
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(_generate, messages): pair
+            for pair, (messages, _) in jobs.items()
+        }
+        for future in as_completed(futures):
+            pair = futures[future]
+            try:
+                analysis = future.result()
+            except Exception as e:
+                summary["failed"] += 1
+                logger.warning(f"Precompute failed for pair {pair}: {e}")
+                continue
+            comparison_crud.save_analysis(
+                db, pair, jobs[pair][1], analysis, model=ai.AI_MODEL
+            )
+            summary["generated"] += 1
+
+    return summary
@@ -0,0 +1,281 @@
+"""
+Facet Index - filter halaman /devices dengan bitmap di memory
+
+Setiap device mendapat 1 posisi bit (slot). Untuk setiap nilai facet
+(kategori, brand, RAM tier, storage tier, tahun rilis, rentang harga)
+disimpan 1 bitmap (int Python) berisi slot device dengan nilai tersebut.
+Filter = AND bitmap, pilihan lain dalam 1 facet tidak perlu OR karena
+dropdown hanya memilih 1 nilai.
+
+Jumlah device per opsi dropdown ("Samsung (12)") dihitung dengan
+filter lain yang aktif (facet itu sendiri tidak ikut), sehingga user
+bisa melihat berapa hasil yang didapat jika pilihan diganti.
+
+Index diperbarui per device lewat catalog_events. Slot device yang dihapus
+dibiarkan kosong sampai rebuild berikutnya (slot dipadatkan, urut ID).
+"""
+
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .. import models
+from ..utils.specs import parse_memory_gb, parse_price
+from . import catalog_events
+from .percentile_index import price_band
+
+FACETS = ("category", "brand", "ram", "storage", "year", "price")
+
+# Tier = batas bawah, mis. RAM 10GB masuk tier "8GB"; tier terakhir = "16GB+"
+RAM_TIERS_GB = (4, 6, 8, 12, 16)
+STORAGE_TIERS_GB = (64, 128, 256, 512, 1024)
+# Batas rentang harga, sama dengan preset di halaman /devices
+PRICE_BUCKETS = (3_000_000, 5_000_000, 10_000_000, 20_000_000)
+
+# ({facet: nilai}, label brand, harga)
+Entry = Tuple[Dict[str, Any], Optional[str], Optional[float]]
+
+
+def tier_label(gb: int) -> str:
+    """64 -> "64GB", 1024 -> "1TB" (value dropdown RAM / storage)"""
+    return f"{gb // 1024}TB" if gb >= 1024 else f"{gb}GB"
+
+
+def memory_tier(text: Optional[str], tiers: Sequence[int]) -> Optional[str]:
+    """ "10GB" -> "8GB", "1TB" -> "1TB"; None jika di bawah tier pertama"""
+    value = parse_memory_gb(text)
+    if value is None:
+        return None
+    i = bisect.bisect_right(tiers, value)
+    if i == 0:
+        return None
+    return tier_label(tiers[i - 1])
+
+
+def brand_key(brand: Optional[str]) -> Optional[str]:
+    """Brand dicocokkan tanpa beda huruf besar/kecil"""
+    brand = (brand or "").strip()
+    return brand.lower() or None
+
+
+def _iter_bits(bitmap: int, limit: Optional[int] = None) -> List[int]:
+    """Posisi bit yang menyala, dari yang terkecil"""
+    bits = bin(bitmap)[:1:-1]  # Dibalik: karakter ke-i = bit ke-i
+    positions = []
+    i = bits.find("1")
+    while i != -1 and (limit is None or len(positions) < limit):
+        positions.append(i)
+        i = bits.find("1", i + 1)
+    return positions
+
+
+class FacetIndex(catalog_events.CatalogIndex):
+    """
+    Bitmap per nilai facet untuk filter + jumlah per opsi dropdown.
+
+    Contoh:
+        facet_index.search({"brand": "samsung", "ram": "8GB"}, max_price=5e6)
+        -> {"ids": [3, 8, ...], "total": 14, "counts": {"brand": {...}, ...}}
+    """
+
+    def __init__(self, price_buckets: Sequence[float] = PRICE_BUCKETS):
+        super().__init__("facet-index", "FACET_INDEX_MAX_AGE")
+        self.price_buckets = tuple(sorted(price_buckets))
+        self._reset()
+
+    def _reset(self) -> None:
+        self._slots: List[Optional[int]] = []  # slot -> device_id
+        self._slot_of: Dict[int, int] = {}
+        self._entries: Dict[int, Entry] = {}
+        self._all = 0  # Bitmap semua slot yang terisi
+        self._bitmaps: Dict[str, Dict[Any, int]] = {facet: {} for facet in FACETS}
+        # Per rentang harga: list (harga, slot) terurut, untuk filter harga
+        # yang batasnya jatuh di tengah rentang
+        self._prices: Dict[int, List[Tuple[float, int]]] = {}
+        self._brand_labels: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ==================== BUILD / UPDATE ====================
+
+    def entry_for(self, device: models.Phone) -> Entry:
+        price = parse_price(device.price)
+        values = {
+            "category": device.category_id,
+            "brand": brand_key(device.brand),
+            "ram": memory_tier(device.ram, RAM_TIERS_GB),
+            "storage": memory_tier(device.storage, STORAGE_TIERS_GB),
+            "year": device.release_year,
+            "price": None if price is None else price_band(price, self.price_buckets),
+        }
+        return (values, (device.brand or "").strip() or None, price)
+
+    def _insert(self, device_id: int, entry: Entry) -> None:
+        values, brand_label, price = entry
+        slot = len(self._slots)
+        bit = 1 << slot
+        self._slots.append(device_id)
+        self._slot_of[device_id] = slot
+        self._entries[device_id] = entry
+        self._all |= bit
+        for facet, value in values.items():
+            if value is not None:
+                bitmaps = self._bitmaps[facet]
+                bitmaps[value] = bitmaps.get(value, 0) | bit
+        if values["brand"] is not None:
+            self._brand_labels.setdefault(values["brand"], brand_label)
+        if price is not None:
+            bisect.insort(self._prices.setdefault(values["price"], []), (price, slot))
+
+    def _remove(self, device_id: int) -> None:
+        entry = self._entries.pop(device_id, None)
+        if entry is None:
+            return
+        values, _, price = entry
+        slot = self._slot_of.pop(device_id)
+        bit = 1 << slot
+        self._slots[slot] = None
+        self._all &= ~bit
+        for facet, value in values.items():
+            if value is None:
+                continue
+            bitmaps = self._bitmaps[facet]
+            bitmaps[value] &= ~bit
+            if not bitmaps[value]:
+                del bitmaps[value]
+                if facet == "brand":
+                    self._brand_labels.pop(value, None)
+        if price is not None:
+            prices = self._prices[values["price"]]
+            del prices[bisect.bisect_left(prices, (price, slot))]
+
+    def rebuild(self, devices: Iterable[models.Phone]) -> None:
+        """Bangun ulang semua bitmap (slot dipadatkan, urut ID device)"""
+        entries = sorted(
+            ((device.id, self.entry_for(device)) for device in devices),
+            key=lambda item: item[0],
+        )
+        with self._lock:
+            self._reset()
+            for device_id, entry in entries:
+                self._insert(device_id, entry)
+            self._mark_built()
+
+    def _apply(self, changes: Dict[int, Optional[Entry]]) -> None:
+        for device_id, entry in changes.items():
+            self._remove(device_id)
+            if entry is not None:
+                self._insert(device_id, entry)
+
+    # ==================== QUERY ====================
+
+    def _price_mask(
+        self, min_price: Optional[float], max_price: Optional[float]
+    ) -> int:
+        """Bitmap device dengan min_price <= harga <= max_price"""
+        low = 0 if min_price is None else price_band(min_price, self.price_buckets)
+        high = (
+            len(self.price_buckets)
+            if max_price is None
+            else price_band(max_price, self.price_buckets)
+        )
+        bitmaps = self._bitmaps["price"]
+        mask = 0
+        for band in range(low, high + 1):
+            prices = self._prices.get(band, [])
+            start, end = 0, len(prices)
+            if band == low and min_price is not None:
+                start = bisect.bisect_left(prices, (min_price, -1))
+            if band == high and max_price is not None:
+                end = bisect.bisect_right(prices, (max_price, len(self._slots)))
+            if start == 0 and end == len(prices):
+                # Seluruh rentang masuk: pakai bitmap langsung
+                mask |= bitmaps.get(band, 0)
+            else:
+                for _, slot in prices[start:end]:
+                    mask |= 1 << slot
+        return mask
+
+    def search(
+        self,
+        filters: Dict[str, Any],
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """
+        Device yang cocok dengan semua filter + jumlah per opsi dropdown.
+
+        Args:
+            filters: {facet: nilai}, mis. {"category": 1, "brand": "samsung"}
+            min_price: Harga minimal
+            max_price: Harga maksimal
+            limit: Jumlah ID device maksimal
+
+        Returns:
+            ids (urut slot), total device yang cocok, dan counts
+            {facet: {nilai: jumlah}} dengan filter facet lain
+        """
+        with self._lock:
+            masks = {
+                facet: self._bitmaps[facet].get(value, 0)
+                for facet, value in filters.items()
+                if value is not None
+            }
+            if min_price is not None or max_price is not None:
+                masks["price"] = self._price_mask(min_price, max_price)
+
+            matched = self._all
+            for mask in masks.values():
+                matched &= mask
+
+            counts = {}
+            for facet in FACETS:
+                # Filter semua facet lain (bukan facet ini sendiri)
+                others = self._all
+                for other, mask in masks.items():
+                    if other != facet:
+                        others &= mask
+                counts[facet] = {}
+                for value, bitmap in self._bitmaps[facet].items():
+                    count = (bitmap & others).bit_count()
+                    if count:
+                        counts[facet][value] = count
+
+            ids = [self._slots[slot] for slot in _iter_bits(matched, limit)]
+            return {"ids": ids, "total": matched.bit_count(), "counts": counts}
+
+    def options(self, counts: Dict[str, Dict[Any, int]]) -> Dict[str, List[Dict]]:
+        """
+        Opsi dropdown brand / RAM / storage / tahun dari hasil `search`.
+
+        Returns:
+            {facet: [{"value", "count"}, ...]}; tier RAM/storage selalu
+            lengkap (count 0 jika kosong), brand dan tahun hanya yang ada
+        """
+        with self._lock:
+            brands = sorted(
+                (self._brand_labels.get(key, key), count)
+                for key, count in counts["brand"].items()
+            )
+        return {
+            "brand": [{"value": label, "count": count} for label, count in brands],
+            "ram": [
+                {"value": tier_label(gb), "count": counts["ram"].get(tier_label(gb), 0)}
+                for gb in RAM_TIERS_GB
+            ],
+            "storage": [
+                {
+                    "value": tier_label(gb),
+                    "count": counts["storage"].get(tier_label(gb), 0),
+                }
+                for gb in STORAGE_TIERS_GB
+            ],
+            "year": [
+                {"value": str(year), "count": count}
+                for year, count in sorted(counts["year"].items(), reverse=True)
+            ],
+        }
+
+
+facet_index = catalog_events.register(FacetIndex())
@@ -3,17 +3,24 @@ Service untuk integrasi dengan n8n self-hosted.
 Mengirim data perbandingan device ke n8n untuk diproses dengan custom AI algorithm.
 """
 
+import hashlib
+import json
 import logging
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-import requests
-
 from .. import models
 from ..core import config
+from ..utils.ttl_cache import TTLCache
+from . import background, resilience
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Cache hasil enrichment n8n per pasangan device (key ikut hash data device,
+# jadi perubahan spesifikasi/harga otomatis memakai entry baru)
+enrichment_cache = TTLCache(ttl=config.N8N_CACHE_TTL, max_entries=2048)
+
 
 def send_comparison_to_n8n(
     device1: models.Phone, device2: models.Phone, rule_based_highlights: List[str]
@@ -30,56 +37,95 @@ def send_comparison_to_n8n(
         Dictionary berisi ai_highlights dan ai_summary dari n8n,
         atau None jika n8n disabled/error
     """
+    if not is_enabled():
+        return None
+
+    return post_to_n8n(build_payload(device1, device2, rule_based_highlights))
+
+
+def is_enabled() -> bool:
+    """True jika integrasi n8n aktif dan webhook URL sudah diisi"""
     # Check if n8n is enabled
     if not config.N8N_ENABLED:
         logger.info("n8n integration is disabled")
-        return None
+        return False
 
     # Check if webhook URL is configured
     if not config.N8N_WEBHOOK_URL:
         logger.warning("n8n webhook URL not configured")
-        return None
+        return False
 
-    try:
-        # Prepare payload - convert Decimal to float for JSON serialization
-        payload = {
-            "device_1": {
-                "id": device1.id,
-                "name": device1.name,
-                "brand": device1.brand,
-                "price": float(device1.price) if device1.price else 0,
-                "cpu": device1.cpu,
-                "ram": device1.ram,
-                "camera": device1.camera,
-                "battery": device1.battery,
-                "release_year": device1.release_year,
-            },
-            "device_2": {
-                "id": device2.id,
-                "name": device2.name,
-                "brand": device2.brand,
-                "price": float(device2.price) if device2.price else 0,
-                "cpu": device2.cpu,
-                "ram": device2.ram,
-                "camera": device2.camera,
-                "battery": device2.battery,
-                "release_year": device2.release_year,
-            },
-            "rule_based_highlights": rule_based_highlights,
-        }
+    return True
+
+
+def build_payload(
+    device1: models.Phone, device2: models.Phone, rule_based_highlights: List[str]
+) -> Dict[str, Any]:
+    """
+    Menyusun payload webhook n8n dari 2 device.
+
+    Payload berupa dict biasa (bukan object ORM), jadi aman dikirim dari
+    background thread setelah database session ditutup.
+    """
+    # Convert Decimal to float for JSON serialization
+    return {
+        "device_1": {
+            "id": device1.id,
+            "name": device1.name,
+            "brand": device1.brand,
+            "price": float(device1.price) if device1.price else 0,
+            "cpu": device1.cpu,
+            "ram": device1.ram,
+            "camera": device1.camera,
+            "battery": device1.battery,
+            "release_year": device1.release_year,
+        },
+        "device_2": {
+            "id": device2.id,
+            "name": device2.name,
+            "brand": device2.brand,
+            "price": float(device2.price) if device2.price else 0,
+            "cpu": device2.cpu,
+            "ram": device2.ram,
+            "camera": device2.camera,
+            "battery": device2.battery,
+            "release_year": device2.release_year,
+        },
+        "rule_based_highlights": rule_based_highlights,
+    }
 
-        # Send POST request to n8n webhook
-        logger.info(f"Sending comparison to n8n: {device1.name} vs {device2.name}")
 
-        response = requests.post(
-            config.N8N_WEBHOOK_URL,
-            json=payload,
-            timeout=config.N8N_TIMEOUT,
-            headers={"Content-Type": "application/json"},
+def post_to_n8n(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Mengirim payload ke n8n webhook.
+
+    Returns:
+        Response JSON dari n8n, atau None jika error/timeout
+    """
+    # Import saat dipakai: requests cukup berat dan integrasi n8n opsional
+    import requests
+
+    try:
+        # Send POST request to n8n webhook
+        logger.info(
+            f"Sending comparison to n8n: {payload['device_1']['name']} "
+            f"vs {payload['device_2']['name']}"
         )
 
-        # Check response status
-        response.raise_for_status()
+        def post():
+            response = requests.post(
+                config.N8N_WEBHOOK_URL,
+                json=payload,
+                timeout=config.N8N_TIMEOUT,
+                headers={"Content-Type": "application/json"},
+            )
+
+            # Check response status
+            response.raise_for_status()
+            return response
+
+        # Lewat circuit breaker: saat n8n down, gagal cepat tanpa menunggu timeout
+        response = resilience.n8n_upstream.call(post)
 
         # Parse response
         result = response.json()
@@ -87,6 +133,10 @@ def send_comparison_to_n8n(
 
         return result
 
+    except resilience.UpstreamRejected as e:
+        logger.warning(f"n8n call skipped: {e}")
+        return None
+
     except requests.exceptions.Timeout:
         logger.error(f"n8n request timeout after {config.N8N_TIMEOUT} seconds")
         return None
@@ -195,7 +245,11 @@ def get_ai_enhanced_highlights(
 ) -> Dict[str, Any]:
     """
     Mendapatkan highlights yang sudah di-enhance dengan AI dari n8n.
-    Jika n8n gagal, fallback ke rule-based highlights.
+
+    Tidak menunggu n8n: jika hasil untuk pasangan device ini belum ada di
+    cache, rule-based highlights langsung dikembalikan dan pasangan device
+    di-antrikan untuk enrichment di background. Request berikutnya akan
+    mendapat versi n8n.
 
     Args:
         device1: Device pertama
@@ -203,26 +257,68 @@ def get_ai_enhanced_highlights(
         rule_based_highlights: Highlights dari rule-based algorithm
 
     Returns:
-        Dictionary berisi highlights dan metadata
+        Dictionary berisi highlights dan metadata:
+        - source: "n8n_ai" atau "rule_based"
+        - enriched_at: Waktu hasil n8n didapat (ISO 8601 UTC), None jika rule-based
+        - enrichment: "ready", "pending", "failed", atau "disabled"
     """
-    # Try to get AI highlights from n8n
-    n8n_response = send_comparison_to_n8n(device1, device2, rule_based_highlights)
-
-    if n8n_response:
-        # Process n8n response
-        processed = process_n8n_response(n8n_response)
-
-        if processed["ai_highlights"]:
-            # Success! Return AI-enhanced highlights
-            return {
-                "highlights": processed["ai_highlights"],
-                "ai_summary": processed["ai_summary"],
-                "scores": processed["scores"],
-                "source": "n8n_ai",
-                "fallback_used": False,
-            }
+    if not is_enabled():
+        return _rule_based_result(rule_based_highlights, enrichment="disabled")
+
+    payload = build_payload(device1, device2, rule_based_highlights)
+    key = enrichment_key(payload)
+    entry = enrichment_cache.get(key)
+
+    if entry is None:
+        # Belum ada di cache: antrikan, jawab dengan rule-based dulu
+        background.submit_once(key, enrich_comparison, key, payload)
+        return _rule_based_result(rule_based_highlights, enrichment="pending")
+
+    if entry.value is None:
+        # n8n gagal baru-baru ini, coba lagi setelah N8N_RETRY_AFTER
+        return _rule_based_result(rule_based_highlights, enrichment="failed")
+
+    return {
+        "highlights": entry.value["ai_highlights"],
+        "ai_summary": entry.value["ai_summary"],
+        "scores": entry.value["scores"],
+        "source": "n8n_ai",
+        "fallback_used": False,
+        "enriched_at": _isoformat(entry.stored_at),
+        "enrichment": "ready",
+    }
 
-    # Fallback to rule-based highlights
+
+def enrichment_key(payload: Dict[str, Any]) -> tuple:
+    """Key cache: pasangan device + hash payload (data device dan highlights)"""
+    digest = hashlib.sha1(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return ("n8n", payload["device_1"]["id"], payload["device_2"]["id"], digest)
+
+
+def enrich_comparison(key: tuple, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Job background: panggil n8n dan simpan hasilnya ke cache.
+
+    Hasil gagal juga di-cache (sebagai None) selama N8N_RETRY_AFTER detik,
+    supaya n8n yang sedang down tidak dipanggil di setiap request.
+    """
+    n8n_response = post_to_n8n(payload)
+    processed = process_n8n_response(n8n_response) if n8n_response else None
+
+    if processed and processed["ai_highlights"]:
+        enrichment_cache.set(key, processed)
+        return processed
+
+    enrichment_cache.set(key, None, ttl=config.N8N_RETRY_AFTER)
+    return None
+
+
+def _rule_based_result(
+    rule_based_highlights: List[str], enrichment: str
+) -> Dict[str, Any]:
+    """Fallback: rule-based highlights dalam format terstruktur"""
     logger.info("Using rule-based highlights (n8n not available)")
 
     # Convert rule-based highlights to structured format
@@ -238,4 +334,10 @@ def get_ai_enhanced_highlights(
         "scores": {},
         "source": "rule_based",
         "fallback_used": True,
+        "enriched_at": None,
+        "enrichment": enrichment,
     }
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
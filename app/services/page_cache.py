@@ -0,0 +1,264 @@
+"""
+Page Cache - HTML halaman publik yang sudah di-render (bytes)
+
+Halaman seperti /, /devices, /device/{id} dan /compare-page di-render ulang
+oleh Jinja2 setiap request walaupun katalog jarang berubah. Cache ini
+menyimpan hasil render per key (template + parameter + versi data),
+dibatasi total ukuran bytes (LRU).
+
+Dua jenis entry:
+- Per device: key memakai ETag dari http_cache (revision device + badge),
+  sehingga perubahan device di worker mana pun langsung menghasilkan key
+  baru. Entry lama untuk device yang berubah di proses ini dibuang lewat
+  catalog_events.
+- Seluruh katalog (homepage, daftar /devices): key memakai `version` yang
+  naik setiap katalog berubah di proses ini. Perubahan dari worker lain
+  tidak terlihat, sehingga entry ini juga punya TTL (PAGE_CACHE_TTL).
+
+Render yang dimulai sebelum perubahan katalog menyimpan hasilnya di key
+dengan version lama, jadi tidak pernah terbaca lagi.
+
+Versi terkompres (gzip / brotli, level maksimum) dibuat sekali per entry
+saat pertama diminta, lalu dipakai ulang; CompressionMiddleware melewati
+response yang sudah punya Content-Encoding.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Optional
+
+import jinja2
+from fastapi import Request
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+
+from .. import models
+from ..core import compression, config
+from . import catalog_events
+
+
+@dataclass(frozen=True)
+class PageEntry:
+    """HTML yang di-cache + device yang ditampilkan"""
+
+    body: bytes
+    device_ids: FrozenSet[int]
+    # None = tidak kedaluwarsa (key sudah memuat versi device)
+    expires_at: Optional[float]
+    # {"gzip" / "br": body terkompres}, diisi saat pertama diminta
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(data) for data in self.encoded.values())
+
+
+class PageCache:
+    """
+    Cache HTML thread-safe, LRU dengan batas total bytes.
+
+    Contoh:
+        key = ("index.html", page_cache.version)
+        body = page_cache.get(key)
+        if body is None:
+            body = render()
+            page_cache.put(key, body, catalog_wide=True)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version = 0
+        self.size_bytes = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, PageEntry]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """HTML untuk key, None jika tidak ada / kedaluwarsa"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry.body
+
+    def get_encoded(self, key: Hashable, encoding: str) -> Optional[bytes]:
+        """
+        HTML terkompres untuk key; dikompres (level maksimum) sekali lalu
+        disimpan bersama entry. None jika halaman tidak ada di cache.
+        """
+        body = self.get(key)
+        if body is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and encoding in entry.encoded:
+                return entry.encoded[encoding]
+
+        data = compression.compress(body, encoding, best=True)
+        with self._lock:
+            entry = self._entries.get(key)
+            # Entry bisa sudah diganti render baru selama kompresi
+            if (
+                entry is not None
+                and entry.body is body
+                and encoding not in entry.encoded
+            ):
+                entry.encoded[encoding] = data
+                self.size_bytes += len(data)
+                self._evict()
+        return data
+
+    def put(
+        self,
+        key: Hashable,
+        body: bytes,
+        device_ids=(),
+        catalog_wide: bool = False,
+    ) -> None:
+        """
+        Simpan HTML.
+
+        Args:
+            key: Key halaman (harus memuat `version` jika catalog_wide)
+            body: HTML hasil render
+            device_ids: Device yang ditampilkan (dibuang saat device berubah)
+            catalog_wide: Isi halaman bergantung pada seluruh katalog
+        """
+        if len(body) > self.max_bytes:
+            return
+        entry = PageEntry(
+            body=body,
+            device_ids=frozenset(device_ids),
+            expires_at=self._clock() + self.ttl if catalog_wide else None,
+        )
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self.size_bytes += len(body)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self.size_bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # ==================== CATALOG EVENTS ====================
+
+    def entry_for(self, device: models.Phone) -> None:
+        # Cukup ID device (key dari catalog_events)
+        return None
+
+    def apply(self, changes: Dict[int, Any]) -> None:
+        """Buang halaman katalog dan halaman device yang berubah"""
+        changed = changes.keys()
+        with self._lock:
+            self.version += 1
+            for key in [
+                key
+                for key, entry in self._entries.items()
+                if entry.expires_at is not None
+                or not entry.device_ids.isdisjoint(changed)
+            ]:
+                self._remove(key)
+
+    def mark_stale(self) -> None:
+        # Perubahan massal: device mana yang berubah tidak diketahui
+        self.clear()
+
+
+class CachedJinja2Templates(Jinja2Templates):
+    """
+    Jinja2Templates + PageCache untuk halaman publik.
+
+    Key halaman selalu memuat template dan base URL (url_for di template
+    menghasilkan URL absolut sesuai host request).
+    """
+
+    def __init__(self, env: jinja2.Environment, cache: PageCache):
+        super().__init__(env=env)
+        self.cache = cache
+
+    def page_key(
+        self, request: Request, name: str, *parts: Hashable, catalog_wide: bool = False
+    ) -> tuple:
+        """Key cache; halaman katalog ikut memuat versi katalog saat ini"""
+        version = self.cache.version if catalog_wide else None
+        return (name, str(request.base_url), parts, version)
+
+    def cached_page(
+        self, request: Request, key: tuple, headers: Optional[Dict[str, str]] = None
+    ) -> Optional[HTMLResponse]:
+        """Response dari cache, None jika belum ada (render dulu)"""
+        body = self.cache.get(key)
+        if body is None:
+            return None
+        return self._response(request, key, body, headers)
+
+    def render_page(
+        self,
+        key: tuple,
+        name: str,
+        context: Dict[str, Any],
+        device_ids=(),
+        headers: Optional[Dict[str, str]] = None,
+    ) -> HTMLResponse:
+        """Render template, simpan hasilnya di cache, lalu kirim"""
+        body = self.get_template(name).render(context).encode("utf-8")
+        self.cache.put(key, body, device_ids, catalog_wide=key[-1] is not None)
+        return self._response(context["request"], key, body, headers)
+
+    def _response(
+        self,
+        request: Request,
+        key: tuple,
+        body: bytes,
+        headers: Optional[Dict[str, str]],
+    ) -> HTMLResponse:
+        """HTMLResponse, memakai versi terkompres dari cache jika client mau"""
+        encoding = compression.choose_encoding(
+            request.headers.get("accept-encoding", "")
+        )
+        data = None
+        if encoding is not None and len(body) >= config.COMPRESSION_MINIMUM_SIZE:
+            data = self.cache.get_encoded(key, encoding)
+        if data is None:
+            return HTMLResponse(body, headers=headers)
+
+        response = HTMLResponse(data, headers=headers)
+        response.headers["Content-Encoding"] = encoding
+        response.headers.add_vary_header("Accept-Encoding")
+        if "etag" in response.headers:
+            response.headers["ETag"] = compression.weak_etag(response.headers["etag"])
+        return response
+
+
+# Dikosongkan otomatis saat Phone berubah (lihat catalog_events.py)
+page_cache = catalog_events.register(
+    PageCache(max_bytes=config.PAGE_CACHE_MAX_BYTES, ttl=config.PAGE_CACHE_TTL)
+)
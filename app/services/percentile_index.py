@@ -0,0 +1,225 @@
+"""
+Percentile Index - posisi spesifikasi device dibanding seluruh katalog
+
+Untuk setiap atribut di COMPARISON_RULES disimpan list nilai yang sudah
+terurut, per kategori dan per kategori + rentang harga (price band).
+Rank sebuah device dihitung dengan binary search (bisect), tanpa query
+ke tabel phones saat request.
+
+Index dibangun penuh sekali (startup / background), lalu diperbarui
+per device saat transaksi yang mengubah Phone di-commit (catalog_events).
+Perubahan massal (query.update / query.delete) membuat index dibangun
+ulang di background.
+"""
+
+import bisect
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .. import models
+from ..core import config
+from . import catalog_events
+from .comparison_rules import COMPARISON_RULES, ComparisonRule, SpecVector
+
+# (category_id, price band, nilai semua rule)
+Entry = Tuple[Optional[int], int, SpecVector]
+ScopeKey = Tuple[Any, ...]
+
+
+def price_band(price, bands: Sequence[float]) -> int:
+    """Index rentang harga: 0 = di bawah batas pertama, dst."""
+    if price is None:
+        return -1
+    return bisect.bisect_right(bands, float(price))
+
+
+def price_band_label(band: int, bands: Sequence[float]) -> str:
+    """Label rentang harga, mis. "Rp 2-4 jt" """
+
+    def juta(value: float) -> str:
+        return f"{value / 1_000_000:g}"
+
+    if band <= 0:
+        return f"< Rp {juta(bands[0])} jt"
+    if band >= len(bands):
+        return f"> Rp {juta(bands[-1])} jt"
+    return f"Rp {juta(bands[band - 1])}-{juta(bands[band])} jt"
+
+
+class PercentileIndex(catalog_events.CatalogIndex):
+    """
+    Index rank per atribut untuk scope "category" dan "price_band".
+
+    Contoh:
+        percentile_index.rank(device_id, "battery", "category")
+        -> {"rank": 3, "total": 40, "top_percent": 8}
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[ComparisonRule] = COMPARISON_RULES,
+        bands: Sequence[float] = (),
+        badge_top_percent: int = 25,
+        min_devices: int = 5,
+    ):
+        super().__init__("percentile-index", "PERCENTILE_INDEX_MAX_AGE")
+        self.rules = tuple(rules)
+        self.bands = tuple(sorted(bands))
+        self.badge_top_percent = badge_top_percent
+        self.min_devices = min_devices
+        self._rule_index = {rule.key: i for i, rule in enumerate(self.rules)}
+        self._entries: Dict[int, Entry] = {}
+        self._sorted: Dict[Tuple[ScopeKey, int], List[float]] = {}
+
+    # ==================== BUILD / UPDATE ====================
+
+    def entry_for(self, device: models.Phone) -> Entry:
+        return (
+            device.category_id,
+            price_band(device.price, self.bands),
+            tuple(rule.parse(device) for rule in self.rules),
+        )
+
+    def _scopes(self, entry: Entry) -> List[ScopeKey]:
+        category_id, band, _ = entry
+        scopes = [("category", category_id)]
+        if band >= 0:
+            scopes.append(("price_band", category_id, band))
+        return scopes
+
+    def _insert(self, device_id: int, entry: Entry) -> None:
+        self._entries[device_id] = entry
+        for scope in self._scopes(entry):
+            for i, value in enumerate(entry[2]):
+                if value is not None:
+                    bisect.insort(self._sorted.setdefault((scope, i), []), value)
+
+    def _remove(self, device_id: int) -> None:
+        entry = self._entries.pop(device_id, None)
+        if entry is None:
+            return
+        for scope in self._scopes(entry):
+            for i, value in enumerate(entry[2]):
+                if value is None:
+                    continue
+                values = self._sorted[(scope, i)]
+                del values[bisect.bisect_left(values, value)]
+
+    def rebuild(self, devices: Iterable[models.Phone]) -> None:
+        """Bangun ulang seluruh index dari list device"""
+        entries = {device.id: self.entry_for(device) for device in devices}
+        with self._lock:
+            self._entries = {}
+            self._sorted = {}
+            for device_id, entry in entries.items():
+                self._insert(device_id, entry)
+            self._mark_built()
+
+    def _apply(self, changes: Dict[int, Optional[Entry]]) -> None:
+        for device_id, entry in changes.items():
+            self._remove(device_id)
+            if entry is not None:
+                self._insert(device_id, entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ==================== QUERY ====================
+
+    def rank(
+        self, device_id: int, attribute: str, scope: str = "category"
+    ) -> Optional[Dict[str, int]]:
+        """
+        Rank device untuk 1 atribut di dalam scope.
+
+        Returns:
+            rank (1 = terbaik, seri = rank sama), total device di scope,
+            dan top_percent; None jika nilai device tidak diketahui
+        """
+        i = self._rule_index[attribute]
+        with self._lock:
+            entry = self._entries.get(device_id)
+            if entry is None or entry[2][i] is None:
+                return None
+            scope_key = self._scopes(entry)[0 if scope == "category" else -1]
+            if scope_key[0] != scope:
+                return None
+            values = self._sorted[(scope_key, i)]
+            value = entry[2][i]
+            if self.rules[i].higher_is_better:
+                better = len(values) - bisect.bisect_right(values, value)
+            else:
+                better = bisect.bisect_left(values, value)
+            total = len(values)
+
+        rank = better + 1
+        return {
+            "rank": rank,
+            "total": total,
+            "top_percent": math.ceil(100 * rank / total),
+        }
+
+    def badges(self, device: models.Phone) -> List[Dict[str, Any]]:
+        """
+        Badge "Top X% di kategori" untuk atribut unggulan device.
+
+        Hanya atribut dengan top_percent <= badge_top_percent dan scope
+        berisi minimal `min_devices` device. Per atribut dipakai scope
+        dengan persentase terbaik (kategori atau rentang harga).
+        """
+        with self._lock:
+            entry = self._entries.get(device.id)
+            if entry is None:
+                return []
+            badges = [
+                badge
+                for badge in (
+                    self._badge(device.id, entry, rule) for rule in self.rules
+                )
+                if badge is not None
+            ]
+        return badges
+
+    def _badge(
+        self, device_id: int, entry: Entry, rule: ComparisonRule
+    ) -> Optional[Dict[str, Any]]:
+        best = None
+        for scope in ("category", "price_band"):
+            result = self.rank(device_id, rule.key, scope)
+            if (
+                result is None
+                or result["total"] < self.min_devices
+                or result["top_percent"] > self.badge_top_percent
+            ):
+                continue
+            if best is None or result["top_percent"] < best["top_percent"]:
+                best = {**result, "scope": scope}
+        if best is None:
+            return None
+
+        if best["scope"] == "category":
+            where = "di kategori"
+        else:
+            where = f"di rentang {price_band_label(entry[1], self.bands)}"
+        return {
+            "key": rule.key,
+            "label": rule.label,
+            "icon": rule.icon,
+            **best,
+            "text": f"{rule.label}: Top {best['top_percent']}% {where}",
+        }
+
+
+percentile_index = catalog_events.register(
+    PercentileIndex(
+        bands=config.PERCENTILE_PRICE_BANDS,
+        badge_top_percent=config.PERCENTILE_BADGE_TOP,
+        min_devices=config.PERCENTILE_MIN_DEVICES,
+    )
+)
+
+
+def device_badges(device: models.Phone) -> List[Dict[str, Any]]:
+    """Badge percentile untuk halaman HTML (index global)"""
+    percentile_index.ensure_fresh()
+    return percentile_index.badges(device)
@@ -1,59 +1,94 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
 from .. import models
 from ..crud import device as device_crud
+from .use_case_scoring import DEFAULT_USE_CASE, use_case_index
+from .value_frontier import value_frontier
 
 
-def get_recommendations(
+def get_scored_recommendations(
     db: Session,
+    use_case: Optional[str] = None,
     max_price: Optional[float] = None,
     category_id: Optional[int] = None,
     min_release_year: Optional[int] = None,
     limit: int = 5,
-) -> List[models.Phone]:
+) -> List[Dict[str, Any]]:
     """
-    Memberikan rekomendasi phone berdasarkan kriteria yang diberikan.
+    Rekomendasi berdasarkan skor use case (lihat use_case_scoring.py).
 
-    Logika sederhana untuk mahasiswa:
-    1. Filter berdasarkan kriteria (harga, kategori, tahun)
-    2. Sort berdasarkan tahun rilis (terbaru) dan harga (termurah)
-    3. Return top N phones
+    Ranking diambil dari index skor di memory; database hanya dipakai
+    untuk mengambil data device hasilnya (1 query).
 
     Args:
         db: Database session
+        use_case: gaming, fotografi, kerja, kuliah, multimedia (default: umum)
         max_price: Harga maksimal yang diinginkan
-        category_id: ID kategori (1=Smartphone, 2=Laptop, dll)
+        category_id: ID kategori
         min_release_year: Tahun rilis minimal
         limit: Berapa banyak rekomendasi yang dikembalikan
 
     Returns:
-        List of Phone objects
+        List dictionary: device, score (skor use case 0-100), use_case
+
+    Raises:
+        IndexNotReady: Index skor belum selesai dibangun (cold start)
+    """
+    use_case_index.require_ready()
+
+    ranked = use_case_index.recommend(
+        use_case=use_case,
+        category_id=category_id,
+        max_price=max_price,
+        min_release_year=min_release_year,
+        limit=limit,
+    )
+    scores = {device_id: score for score, device_id in ranked}
+    devices = device_crud.get_devices_by_ids(db, list(scores))
+    return [
+        {
+            "device": device,
+            "score": scores[device.id],
+            "use_case": use_case or DEFAULT_USE_CASE,
+        }
+        for device in devices
+    ]
+
+
+def get_best_value_devices(
+    db: Session,
+    max_price: Optional[float] = None,
+    category_id: Optional[int] = None,
+    limit: int = 5,
+) -> List[Dict[str, Any]]:
     """
-    # Mulai dengan query semua devices
-    query = db.query(models.Phone)
+    Device "best value": tidak ada device lain di kategorinya yang lebih
+    murah sekaligus lebih kencang (lihat value_frontier.py).
 
-    # Filter berdasarkan harga maksimal
-    if max_price is not None:
-        query = query.filter(models.Phone.price <= max_price)
+    Args:
+        db: Database session
+        max_price: Harga maksimal yang diinginkan
+        category_id: ID kategori
+        limit: Berapa banyak device yang dikembalikan
 
-    # Filter berdasarkan kategori
-    if category_id is not None:
-        query = query.filter(models.Phone.category_id == category_id)
+    Returns:
+        List dictionary: device, performance_score (0-100), performa tertinggi dulu
 
-    # Filter berdasarkan tahun rilis minimal
-    if min_release_year is not None:
-        query = query.filter(models.Phone.release_year >= min_release_year)
+    Raises:
+        IndexNotReady: Frontier belum selesai dibangun (cold start)
+    """
+    value_frontier.require_ready()
 
-    # Sort: Prioritas tahun terbaru, lalu harga termurah
-    query = query.order_by(
-        models.Phone.release_year.desc(),  # Tahun terbaru dulu
-        models.Phone.price.asc(),  # Harga termurah dulu
+    ranked = value_frontier.best_value(
+        max_price=max_price, category_id=category_id, limit=limit
     )
-
-    # Ambil top N phones
-    return query.limit(limit).all()
+    scores = {device_id: round(score, 2) for score, _, device_id in ranked}
+    devices = device_crud.get_devices_by_ids(db, list(scores))
+    return [
+        {"device": device, "performance_score": scores[device.id]} for device in devices
+    ]
 
 
 def calculate_device_score(device: models.Phone) -> float:
@@ -0,0 +1,306 @@
+"""
+Resilience untuk panggilan ke service eksternal (AI API, n8n)
+
+Setiap upstream punya:
+- Circuit breaker (closed / open / half-open): jika error rate atau
+  proporsi panggilan lambat melewati batas, panggilan berikutnya langsung
+  ditolak (fail fast) selama `open_seconds`, lalu dicoba lagi dengan
+  beberapa panggilan percobaan (half-open).
+- Adaptive concurrency limit (AIMD): batas panggilan paralel naik pelan
+  (+1 per "putaran" sukses) dan turun cepat (x0.5) saat error / lambat.
+
+Dengan begitu upstream yang down tidak menghabiskan thread worker untuk
+menunggu timeout; pemanggil langsung memakai fallback.
+
+Status ditampilkan di endpoint admin `/admin/tools/upstreams`.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict
+
+from ..core import config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class UpstreamRejected(Exception):
+    """Panggilan ditolak sebelum dikirim (circuit open / limit penuh)"""
+
+
+class CircuitOpenError(UpstreamRejected):
+    pass
+
+
+class ConcurrencyLimitError(UpstreamRejected):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker berbasis rolling window N panggilan terakhir.
+
+    Circuit terbuka jika (minimal `min_calls` panggilan di window):
+    - proporsi error >= `failure_rate`, atau
+    - proporsi panggilan lebih lama dari `slow_call_seconds` >= `slow_call_rate`
+    """
+
+    def __init__(
+        self,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.opened_at = None
+            self.times_opened = 0
+            self.rejected = 0
+            self._calls = deque(maxlen=self.window_size)  # (failed, slow)
+            self._half_open_in_flight = 0
+
+    def before_call(self) -> None:
+        """Cek apakah panggilan boleh dikirim, raise CircuitOpenError jika tidak"""
+        with self._lock:
+            if self.state == OPEN:
+                if self._clock() - self.opened_at < self.open_seconds:
+                    self.rejected += 1
+                    raise CircuitOpenError("Circuit open")
+                self.state = HALF_OPEN
+                self._half_open_in_flight = 0
+
+            if self.state == HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        "Circuit half-open, percobaan sedang berjalan"
+                    )
+                self._half_open_in_flight += 1
+
+    def cancel(self) -> None:
+        """Panggilan yang sudah diizinkan `before_call` batal dikirim"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def record(self, failed: bool, duration: float) -> None:
+        """Catat hasil panggilan yang sudah dikirim"""
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                if failed or slow:
+                    self._open()
+                else:
+                    self.state = CLOSED
+                    self._calls.clear()
+                return
+
+            self._calls.append((failed, slow))
+            if self.state == CLOSED and self._should_open():
+                self._open()
+
+    def _should_open(self) -> bool:
+        total = len(self._calls)
+        if total < self.min_calls:
+            return False
+        failures = sum(1 for failed, _ in self._calls if failed)
+        slow = sum(1 for _, is_slow in self._calls if is_slow)
+        return (
+            failures / total >= self.failure_rate or slow / total >= self.slow_call_rate
+        )
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = self._clock()
+        self.times_opened += 1
+        self._calls.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            total = len(self._calls)
+            failures = sum(1 for failed, _ in self._calls if failed)
+            slow = sum(1 for _, is_slow in self._calls if is_slow)
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(
+                    0.0, self.open_seconds - (self._clock() - self.opened_at)
+                )
+            return {
+                "state": self.state,
+                "window_calls": total,
+                "failure_rate": round(failures / total, 3) if total else 0.0,
+                "slow_call_rate": round(slow / total, 3) if total else 0.0,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+                "retry_in_seconds": (
+                    round(retry_in, 1) if retry_in is not None else None
+                ),
+            }
+
+
+class AIMDLimiter:
+    """
+    Batas concurrency adaptif (Additive Increase / Multiplicative Decrease).
+
+    Sukses cepat: limit += 1 / limit (naik ~1 setelah `limit` panggilan sukses)
+    Error / lambat: limit *= backoff (turun cepat), minimal `min_limit`
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 32,
+        backoff: float = 0.5,
+    ):
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.limit = float(self.initial_limit)
+            self.in_flight = 0
+            self.rejected = 0
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                self.rejected += 1
+                raise ConcurrencyLimitError(
+                    f"Limit concurrency penuh ({self.in_flight}/{int(self.limit)})"
+                )
+            self.in_flight += 1
+
+    def release(self, congested: bool) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if congested:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "limit_exact": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+            }
+
+
+class Upstream:
+    """
+    1 service eksternal dengan circuit breaker + AIMD limiter.
+
+    Contoh:
+        response = ai_upstream.call(requests.post, url, json=payload, timeout=30)
+
+    Exception dari `fn` dihitung sebagai kegagalan lalu di-raise ulang.
+    Jika panggilan ditolak, UpstreamRejected di-raise tanpa memanggil `fn`.
+    """
+
+    def __init__(self, name: str, breaker: CircuitBreaker, limiter: AIMDLimiter):
+        self.name = name
+        self.breaker = breaker
+        self.limiter = limiter
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def call(self, fn: Callable, *args, **kwargs):
+        self.breaker.before_call()
+        try:
+            self.limiter.acquire()
+        except ConcurrencyLimitError:
+            # Slot percobaan half-open tidak terpakai
+            self.breaker.cancel()
+            raise
+
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = fn(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            duration = time.perf_counter() - started
+            self.breaker.record(failed=failed, duration=duration)
+            self.limiter.release(
+                congested=failed or duration >= self.breaker.slow_call_seconds
+            )
+            with self._lock:
+                self.calls += 1
+                self.failures += int(failed)
+
+    def reset(self) -> None:
+        self.breaker.reset()
+        self.limiter.reset()
+        with self._lock:
+            self.calls = 0
+            self.failures = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {"calls": self.calls, "failures": self.failures}
+        return {
+            **counters,
+            "circuit": self.breaker.snapshot(),
+            "concurrency": self.limiter.snapshot(),
+        }
+
+
+def _make_upstream(name: str, slow_call_seconds: float) -> Upstream:
+    return Upstream(
+        name,
+        CircuitBreaker(
+            window_size=config.UPSTREAM_WINDOW_SIZE,
+            min_calls=config.UPSTREAM_MIN_CALLS,
+            failure_rate=config.UPSTREAM_FAILURE_RATE,
+            slow_call_seconds=slow_call_seconds,
+            open_seconds=config.UPSTREAM_OPEN_SECONDS,
+        ),
+        AIMDLimiter(
+            initial_limit=config.UPSTREAM_INITIAL_CONCURRENCY,
+            max_limit=config.UPSTREAM_MAX_CONCURRENCY,
+        ),
+    )
+
+
+# Upstream yang dipakai aplikasi
+ai_upstream = _make_upstream("ai", slow_call_seconds=config.AI_SLOW_CALL_SECONDS)
+n8n_upstream = _make_upstream("n8n", slow_call_seconds=config.N8N_SLOW_CALL_SECONDS)
+
+upstreams: Dict[str, Upstream] = {
+    upstream.name: upstream for upstream in (ai_upstream, n8n_upstream)
+}
+
+
+def snapshot() -> Dict[str, Any]:
+    """Status semua upstream (untuk endpoint admin)"""
+    return {name: upstream.snapshot() for name, upstream in upstreams.items()}
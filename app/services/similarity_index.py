@@ -0,0 +1,286 @@
+"""
+Similarity Index - k-nearest neighbour untuk saran device alternatif
+
+Setiap device diubah menjadi vector spesifikasi dari COMPARISON_RULES
+(harga, RAM, storage, kamera, baterai, layar, tahun rilis). Harga, RAM, dan
+storage memakai skala log (selisih 2x dianggap sama jauhnya di semua
+rentang), lalu semua kolom dinormalisasi (z-score). Nilai yang tidak
+diketahui diisi rata-rata katalog.
+
+Untuk setiap device disimpan list K tetangga terdekat di kategori yang sama,
+sehingga `/devices/{id}/similar` hanya membaca list yang sudah ada.
+Perubahan katalog diterapkan per device (catalog_events): hanya list yang
+terpengaruh yang dihitung ulang (map tetangga terbalik: device -> list yang
+memuatnya). Array NumPy tumbuh dengan kapasitas berlipat (grow_rows),
+bukan disalin penuh setiap ada device baru. Statistik normalisasi ikut diperbarui saat
+rebuild penuh (startup, perubahan massal, atau SIMILAR_INDEX_MAX_AGE).
+
+`brute_force_neighbors` adalah baseline NumPy sederhana untuk test.
+"""
+
+import bisect
+import warnings
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .. import models
+from ..core import config
+from . import catalog_events
+from .comparison_matrix import spec_matrix
+from .comparison_rules import COMPARISON_RULES, ComparisonRule
+
+LOG_SCALE_ATTRIBUTES = {"price", "ram", "storage"}
+
+# (category_id, fitur mentah 1 device)
+Entry = Tuple[Optional[int], np.ndarray]
+# (jarak, device_id)
+Neighbor = Tuple[float, int]
+
+NO_CATEGORY = -1
+
+
+def raw_features(
+    devices: Sequence[models.Phone], rules: Sequence[ComparisonRule]
+) -> np.ndarray:
+    """Matriks fitur sebelum normalisasi (NaN = tidak diketahui)"""
+    values = spec_matrix(devices, rules)
+    for col, rule in enumerate(rules):
+        if rule.key in LOG_SCALE_ATTRIBUTES:
+            values[:, col] = np.log1p(np.clip(values[:, col], 0, None))
+    return values
+
+
+def grow_rows(array: np.ndarray, size: int) -> np.ndarray:
+    """
+    Array dengan kapasitas minimal `size` baris (isi lama tetap).
+
+    Kapasitas dilipatgandakan, jadi menambah baris satu per satu rata-rata
+    O(1) per baris, bukan menyalin seluruh array setiap kali.
+    """
+    if len(array) >= size:
+        return array
+    grown = np.empty((max(size, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+def brute_force_neighbors(
+    vectors: np.ndarray,
+    categories: np.ndarray,
+    ids: np.ndarray,
+    row: int,
+    k: int,
+) -> List[Neighbor]:
+    """
+    Baseline: hitung jarak ke semua device satu per satu (tanpa index).
+
+    Args:
+        vectors: Vector ternormalisasi semua device
+        categories: Kategori per baris
+        ids: ID device per baris
+        row: Baris device yang dicari tetangganya
+        k: Jumlah tetangga
+
+    Returns:
+        K tetangga terdekat di kategori yang sama, urut (jarak, id)
+    """
+    distances = np.sqrt(((vectors - vectors[row]) ** 2).sum(axis=1))
+    candidates = [
+        (float(distances[j]), int(ids[j]))
+        for j in range(len(ids))
+        if j != row and categories[j] == categories[row]
+    ]
+    return sorted(candidates)[:k]
+
+
+class SimilarityIndex(catalog_events.CatalogIndex):
+    """
+    Index K tetangga terdekat per device.
+
+    Contoh:
+        similarity_index.similar(device_id, k=5)
+        -> [(0.42, 17), (0.58, 3), ...]  # (jarak, device_id)
+    """
+
+    def __init__(self, rules: Sequence[ComparisonRule] = COMPARISON_RULES, k: int = 20):
+        super().__init__("similarity-index", "SIMILAR_INDEX_MAX_AGE")
+        self.rules = tuple(rules)
+        self.k = k
+        self._reset(dim=len(self.rules))
+        self.center = np.zeros(len(self.rules))
+        self.scale = np.ones(len(self.rules))
+
+    def _reset(self, dim: int) -> None:
+        self._ids: List[int] = []
+        self._pos: Dict[int, int] = {}
+        # Buffer dengan kapasitas cadangan; baris terpakai = len(self._ids)
+        self._category_buf = np.empty(0, dtype=np.int64)
+        self._vector_buf = np.empty((0, dim))
+        self._kth_buf = np.empty(0)  # Jarak tetangga ke-K (inf jika belum penuh)
+        self._neighbors: Dict[int, List[Neighbor]] = {}
+        # device_id -> device yang list tetangganya memuat device tersebut
+        self._reverse: Dict[int, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def _categories(self) -> np.ndarray:
+        return self._category_buf[: len(self._ids)]
+
+    @property
+    def _vectors(self) -> np.ndarray:
+        return self._vector_buf[: len(self._ids)]
+
+    @property
+    def _kth(self) -> np.ndarray:
+        return self._kth_buf[: len(self._ids)]
+
+    # ==================== VECTORS ====================
+
+    def entry_for(self, device: models.Phone) -> Entry:
+        return (device.category_id, raw_features([device], self.rules)[0])
+
+    def normalize(self, raw: np.ndarray) -> np.ndarray:
+        """Fitur mentah -> z-score dengan statistik rebuild terakhir"""
+        return np.nan_to_num((raw - self.center) / self.scale, nan=0.0)
+
+    def _distances(self, vector: np.ndarray) -> np.ndarray:
+        return np.sqrt(((self._vectors - vector) ** 2).sum(axis=1))
+
+    def _top_k(self, row: int, distances: np.ndarray) -> List[Neighbor]:
+        mask = self._categories == self._categories[row]
+        mask[row] = False
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > self.k:
+            nearest = np.argpartition(distances[candidates], self.k - 1)[: self.k]
+            # Jarak yang sama dengan tetangga ke-K ikut dipertimbangkan (tie by id)
+            cutoff = distances[candidates[nearest]].max()
+            candidates = candidates[distances[candidates] <= cutoff]
+        neighbors = sorted(
+            (float(distances[j]), self._ids[j]) for j in candidates.tolist()
+        )
+        return neighbors[: self.k]
+
+    def _set_neighbors(self, row: int, neighbors: List[Neighbor]) -> None:
+        device_id = self._ids[row]
+        for _, neighbor_id in self._neighbors.get(device_id, ()):
+            self._reverse[neighbor_id].discard(device_id)
+        for _, neighbor_id in neighbors:
+            self._reverse.setdefault(neighbor_id, set()).add(device_id)
+        self._neighbors[device_id] = neighbors
+        self._kth[row] = neighbors[-1][0] if len(neighbors) >= self.k else np.inf
+
+    # ==================== BUILD / UPDATE ====================
+
+    def rebuild(self, devices: Iterable[models.Phone]) -> None:
+        """Bangun ulang index (statistik normalisasi + semua list tetangga)"""
+        devices = list(devices)
+        raw = raw_features(devices, self.rules)
+        with warnings.catch_warnings():
+            # Kolom tanpa nilai sama sekali -> NaN, diganti di bawah
+            warnings.simplefilter("ignore", RuntimeWarning)
+            center = np.nanmean(raw, axis=0) if devices else np.zeros(len(self.rules))
+            scale = np.nanstd(raw, axis=0) if devices else np.ones(len(self.rules))
+        center = np.nan_to_num(center, nan=0.0)
+        scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+
+        with self._lock:
+            self.center = center
+            self.scale = scale
+            self._reset(dim=len(self.rules))
+            self._ids = [device.id for device in devices]
+            self._pos = {device_id: row for row, device_id in enumerate(self._ids)}
+            self._category_buf = np.array(
+                [
+                    NO_CATEGORY if d.category_id is None else d.category_id
+                    for d in devices
+                ],
+                dtype=np.int64,
+            )
+            self._vector_buf = self.normalize(raw)
+            self._kth_buf = np.full(len(devices), np.inf)
+
+            for row in range(len(devices)):
+                distances = self._distances(self._vectors[row])
+                self._set_neighbors(row, self._top_k(row, distances))
+
+            self._mark_built()
+
+    def _apply(self, changes: Dict[int, Optional[Entry]]) -> None:
+        for device_id, entry in changes.items():
+            self._remove(device_id)
+            if entry is not None:
+                self._insert(device_id, entry)
+
+    def _insert(self, device_id: int, entry: Entry) -> None:
+        category_id, raw = entry
+        row = len(self._ids)
+        self._category_buf = grow_rows(self._category_buf, row + 1)
+        self._vector_buf = grow_rows(self._vector_buf, row + 1)
+        self._kth_buf = grow_rows(self._kth_buf, row + 1)
+        self._ids.append(device_id)
+        self._pos[device_id] = row
+        self._categories[row] = NO_CATEGORY if category_id is None else category_id
+        self._vectors[row] = self.normalize(raw)
+        self._kth[row] = np.inf
+
+        distances = self._distances(self._vectors[row])
+        self._set_neighbors(row, self._top_k(row, distances))
+
+        # Device lain yang tetangga ke-K-nya lebih jauh dari device baru
+        closer = (self._categories == self._categories[row]) & (distances <= self._kth)
+        closer[row] = False
+        for other in np.flatnonzero(closer).tolist():
+            neighbors = list(self._neighbors[self._ids[other]])
+            bisect.insort(neighbors, (float(distances[other]), device_id))
+            del neighbors[self.k :]
+            self._set_neighbors(other, neighbors)
+
+    def _remove(self, device_id: int) -> None:
+        row = self._pos.pop(device_id, None)
+        if row is None:
+            return
+        for _, neighbor_id in self._neighbors.pop(device_id, ()):
+            self._reverse[neighbor_id].discard(device_id)
+        affected = sorted(self._reverse.get(device_id, ()))
+
+        # Pindahkan baris terakhir ke posisi yang dihapus
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._pos[moved_id] = row
+            self._categories[row] = self._categories[last]
+            self._vectors[row] = self._vectors[last]
+            self._kth[row] = self._kth[last]
+        self._ids.pop()
+
+        # Hanya list yang berisi device terhapus yang dihitung ulang
+        for other_id in affected:
+            other = self._pos[other_id]
+            self._set_neighbors(
+                other, self._top_k(other, self._distances(self._vectors[other]))
+            )
+        self._reverse.pop(device_id, None)
+
+    # ==================== QUERY ====================
+
+    def similar(self, device_id: int, k: int = 5) -> Optional[List[Neighbor]]:
+        """K device paling mirip, None jika device belum ada di index"""
+        with self._lock:
+            neighbors = self._neighbors.get(device_id)
+            return None if neighbors is None else neighbors[:k]
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(vectors, categories, ids) saat ini, untuk dibandingkan dengan baseline"""
+        with self._lock:
+            return (
+                self._vectors.copy(),
+                self._categories.copy(),
+                np.array(self._ids, dtype=np.int64),
+            )
+
+
+similarity_index = catalog_events.register(SimilarityIndex(k=config.SIMILAR_INDEX_K))
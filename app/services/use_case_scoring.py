@@ -0,0 +1,397 @@
+"""
+Use Case Scoring - skor rekomendasi per use case untuk seluruh katalog
+
+Setiap atribut dari COMPARISON_RULES dinormalisasi ke 0..1 (1 = terbaik di
+katalog; harga, RAM, storage memakai skala log). Skor use case adalah
+jumlah berbobot atribut tersebut x 100, dihitung untuk semua device dan
+semua use case dalam 1 perkalian matriks NumPy.
+
+Untuk setiap (use_case, kategori, price band) disimpan top-K device, sehingga
+`/recommendation/` cukup menggabungkan beberapa list kecil. Jika filter
+(harga / tahun) menyisakan terlalu sedikit device dari list yang terpotong,
+skor lengkap di memory di-scan (tetap tanpa query database).
+
+Perubahan katalog diterapkan per device lewat catalog_events: hanya list
+untuk kategori + price band device tersebut yang dihitung ulang. Array skor
+tumbuh dengan kapasitas berlipat (grow_rows dari similarity_index).
+"""
+
+import heapq
+import warnings
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .. import models
+from ..core import config
+from . import catalog_events
+from .comparison_rules import COMPARISON_RULES, ComparisonRule
+from .percentile_index import price_band
+from .similarity_index import grow_rows, raw_features
+
+DEFAULT_USE_CASE = "umum"
+
+# Bobot atribut per use case (total 1.0). Phone belum punya skor benchmark,
+# jadi performa diwakili RAM dan tahun rilis.
+USE_CASE_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "gaming": {
+        "ram": 0.30,
+        "release_year": 0.20,
+        "battery": 0.20,
+        "screen": 0.15,
+        "storage": 0.10,
+        "price": 0.05,
+    },
+    "fotografi": {
+        "camera": 0.45,
+        "storage": 0.20,
+        "release_year": 0.15,
+        "screen": 0.10,
+        "price": 0.10,
+    },
+    "kerja": {
+        "battery": 0.25,
+        "ram": 0.20,
+        "storage": 0.20,
+        "release_year": 0.15,
+        "price": 0.10,
+        "screen": 0.10,
+    },
+    "kuliah": {
+        "price": 0.40,
+        "battery": 0.25,
+        "storage": 0.15,
+        "ram": 0.10,
+        "release_year": 0.10,
+    },
+    "multimedia": {
+        "screen": 0.30,
+        "battery": 0.25,
+        "storage": 0.20,
+        "price": 0.15,
+        "camera": 0.10,
+    },
+    DEFAULT_USE_CASE: {
+        "release_year": 0.35,
+        "price": 0.25,
+        "ram": 0.10,
+        "storage": 0.10,
+        "camera": 0.10,
+        "battery": 0.10,
+    },
+}
+
+# (category_id, price band, harga, tahun rilis, fitur mentah)
+Entry = Tuple[Optional[int], int, float, float, np.ndarray]
+# (use_case, category_id, price band)
+ListKey = Tuple[str, int, int]
+
+NO_CATEGORY = -1
+
+
+def _rank_key(item: Tuple[float, int]) -> Tuple[float, int]:
+    """Skor tertinggi dulu, lalu ID terkecil"""
+    return (-item[0], item[1])
+
+
+def weight_matrix(
+    rules: Sequence[ComparisonRule], use_cases: Sequence[str]
+) -> np.ndarray:
+    """Matriks bobot (jumlah rule x jumlah use case)"""
+    return np.array(
+        [
+            [USE_CASE_WEIGHTS[use_case].get(rule.key, 0.0) for use_case in use_cases]
+            for rule in rules
+        ]
+    )
+
+
+class UseCaseScoringIndex(catalog_events.CatalogIndex):
+    """
+    Skor use case semua device + top-K per (use_case, kategori, price band).
+
+    Contoh:
+        use_case_index.recommend("gaming", category_id=1, max_price=5_000_000)
+        -> [(87.5, 12), (81.2, 4), ...]  # (skor, device_id)
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[ComparisonRule] = COMPARISON_RULES,
+        bands: Sequence[float] = (),
+        top_k: int = 50,
+    ):
+        super().__init__("use-case-index", "RECOMMENDATION_INDEX_MAX_AGE")
+        self.rules = tuple(rules)
+        self.bands = tuple(sorted(bands))
+        self.top_k = top_k
+        self.use_cases = list(USE_CASE_WEIGHTS)
+        self._use_case_col = {u: i for i, u in enumerate(self.use_cases)}
+        self._weights = weight_matrix(self.rules, self.use_cases)
+        self._direction = np.array(
+            [1.0 if rule.higher_is_better else -1.0 for rule in self.rules]
+        )
+        self._low = np.zeros(len(self.rules))
+        self._span = np.ones(len(self.rules))
+        self._reset()
+
+    def _reset(self) -> None:
+        self._ids: List[int] = []
+        self._pos: Dict[int, int] = {}
+        # Buffer dengan kapasitas cadangan; baris terpakai = len(self._ids)
+        self._category_buf = np.empty(0, dtype=np.int64)
+        self._band_buf = np.empty(0, dtype=np.int64)
+        self._price_buf = np.empty(0)
+        self._year_buf = np.empty(0)
+        self._score_buf = np.empty((0, len(self.use_cases)))
+        self._lists: Dict[ListKey, List[Tuple[float, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def _categories(self) -> np.ndarray:
+        return self._category_buf[: len(self._ids)]
+
+    @property
+    def _bands(self) -> np.ndarray:
+        return self._band_buf[: len(self._ids)]
+
+    @property
+    def _prices(self) -> np.ndarray:
+        return self._price_buf[: len(self._ids)]
+
+    @property
+    def _years(self) -> np.ndarray:
+        return self._year_buf[: len(self._ids)]
+
+    @property
+    def _scores(self) -> np.ndarray:
+        return self._score_buf[: len(self._ids)]
+
+    # ==================== SCORING ====================
+
+    def entry_for(self, device: models.Phone) -> Entry:
+        return (
+            device.category_id,
+            price_band(device.price, self.bands),
+            np.nan if device.price is None else float(device.price),
+            np.nan if device.release_year is None else float(device.release_year),
+            raw_features([device], self.rules)[0],
+        )
+
+    def score_matrix(self, raw: np.ndarray) -> np.ndarray:
+        """
+        Fitur mentah (n x rule) -> skor 0..100 (n x use case), 1 pass NumPy.
+
+        Nilai tidak diketahui dianggap rata-rata (0.5).
+        """
+        normalized = np.clip((raw - self._low) / self._span, 0.0, 1.0)
+        normalized = np.where(self._direction > 0, normalized, 1.0 - normalized)
+        normalized = np.nan_to_num(normalized, nan=0.5)
+        return np.round(100 * normalized @ self._weights, 2)
+
+    def scores_for(self, device_id: int) -> Optional[Dict[str, float]]:
+        """Skor semua use case untuk 1 device"""
+        with self._lock:
+            row = self._pos.get(device_id)
+            if row is None:
+                return None
+            return {
+                use_case: float(self._scores[row, col])
+                for use_case, col in self._use_case_col.items()
+            }
+
+    # ==================== BUILD / UPDATE ====================
+
+    def rebuild(self, devices: Iterable[models.Phone]) -> None:
+        """Hitung ulang statistik normalisasi, skor, dan semua list top-K"""
+        devices = list(devices)
+        entries = [self.entry_for(device) for device in devices]
+        raw = (
+            np.array([entry[4] for entry in entries])
+            if entries
+            else np.empty((0, len(self.rules)))
+        )
+        with warnings.catch_warnings():
+            # Kolom tanpa nilai sama sekali -> NaN, diganti di bawah
+            warnings.simplefilter("ignore", RuntimeWarning)
+            low = np.nanmin(raw, axis=0) if entries else np.zeros(len(self.rules))
+            high = np.nanmax(raw, axis=0) if entries else np.ones(len(self.rules))
+        low = np.nan_to_num(low, nan=0.0)
+        span = np.nan_to_num(high, nan=1.0) - low
+        span = np.where(span > 0, span, 1.0)
+
+        with self._lock:
+            self._low, self._span = low, span
+            self._reset()
+            self._ids = [device.id for device in devices]
+            self._pos = {device_id: row for row, device_id in enumerate(self._ids)}
+            self._category_buf = np.array(
+                [NO_CATEGORY if e[0] is None else e[0] for e in entries],
+                dtype=np.int64,
+            )
+            self._band_buf = np.array([e[1] for e in entries], dtype=np.int64)
+            self._price_buf = np.array([e[2] for e in entries], dtype=float)
+            self._year_buf = np.array([e[3] for e in entries], dtype=float)
+            self._score_buf = self.score_matrix(raw)
+
+            for category_id, band in set(zip(self._categories, self._bands)):
+                self._refresh_lists(int(category_id), int(band))
+
+            self._mark_built()
+
+    def _refresh_lists(self, category_id: int, band: int) -> None:
+        """Hitung ulang top-K semua use case untuk 1 (kategori, price band)"""
+        rows = np.flatnonzero((self._categories == category_id) & (self._bands == band))
+        for use_case, col in self._use_case_col.items():
+            key = (use_case, category_id, band)
+            if len(rows) == 0:
+                self._lists.pop(key, None)
+                continue
+            self._lists[key] = self._top(rows, col, self.top_k)
+
+    def _top(self, rows: np.ndarray, col: int, k: int) -> List[Tuple[float, int]]:
+        """Top-k (skor, device_id) dari baris tertentu, skor tertinggi dulu"""
+        scores = self._scores[rows, col]
+        if len(rows) > k:
+            keep = np.argpartition(-scores, k - 1)[:k]
+            # Skor yang sama dengan urutan ke-k ikut dipertimbangkan (tie by id)
+            keep = np.flatnonzero(scores >= scores[keep].min())
+            rows, scores = rows[keep], scores[keep]
+        ranked = sorted(
+            (
+                (float(score), self._ids[row])
+                for score, row in zip(scores, rows.tolist())
+            ),
+            key=_rank_key,
+        )
+        return ranked[:k]
+
+    def _apply(self, changes: Dict[int, Optional[Entry]]) -> None:
+        touched = set()
+        for device_id, entry in changes.items():
+            touched |= self._remove(device_id)
+            if entry is not None:
+                touched |= self._insert(device_id, entry)
+        for category_id, band in touched:
+            self._refresh_lists(category_id, band)
+
+    def _insert(self, device_id: int, entry: Entry) -> set:
+        category_id, band, price, year, raw = entry
+        category_id = NO_CATEGORY if category_id is None else category_id
+        row = len(self._ids)
+        self._category_buf = grow_rows(self._category_buf, row + 1)
+        self._band_buf = grow_rows(self._band_buf, row + 1)
+        self._price_buf = grow_rows(self._price_buf, row + 1)
+        self._year_buf = grow_rows(self._year_buf, row + 1)
+        self._score_buf = grow_rows(self._score_buf, row + 1)
+        self._pos[device_id] = row
+        self._ids.append(device_id)
+        self._categories[row] = category_id
+        self._bands[row] = band
+        self._prices[row] = price
+        self._years[row] = year
+        self._scores[row] = self.score_matrix(raw[np.newaxis, :])[0]
+        return {(category_id, band)}
+
+    def _remove(self, device_id: int) -> set:
+        row = self._pos.pop(device_id, None)
+        if row is None:
+            return set()
+        touched = {(int(self._categories[row]), int(self._bands[row]))}
+
+        # Pindahkan baris terakhir ke posisi yang dihapus
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._pos[moved_id] = row
+            for array in (
+                self._categories,
+                self._bands,
+                self._prices,
+                self._years,
+                self._scores,
+            ):
+                array[row] = array[last]
+        self._ids.pop()
+        return touched
+
+    # ==================== QUERY ====================
+
+    def recommend(
+        self,
+        use_case: Optional[str] = None,
+        category_id: Optional[int] = None,
+        max_price: Optional[float] = None,
+        min_release_year: Optional[int] = None,
+        limit: int = 5,
+    ) -> List[Tuple[float, int]]:
+        """
+        Device dengan skor use case tertinggi yang cocok dengan filter.
+
+        Returns:
+            List (skor, device_id), skor tertinggi dulu
+        """
+        use_case = use_case or DEFAULT_USE_CASE
+        col = self._use_case_col[use_case]
+
+        def matches(row: int) -> bool:
+            price, year = self._prices[row], self._years[row]
+            if max_price is not None and not price <= max_price:
+                return False
+            if min_release_year is not None and not year >= min_release_year:
+                return False
+            return True
+
+        with self._lock:
+            # List yang mungkin berisi device dengan harga <= max_price
+            max_band = None if max_price is None else price_band(max_price, self.bands)
+            lists = [
+                ranked
+                for (list_use_case, list_category, band), ranked in self._lists.items()
+                if list_use_case == use_case
+                and (category_id is None or list_category == category_id)
+                and (max_band is None or 0 <= band <= max_band)
+            ]
+            # List yang penuh (terpotong di K) mungkin menyembunyikan device
+            # dengan skor di bawah item terakhirnya: hasil merge hanya pasti
+            # benar sampai batas item terakhir list terpotong yang terendah
+            boundary = min(
+                (
+                    _rank_key(ranked[-1])
+                    for ranked in lists
+                    if len(ranked) >= self.top_k
+                ),
+                default=None,
+            )
+            results = []
+            for item in heapq.merge(*lists, key=_rank_key):
+                if len(results) == limit:
+                    break
+                if boundary is not None and _rank_key(item) > boundary:
+                    results = None
+                    break
+                if matches(self._pos[item[1]]):
+                    results.append(item)
+
+            if results is None or (len(results) < limit and boundary is not None):
+                # Scan skor lengkap di memory
+                mask = np.ones(len(self._ids), dtype=bool)
+                if category_id is not None:
+                    mask &= self._categories == category_id
+                if max_price is not None:
+                    mask &= self._prices <= max_price
+                if min_release_year is not None:
+                    mask &= self._years >= min_release_year
+                results = self._top(np.flatnonzero(mask), col, limit)
+
+        return results
+
+
+use_case_index = catalog_events.register(
+    UseCaseScoringIndex(
+        bands=config.PERCENTILE_PRICE_BANDS, top_k=config.RECOMMENDATION_TOP_K
+    )
+)
@@ -0,0 +1,256 @@
+"""
+Value Frontier - device "best value" (Pareto frontier harga vs performa)
+
+Device ada di frontier jika tidak ada device lain di kategori yang sama
+yang lebih murah (atau sama harga) DAN performanya lebih tinggi (atau sama).
+Frontier disimpan per kategori, urut harga naik; performanya otomatis ikut
+naik, sehingga "performa terbaik dengan harga <= X" cukup dicari dengan
+binary search (bisect) pada harga frontier.
+
+Phone belum punya skor benchmark, jadi skor performa (0..100) adalah jumlah
+berbobot spesifikasi selain harga (PERFORMANCE_WEIGHTS), dinormalisasi
+min-max terhadap katalog seperti use_case_scoring.py.
+
+Titik per kategori disimpan terurut (harga, -performa, id). Perubahan
+katalog (catalog_events) hanya menyapu ulang frontier kategori yang
+terpengaruh, dan dilewati jika device baru / yang dihapus memang tidak
+ada di frontier.
+"""
+
+import bisect
+import warnings
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .. import models
+from . import catalog_events
+from .comparison_rules import COMPARISON_RULES, ComparisonRule
+from .similarity_index import raw_features
+
+# Bobot atribut untuk skor performa (total 1.0, tanpa harga)
+PERFORMANCE_WEIGHTS: Dict[str, float] = {
+    "ram": 0.25,
+    "camera": 0.20,
+    "release_year": 0.15,
+    "storage": 0.15,
+    "battery": 0.15,
+    "screen": 0.10,
+}
+
+# (category_id, harga, fitur mentah)
+Entry = Tuple[Optional[int], float, np.ndarray]
+# (harga, -performa, device_id): urutan sweep frontier
+Point = Tuple[float, float, int]
+# (performa, harga, device_id)
+FrontierItem = Tuple[float, float, int]
+
+NO_CATEGORY = -1
+
+
+def sweep_frontier(points: Sequence[Point]) -> List[FrontierItem]:
+    """
+    Frontier dari titik yang sudah terurut (harga, -performa, id).
+
+    Titik disimpan jika performanya lebih tinggi dari semua titik sebelumnya
+    (yang lebih murah). Titik kembar (harga dan performa sama) hanya
+    diwakili ID terkecil.
+    """
+    frontier = []
+    best = -np.inf
+    for price, negative_performance, device_id in points:
+        if -negative_performance > best:
+            best = -negative_performance
+            frontier.append((best, price, device_id))
+    return frontier
+
+
+class ValueFrontierIndex(catalog_events.CatalogIndex):
+    """
+    Pareto frontier harga vs performa per kategori.
+
+    Contoh:
+        value_frontier.best_value(max_price=5_000_000, category_id=1)
+        -> [(78.4, 4_899_000.0, 12), (71.0, 3_500_000.0, 4), ...]
+        # (performa, harga, device_id), performa tertinggi dulu
+    """
+
+    def __init__(self, rules: Sequence[ComparisonRule] = COMPARISON_RULES):
+        super().__init__("value-frontier", "VALUE_FRONTIER_MAX_AGE")
+        self.rules = tuple(rules)
+        self._weights = np.array(
+            [PERFORMANCE_WEIGHTS.get(rule.key, 0.0) for rule in self.rules]
+        )
+        self._low = np.zeros(len(self.rules))
+        self._span = np.ones(len(self.rules))
+        self._reset()
+
+    def _reset(self) -> None:
+        # device_id -> (category_id, titik)
+        self._entries: Dict[int, Tuple[int, Point]] = {}
+        self._points: Dict[int, List[Point]] = {}
+        self._frontiers: Dict[int, List[FrontierItem]] = {}
+        self._frontier_prices: Dict[int, List[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ==================== SCORING ====================
+
+    def entry_for(self, device: models.Phone) -> Entry:
+        return (
+            device.category_id,
+            np.nan if device.price is None else float(device.price),
+            raw_features([device], self.rules)[0],
+        )
+
+    def performance_scores(self, raw: np.ndarray) -> np.ndarray:
+        """
+        Fitur mentah (n x rule) -> skor performa 0..100 (n).
+
+        Nilai tidak diketahui dianggap rata-rata (0.5).
+        """
+        normalized = np.clip((raw - self._low) / self._span, 0.0, 1.0)
+        normalized = np.nan_to_num(normalized, nan=0.5)
+        return 100 * normalized @ self._weights
+
+    def performance_of(self, device_id: int) -> Optional[float]:
+        """Skor performa 1 device, None jika tidak ada di index"""
+        with self._lock:
+            item = self._entries.get(device_id)
+            return None if item is None else -item[1][1]
+
+    # ==================== BUILD / UPDATE ====================
+
+    def rebuild(self, devices: Iterable[models.Phone]) -> None:
+        """Hitung ulang statistik normalisasi dan frontier semua kategori"""
+        entries = {device.id: self.entry_for(device) for device in devices}
+        raw = (
+            np.array([entry[2] for entry in entries.values()])
+            if entries
+            else np.empty((0, len(self.rules)))
+        )
+        with warnings.catch_warnings():
+            # Kolom tanpa nilai sama sekali -> NaN, diganti di bawah
+            warnings.simplefilter("ignore", RuntimeWarning)
+            low = np.nanmin(raw, axis=0) if entries else np.zeros(len(self.rules))
+            high = np.nanmax(raw, axis=0) if entries else np.ones(len(self.rules))
+        low = np.nan_to_num(low, nan=0.0)
+        span = np.nan_to_num(high, nan=1.0) - low
+        span = np.where(span > 0, span, 1.0)
+
+        with self._lock:
+            self._low, self._span = low, span
+            self._reset()
+            scores = self.performance_scores(raw)
+            for (device_id, entry), score in zip(entries.items(), scores.tolist()):
+                category_id, price, _ = entry
+                if np.isnan(price):
+                    continue  # Tanpa harga tidak bisa dinilai "value"-nya
+                category_id = NO_CATEGORY if category_id is None else category_id
+                point = (price, -score, device_id)
+                self._entries[device_id] = (category_id, point)
+                self._points.setdefault(category_id, []).append(point)
+            for category_id, points in self._points.items():
+                points.sort()
+                self._refresh_frontier(category_id)
+
+            self._mark_built()
+
+    def _refresh_frontier(self, category_id: int) -> None:
+        frontier = sweep_frontier(self._points.get(category_id, []))
+        if frontier:
+            self._frontiers[category_id] = frontier
+            self._frontier_prices[category_id] = [item[1] for item in frontier]
+        else:
+            self._points.pop(category_id, None)
+            self._frontiers.pop(category_id, None)
+            self._frontier_prices.pop(category_id, None)
+
+    def _on_frontier(self, category_id: int, device_id: int) -> bool:
+        return any(
+            item[2] == device_id for item in self._frontiers.get(category_id, [])
+        )
+
+    def _dominated(self, category_id: int, point: Point) -> bool:
+        """Ada device frontier yang lebih murah/sama dan performanya lebih tinggi"""
+        prices = self._frontier_prices.get(category_id)
+        if not prices:
+            return False
+        i = bisect.bisect_right(prices, point[0])
+        return i > 0 and self._frontiers[category_id][i - 1][0] > -point[1]
+
+    def _apply(self, changes: Dict[int, Optional[Entry]]) -> None:
+        touched = set()
+        for device_id, entry in changes.items():
+            touched |= self._remove(device_id)
+            if entry is not None:
+                touched |= self._insert(device_id, entry)
+        for category_id in touched:
+            self._refresh_frontier(category_id)
+
+    def _insert(self, device_id: int, entry: Entry) -> set:
+        category_id, price, raw = entry
+        if np.isnan(price):
+            return set()
+        category_id = NO_CATEGORY if category_id is None else category_id
+        score = float(self.performance_scores(raw[np.newaxis, :])[0])
+        point = (price, -score, device_id)
+        self._entries[device_id] = (category_id, point)
+        bisect.insort(self._points.setdefault(category_id, []), point)
+        return set() if self._dominated(category_id, point) else {category_id}
+
+    def _remove(self, device_id: int) -> set:
+        item = self._entries.pop(device_id, None)
+        if item is None:
+            return set()
+        category_id, point = item
+        points = self._points[category_id]
+        del points[bisect.bisect_left(points, point)]
+        return {category_id} if self._on_frontier(category_id, device_id) else set()
+
+    # ==================== QUERY ====================
+
+    def frontier(self, category_id: Optional[int]) -> List[FrontierItem]:
+        """Frontier 1 kategori, urut harga naik"""
+        category_id = NO_CATEGORY if category_id is None else category_id
+        with self._lock:
+            return list(self._frontiers.get(category_id, []))
+
+    def best_value(
+        self,
+        max_price: Optional[float] = None,
+        category_id: Optional[int] = None,
+        limit: int = 5,
+    ) -> List[FrontierItem]:
+        """
+        Device frontier dengan harga <= max_price, performa tertinggi dulu.
+
+        Tanpa category_id, frontier semua kategori digabung (tiap device
+        tetap hanya dibandingkan dengan kategorinya sendiri).
+
+        Returns:
+            List (performa, harga, device_id)
+        """
+        with self._lock:
+            if category_id is None:
+                categories = list(self._frontiers)
+            else:
+                categories = [category_id]
+            results = []
+            for category in categories:
+                frontier = self._frontiers.get(category)
+                if not frontier:
+                    continue
+                end = len(frontier)
+                if max_price is not None:
+                    end = bisect.bisect_right(
+                        self._frontier_prices[category], max_price
+                    )
+                # Performa naik searah harga: ambil dari ujung yang termahal
+                results.extend(frontier[max(0, end - limit) : end])
+        results.sort(key=lambda item: (-item[0], item[1], item[2]))
+        return results[:limit]
+
+
+value_frontier = catalog_events.register(ValueFrontierIndex())
@@ -0,0 +1,35 @@
+"""
+Cursor - token pagination yang opaque untuk client
+
+Isi cursor (posisi terakhir halaman sebelumnya) disimpan sebagai JSON
+yang di-encode base64 URL-safe. Client cukup mengirim balik token dari
+header X-Next-Cursor tanpa perlu tahu isinya.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """{"sort": "price", "value": "1999000.00", "id": 42} -> token"""
+    data = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """
+    Token -> isi cursor.
+
+    Raises:
+        ValueError: Token rusak / bukan buatan encode_cursor
+    """
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(data)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Cursor tidak valid") from exc
+    if not isinstance(payload, dict):
+        raise ValueError("Cursor tidak valid")
+    return payload
@@ -0,0 +1,65 @@
+"""
+Spec Parser - ubah string spesifikasi device menjadi angka
+
+Data spesifikasi disimpan sebagai string bebas (hasil scraping / CSV),
+mis. "8GB", "1TB", "50MP + 12MP", "5000 mAh", '6.7" AMOLED'.
+Fungsi di sini mengambil angka utamanya supaya bisa dibandingkan.
+Semua parser mengembalikan None jika format tidak dikenali.
+"""
+
+import re
+from typing import Optional
+
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+
+
+def parse_number(text: Optional[str]) -> Optional[float]:
+    """Angka pertama di dalam string, mis. "6.7 inch" -> 6.7, "8GB" -> 8"""
+    if not text:
+        return None
+    match = _NUMBER.search(str(text))
+    if not match:
+        return None
+    return float(match.group().replace(",", "."))
+
+
+def parse_memory_gb(text: Optional[str]) -> Optional[float]:
+    """RAM / storage dalam GB: "8GB" -> 8, "1TB" -> 1024, "512MB" -> 0.5"""
+    value = parse_number(text)
+    if value is None:
+        return None
+    unit = str(text).upper()
+    if "TB" in unit:
+        return value * 1024
+    if "MB" in unit and "GB" not in unit:
+        return value / 1024
+    return value
+
+
+def parse_camera_mp(text: Optional[str]) -> Optional[float]:
+    """Resolusi kamera utama (angka pertama): "50MP + 12MP" -> 50"""
+    return parse_number(text)
+
+
+def parse_battery_mah(text: Optional[str]) -> Optional[float]:
+    """Kapasitas baterai: "5000 mAh" -> 5000"""
+    value = parse_number(text)
+    if value is None:
+        return None
+    # "5.000 mAh" (format Indonesia) terbaca 5.0
+    return value * 1000 if value < 100 else value
+
+
+def parse_screen_inch(text: Optional[str]) -> Optional[float]:
+    """Ukuran layar: '6.7" AMOLED' -> 6.7, "6.2 inch" -> 6.2"""
+    return parse_number(text)
+
+
+def parse_price(value) -> Optional[float]:
+    """Harga (Decimal / angka / None) -> float"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
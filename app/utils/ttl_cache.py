@@ -0,0 +1,86 @@
+"""
+TTL Cache - cache in-memory dengan masa berlaku per entry
+
+Dipakai untuk menyimpan hasil panggilan service eksternal (n8n, AI)
+supaya request berikutnya tidak perlu menunggu service tersebut lagi.
+Cache bersifat per-proses (setiap worker punya cache sendiri).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Nilai yang di-cache + kapan disimpan (epoch detik)"""
+
+    value: Any
+    stored_at: float
+    expires_at: float
+
+
+class TTLCache:
+    """
+    Cache thread-safe dengan TTL dan batas jumlah entry (LRU).
+
+    Contoh:
+        cache = TTLCache(ttl=3600, max_entries=1000)
+        cache.set(("n8n", 1, 2), result)
+        entry = cache.get(("n8n", 1, 2))
+        if entry:
+            print(entry.value, entry.stored_at)
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Ambil entry yang masih berlaku, None jika tidak ada / expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> CacheEntry:
+        """Simpan value; `ttl` override TTL default untuk entry ini"""
+        now = self._clock()
+        entry = CacheEntry(
+            value=value,
+            stored_at=now,
+            expires_at=now + (self.ttl if ttl is None else ttl),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -32,3 +32,115 @@ def test_client(test_app):
     with TestClient(test_app) as client:
         yield client
 
+
+
+@pytest.fixture
+def db_engine():
+    """
+    Engine SQLite in-memory yang terisolasi per test.
+
+    StaticPool dipakai supaya semua session (termasuk dari thread lain)
+    melihat database in-memory yang sama.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+
+    from app.models import Base
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(db_engine):
+    """Database session yang terikat ke db_engine"""
+    from sqlalchemy.orm import sessionmaker
+
+    session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def assert_max_queries(db_engine):
+    """
+    Helper untuk membatasi jumlah query SQL di dalam sebuah blok.
+
+    Contoh:
+        with assert_max_queries(3) as queries:
+            crud.get_users_page(db_session)
+
+    Test gagal jika jumlah query di dalam blok melebihi batas. List
+    `queries` berisi statement SQL yang tereksekusi (untuk debugging).
+    """
+    from contextlib import contextmanager
+
+    from sqlalchemy import event
+
+    @contextmanager
+    def _assert_max_queries(max_queries: int):
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(db_engine, "before_cursor_execute", _record)
+
+        assert len(statements) <= max_queries, (
+            f"Expected at most {max_queries} queries, got {len(statements)}:\n"
+            + "\n".join(statements)
+        )
+
+    return _assert_max_queries
+
+
+@pytest.fixture
+def random_phone():
+    """
+    Factory Phone dengan spesifikasi acak untuk test index katalog.
+
+    Setiap field bisa di-override per test: list = dipilih acak dengan
+    rng.choice, callable = dipanggil dengan rng, nilai lain = konstan.
+
+    Contoh:
+        rng = random.Random(1)
+        phones = [random_phone(rng, i, storage=["64GB", None]) for i in ...]
+    """
+    from app import models
+
+    defaults = {
+        "brand": "Brand",
+        "category_id": [1, 2],
+        "ram": lambda rng: f"{rng.choice([4, 6, 8, 12, 16])}GB",
+        "storage": ["64GB", "128GB", "256GB", "512GB"],
+        "camera": lambda rng: f"{rng.randint(12, 200)}MP",
+        "battery": lambda rng: f"{rng.randrange(3000, 6000, 50)} mAh",
+        "screen": lambda rng: f'{rng.uniform(5.5, 7.0):.2f}"',
+        "price": lambda rng: rng.randrange(1_000_000, 25_000_000, 10_000),
+        "release_year": lambda rng: rng.randint(2019, 2025),
+    }
+
+    def _random_phone(rng, id, **choices):
+        fields = {}
+        for field, spec in {**defaults, **choices}.items():
+            if isinstance(spec, list):
+                fields[field] = rng.choice(spec)
+            elif callable(spec):
+                fields[field] = spec(rng)
+            else:
+                fields[field] = spec
+        return models.Phone(id=id, name=f"Phone {id}", **fields)
+
+    return _random_phone
@@ -8,11 +8,10 @@ from pathlib import Path
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from datetime import datetime
-
 from sqlalchemy import text
 
-from app.database import SessionLocal, engine
+from app.core.settings_registry import settings_registry
+from app.database import SessionLocal
 
 
 def add_default_settings():
@@ -51,39 +50,17 @@ def add_default_settings():
             ("default_currency", "IDR", "Mata uang default untuk harga"),
         ]
 
-        # Hapus data lama jika ada
-        print("\n🗑️  Menghapus settings lama (jika ada)...")
-        keys = [s[0] for s in settings]
-        placeholders = ",".join([f"'{k}'" for k in keys])
-        db.execute(text(f"DELETE FROM app_settings WHERE `key` IN ({placeholders})"))
-        db.commit()
-
-        # Insert settings baru
-        print("\n➕ Menambahkan settings baru...")
-        now = datetime.now()
-
-        for key, value, description in settings:
-            sql = text(
-                """
-                INSERT INTO app_settings (`key`, `value`, `description`, created_at, updated_at)
-                VALUES (:key, :value, :description, :created_at, :updated_at)
-            """
-            )
-
-            db.execute(
-                sql,
-                {
-                    "key": key,
-                    "value": value,
-                    "description": description,
-                    "created_at": now,
-                    "updated_at": now,
-                },
-            )
+        # Simpan lewat registry: 1 transaksi + kenaikan versi cache,
+        # supaya worker yang sedang jalan ikut me-reload settings
+        print("\n➕ Menyimpan settings...")
+        settings_registry.set_many(
+            db,
+            {key: value for key, value, _ in settings},
+            descriptions={key: description for key, _, description in settings},
+        )
+        for key, value, _ in settings:
             print(f"   ✅ {key}: {value}")
 
-        db.commit()
-
         # Tampilkan hasil
         print("\n📊 Settings yang berhasil ditambahkan:")
         result = db.execute(
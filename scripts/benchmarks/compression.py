@@ -0,0 +1,107 @@
+"""
+Benchmark: bytes-on-wire dan biaya CPU kompresi untuk response terbesar.
+
+Target (database SQLite sementara berisi --seed device dummy):
+- /devices/?limit=100       JSON API 100 device
+- /devices                  halaman HTML daftar device (100 kartu)
+- /device/1, /compare-page  halaman HTML detail & perbandingan
+- /admin/devices/export     CSV seluruh katalog (streaming)
+
+Untuk setiap target: ukuran body asli, gzip (COMPRESSION_GZIP_LEVEL),
+gzip level 9 (dipakai page cache) dan brotli (jika ter-install), plus
+waktu CPU kompresi per response (median dari --repeat kali).
+
+Usage:
+    python scripts/benchmarks/compression.py --seed 2000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="comparely-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+
+import httpx  # noqa: E402
+
+from app.core import compression  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.facet_index import facet_index  # noqa: E402
+from scripts.benchmarks.device_fields import seed  # noqa: E402
+
+TARGETS = [
+    "/devices/?limit=100",
+    "/devices",
+    "/device/1",
+    "/compare-page?id1=1&id2=2",
+    "/admin/devices/export",
+]
+
+
+async def fetch_bodies() -> dict:
+    """Body asli (tanpa kompresi) setiap target"""
+    bodies = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+        headers={"Accept-Encoding": "identity"},
+    ) as client:
+        for path in TARGETS:
+            response = await client.get(path)
+            response.raise_for_status()
+            bodies[path] = response.content
+    return bodies
+
+
+def cpu_ms(function, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        function()
+        samples.append((time.process_time() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.seed)
+    # Tanpa startup event: bangun index filter /devices dulu (bukan 503)
+    facet_index.rebuild_from_db()
+    bodies = asyncio.run(fetch_bodies())
+
+    variants = [("gzip", False), ("gzip", True)]
+    if compression.brotli is not None:
+        variants += [("br", False), ("br", True)]
+
+    print(f"{args.seed} devices, CPU = median of {args.repeat} compressions")
+    header = f"{'target':<28}{'identity':>11}"
+    for encoding, best in variants:
+        label = f"{encoding}{'-best' if best else ''}"
+        header += f"{label:>12}{'ms':>7}"
+    print(header)
+    for path, body in bodies.items():
+        row = f"{path:<28}{len(body):>11,}"
+        for encoding, best in variants:
+            compressed = compression.compress(body, encoding, best)
+            elapsed = cpu_ms(
+                lambda: compression.compress(body, encoding, best), args.repeat
+            )
+            row += f"{len(compressed):>12,}{elapsed:>7.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
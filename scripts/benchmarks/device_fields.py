@@ -0,0 +1,123 @@
+"""
+Benchmark: ukuran dan latency response /devices/ penuh vs `fields=`.
+
+Membandingkan untuk halaman 100 dan 1000 device:
+- full  : object Phone + kategori, validasi & serialisasi Pydantic per baris
+- fields: SELECT beberapa kolom saja, baris langsung ke JSON (FastJSONResponse)
+
+Setiap device diberi `description` panjang seperti data hasil scraping.
+Request dikirim lewat httpx.AsyncClient + ASGITransport (tanpa server HTTP).
+
+Usage:
+    python scripts/benchmarks/device_fields.py --requests 50 --fields id,name,brand,price
+
+Default memakai database SQLite sementara berisi data dummy. Set
+DATABASE_URL untuk mengukur database sungguhan (mis. MySQL).
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="comparely-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+# Halaman 1000 device melebihi batas default API
+os.environ.setdefault("DEVICES_PAGE_MAX_LIMIT", "1000")
+
+import httpx  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core import migrations, responses  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def seed(count: int) -> None:
+    """Isi database dengan device dummy jika masih kosong"""
+    migrations.upgrade(engine, log=lambda message: None)
+    db = SessionLocal()
+    try:
+        if db.query(models.Phone).count():
+            return
+        category = models.Category(name="Smartphone")
+        db.add(category)
+        db.flush()
+        db.add_all(
+            models.Phone(
+                name=f"Phone {i}",
+                brand=f"Brand {i % 10}",
+                category_id=category.id,
+                cpu="Snapdragon 8 Gen 3",
+                gpu="Adreno 750",
+                ram=f"{8 + i % 3 * 4}GB",
+                storage="256GB",
+                camera="50MP + 12MP + 10MP",
+                battery="5000 mAh",
+                screen="6.2 inch AMOLED",
+                price=1_000_000 + i * 1000,
+                release_year=2020 + i % 5,
+                description="Spesifikasi lengkap dan ulasan. " * 40,
+                source_data=f"https://www.gsmarena.com/phone-{i}.php",
+            )
+            for i in range(count)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def measure(path: str, total: int) -> dict:
+    """Kirim `total` request berurutan, catat latency dan ukuran body"""
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for _ in range(total):
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "bytes": len(response.content),
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--fields", default="id,name,brand,price")
+    parser.add_argument("--seed", type=int, default=2000)
+    args = parser.parse_args()
+
+    seed(args.seed)
+    encoder = "orjson" if responses.orjson is not None else "json"
+    print(f"{args.requests} requests per target, fast path encoder: {encoder}")
+    print(f"{'target':<16}{'bytes':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    for limit in (100, 1000):
+        targets = {
+            f"full/{limit}": f"/devices/?limit={limit}",
+            f"fields/{limit}": f"/devices/?limit={limit}&fields={args.fields}",
+        }
+        for name, path in targets.items():
+            asyncio.run(measure(path, 3))  # warm-up
+            result = asyncio.run(measure(path, args.requests))
+            print(
+                f"{name:<16}{result['bytes']:>12,}"
+                f"{result['p50']:>10.2f}{result['p95']:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
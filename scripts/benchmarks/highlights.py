@@ -0,0 +1,85 @@
+"""
+Benchmark: throughput rule engine highlight perbandingan.
+
+Mengukur berapa pasangan device per detik yang bisa dievaluasi oleh
+`highlight_engine` (rule yang sama dengan /compare/ dan /compare-page):
+- pre-parsed: spesifikasi di-parse sekali per device, lalu dipakai ulang
+- parse per pair: spesifikasi di-parse ulang untuk setiap pasangan
+  (seperti 1 request /compare/)
+
+Tidak memakai database: device dibuat di memory.
+
+Usage:
+    python scripts/benchmarks/highlights.py --devices 500 --pairs 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app import models  # noqa: E402
+from app.services.comparison_rules import highlight_engine  # noqa: E402
+
+
+def make_devices(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        models.Phone(
+            id=i,
+            name=f"Phone {i}",
+            brand=f"Brand {i % 10}",
+            ram=f"{rng.choice([4, 6, 8, 12, 16])}GB",
+            storage=rng.choice(["64GB", "128GB", "256GB", "512GB", "1TB"]),
+            camera=f"{rng.choice([12, 48, 50, 64, 108, 200])}MP + 12MP",
+            battery=f"{rng.randrange(3000, 6000, 100)} mAh",
+            screen=f'{rng.choice(["6.1", "6.4", "6.7", "6.8"])}" AMOLED',
+            price=rng.randrange(1_000_000, 25_000_000, 50_000),
+            release_year=rng.randint(2019, 2025),
+        )
+        for i in range(count)
+    ]
+
+
+def run(label: str, pairs, evaluate) -> None:
+    started = time.perf_counter()
+    highlights = 0
+    for device1, device2 in pairs:
+        highlights += len(evaluate(device1, device2))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<16} {len(pairs) / elapsed:>12,.0f} pairs/sec "
+        f"({elapsed * 1000:,.0f} ms, {highlights / len(pairs):.1f} highlights/pair)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--pairs", type=int, default=100_000)
+    args = parser.parse_args()
+
+    devices = make_devices(args.devices)
+    rng = random.Random(7)
+    pairs = [tuple(rng.sample(devices, 2)) for _ in range(args.pairs)]
+
+    started = time.perf_counter()
+    parsed = {device.id: highlight_engine.parse(device) for device in devices}
+    print(
+        f"parse {len(devices)} devices: "
+        f"{(time.perf_counter() - started) * 1000:,.1f} ms"
+    )
+
+    run(
+        "pre-parsed",
+        pairs,
+        lambda d1, d2: highlight_engine.evaluate(d1, d2, parsed[d1.id], parsed[d2.id]),
+    )
+    run("parse per pair", pairs, highlight_engine.evaluate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Load test: handler async dengan session sync (blocking) vs AsyncSession.
+
+Membandingkan throughput dan latency p50/p95 untuk:
+- blocking: `async def` handler yang memanggil crud sync (memblokir event loop)
+- async   : router `/devices/` yang memakai `get_async_db`
+
+Request dikirim lewat httpx.AsyncClient + ASGITransport (tanpa server HTTP),
+sehingga yang diukur adalah efek handler terhadap event loop.
+
+Usage:
+    python scripts/benchmarks/load_test_async.py --requests 500 --concurrency 50
+
+Default memakai database SQLite sementara berisi data dummy. Set
+DATABASE_URL untuk mengukur database sungguhan (mis. MySQL).
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="comparely-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+
+import httpx  # noqa: E402
+
+from app import crud, models, schemas  # noqa: E402
+from app.core import migrations  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@app.get("/_bench/blocking-devices", response_model=List[schemas.Phone])
+async def blocking_devices(limit: int = 20):
+    """Pola lama: session sync dipanggil langsung di dalam async def"""
+    db = SessionLocal()
+    try:
+        phones = crud.device.get_devices(db, limit=limit)
+        for phone in phones:
+            phone.category  # lazy load, seperti saat response di-serialize
+        return phones
+    finally:
+        db.close()
+
+
+def seed(count: int) -> None:
+    """Isi database dengan device dummy jika masih kosong"""
+    migrations.upgrade(engine, log=lambda message: None)
+    db = SessionLocal()
+    try:
+        if db.query(models.Phone).count():
+            return
+        category = models.Category(name="Smartphone")
+        db.add(category)
+        db.flush()
+        db.add_all(
+            models.Phone(
+                name=f"Phone {i}",
+                brand=f"Brand {i % 10}",
+                category_id=category.id,
+                cpu="Snapdragon 8 Gen 3",
+                gpu="Adreno 750",
+                ram=f"{8 + i % 3 * 4}GB",
+                storage="256GB",
+                camera="50MP",
+                battery="5000 mAh",
+                screen="6.2 inch AMOLED",
+                price=1_000_000 + i * 1000,
+                release_year=2020 + i % 5,
+            )
+            for i in range(count)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run(path: str, total: int, concurrency: int) -> dict:
+    """Kirim `total` request ke `path` dengan `concurrency` request paralel"""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=2000)
+    args = parser.parse_args()
+
+    seed(args.seed)
+    targets = {
+        "blocking": f"/_bench/blocking-devices?limit={args.limit}",
+        "async": f"/devices/?limit={args.limit}",
+    }
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'mode':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, path in targets.items():
+        asyncio.run(run(path, 20, 5))  # warm-up
+        result = asyncio.run(run(path, args.requests, args.concurrency))
+        print(
+            f"{name:<10}{result['rps']:>10.1f}{result['p50']:>10.2f}{result['p95']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
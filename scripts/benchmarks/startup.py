@@ -0,0 +1,138 @@
+"""
+Benchmark: waktu startup worker (import app + startup event) dan latency
+request pertama.
+
+Setiap run adalah proses Python baru (seperti worker gunicorn/uvicorn baru)
+terhadap database SQLite sementara yang sudah di-migrate dan di-seed:
+- import   : `from app.main import app` (config, models, router, service)
+- startup  : startup event (cek config, index katalog di background,
+             precompile template)
+- index    : menunggu build pertama index katalog di background selesai
+             (sebelumnya /devices menjawab 503)
+- /devices/?limit=20, /devices : latency request pertama API JSON dan
+             halaman HTML
+
+Usage:
+    python scripts/benchmarks/startup.py --runs 10
+    python scripts/benchmarks/startup.py --importtime   # modul terberat
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+PATHS = ["/devices/?limit=20", "/devices"]
+
+
+def child() -> None:
+    """Dijalankan di proses baru: import, startup, request pertama"""
+    started = time.perf_counter()
+    from app.main import app
+
+    imported = time.perf_counter()
+
+    from fastapi.testclient import TestClient
+
+    from app.services import background
+
+    result = {"import": (imported - started) * 1000}
+    begin = time.perf_counter()
+    with TestClient(app) as client:
+        result["startup"] = (time.perf_counter() - begin) * 1000
+        begin = time.perf_counter()
+        background.wait_all()
+        result["index"] = (time.perf_counter() - begin) * 1000
+        for path in PATHS:
+            begin = time.perf_counter()
+            response = client.get(path)
+            response.raise_for_status()
+            result[path] = (time.perf_counter() - begin) * 1000
+    print(json.dumps(result))
+
+
+def importtime(env: dict, top: int = 15) -> None:
+    """Modul dengan waktu import kumulatif terbesar (python -X importtime)"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative), name.rstrip()))
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:>9.1f} ms {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=200)
+    parser.add_argument("--importtime", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    if "DATABASE_URL" not in os.environ:
+        tmp_dir = tempfile.mkdtemp(prefix="comparely-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/bench.db"
+    env = {**os.environ, "PAGE_CACHE_MAX_BYTES": "0"}
+
+    # Seed di proses lain supaya proses ini tidak ikut meng-import app
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"from scripts.benchmarks.device_fields import seed; seed({args.seed})",
+        ],
+        cwd=ROOT,
+        env=env,
+        check=True,
+    )
+
+    if args.importtime:
+        importtime(env)
+        return
+
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    columns = ["import", "startup", "index"] + PATHS
+    print(f"median of {args.runs} fresh processes, milliseconds")
+    print("".join(f"{column:>20}" for column in columns) + f"{'first response':>17}")
+    medians = [statistics.median(s[column] for s in samples) for column in columns]
+    print(
+        "".join(f"{value:>20.1f}" for value in medians) + f"{sum(medians[:4]):>17.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
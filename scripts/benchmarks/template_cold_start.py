@@ -0,0 +1,188 @@
+"""
+Benchmark: latency request pertama setelah worker start (template Jinja2).
+
+Setiap skenario dijalankan di proses Python baru (seperti worker baru):
+- compile on demand : tanpa bytecode cache, template di-compile saat
+                      request pertama ke halaman tersebut (perilaku lama)
+- precompile (cold) : compile semua template saat startup, bytecode cache
+                      masih kosong (deploy pertama)
+- precompile (warm) : bytecode cache sudah disiapkan oleh
+                      scripts/precompile_templates.py (restart / worker baru)
+
+Yang diukur per proses: waktu startup (precompile) dan latency request
+pertama ke /, /devices, /device/1 dan /compare-page (median dari --runs).
+Request dikirim lewat httpx.AsyncClient + ASGITransport (tanpa server HTTP).
+
+Usage:
+    python scripts/benchmarks/template_cold_start.py --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+PAGES = ["/", "/devices", "/device/1", "/compare-page?id1=1&id2=2"]
+
+
+def seed(database_url: str) -> None:
+    """Database SQLite sementara berisi beberapa device"""
+    os.environ["DATABASE_URL"] = database_url
+    from app import models
+    from app.core import migrations
+    from app.database import SessionLocal, engine
+
+    migrations.upgrade(engine, log=lambda message: None)
+    db = SessionLocal()
+    try:
+        category = models.Category(name="Smartphone")
+        db.add(category)
+        db.flush()
+        db.add_all(
+            models.Phone(
+                name=f"Phone {i}",
+                brand=f"Brand {i % 5}",
+                category_id=category.id,
+                cpu="Snapdragon 8 Gen 3",
+                gpu="Adreno 750",
+                ram="8GB",
+                storage="256GB",
+                camera="50MP",
+                battery="5000 mAh",
+                screen="6.2 inch AMOLED",
+                price=1_000_000 + i * 100_000,
+                release_year=2020 + i % 5,
+            )
+            for i in range(50)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def child(precompile: bool) -> None:
+    """Dijalankan di proses baru: startup + request pertama per halaman"""
+    import httpx
+
+    started = time.perf_counter()
+    from app.core.templates import precompile as precompile_templates
+    from app.main import app
+    from app.services.facet_index import facet_index
+
+    imported = time.perf_counter()
+    # Tanpa startup event: bangun index filter /devices dulu (bukan 503)
+    facet_index.rebuild_from_db()
+    indexed = time.perf_counter()
+    if precompile:
+        precompile_templates()
+    ready = time.perf_counter()
+
+    async def first_requests():
+        latencies = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for path in PAGES:
+                begin = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies[path] = (time.perf_counter() - begin) * 1000
+        return latencies
+
+    result = {
+        "import": (imported - started) * 1000,
+        "precompile": (ready - indexed) * 1000,
+        "pages": asyncio.run(first_requests()),
+    }
+    print(json.dumps(result))
+
+
+def run_scenario(env: dict, runs: int, prepare=None) -> dict:
+    samples = []
+    for _ in range(runs):
+        if prepare:
+            prepare()
+        output = subprocess.run(
+            [sys.executable, __file__, "--child"],
+            cwd=ROOT,
+            env={**os.environ, **env},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    def median(values):
+        return statistics.median(values)
+
+    return {
+        "precompile": median([s["precompile"] for s in samples]),
+        "pages": {p: median([s["pages"][p] for s in samples]) for p in PAGES},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(os.environ["TEMPLATE_PRECOMPILE"] == "true")
+        return
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="comparely-bench-"))
+    database_url = f"sqlite:///{tmp_dir}/bench.db"
+    cache_dir = tmp_dir / "jinja2"
+    seed(database_url)
+
+    base = {"DATABASE_URL": database_url, "PAGE_CACHE_MAX_BYTES": "0"}
+    scenarios = {
+        "compile on demand": (
+            {**base, "TEMPLATE_BYTECODE_CACHE_DIR": "", "TEMPLATE_PRECOMPILE": "false"},
+            None,
+        ),
+        "precompile (cold)": (
+            {
+                **base,
+                "TEMPLATE_BYTECODE_CACHE_DIR": str(cache_dir),
+                "TEMPLATE_PRECOMPILE": "true",
+            },
+            lambda: shutil.rmtree(cache_dir, ignore_errors=True),
+        ),
+        "precompile (warm)": (
+            {
+                **base,
+                "TEMPLATE_BYTECODE_CACHE_DIR": str(cache_dir),
+                "TEMPLATE_PRECOMPILE": "true",
+            },
+            None,
+        ),
+    }
+
+    print(f"median of {args.runs} fresh processes, milliseconds")
+    header = f"{'scenario':<20}{'startup':>9}" + "".join(f"{p[:14]:>16}" for p in PAGES)
+    print(header + f"{'first total':>13}")
+    for name, (env, prepare) in scenarios.items():
+        result = run_scenario(env, args.runs, prepare)
+        pages = result["pages"]
+        print(
+            f"{name:<20}{result['precompile']:>9.1f}"
+            + "".join(f"{pages[p]:>16.1f}" for p in PAGES)
+            + f"{sum(pages.values()):>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Build static assets untuk production
+
+- Nama file ber-hash isi (css/style.css -> css/style.3f2a1b9c.css) +
+  manifest.json, dipakai template lewat static_url()
+- Varian .gz dan .br (jika `pip install brotli`) untuk CSS/JS/SVG/ICO,
+  dikirim langsung oleh /static sesuai Accept-Encoding
+
+Usage:
+    python scripts/build_static.py
+    python scripts/build_static.py --target build/static
+
+Jalankan dari root project setiap asset di app/static berubah (step build
+/deploy), lalu restart aplikasi.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core import config
+from app.core.static_assets import SOURCE_DIR, brotli, build
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build static assets")
+    parser.add_argument("--target", default=config.STATIC_BUILD_DIR)
+    args = parser.parse_args()
+
+    target = Path(args.target)
+    manifest = build(SOURCE_DIR, target)
+
+    print(f"{len(manifest)} file -> {target}")
+    if brotli is None:
+        print("Modul brotli tidak ter-install: hanya varian .gz yang dibuat")
+    for extension in (".css", ".js"):
+        hashed = [
+            target / name for name in manifest.values() if name.endswith(extension)
+        ]
+        sizes = {
+            label: sum(
+                variant.stat().st_size
+                for variant in (path.with_name(path.name + suffix) for path in hashed)
+                if variant.exists()
+            )
+            for label, suffix in (("raw", ""), ("gzip", ".gz"), ("br", ".br"))
+        }
+        print(
+            f"  {extension:<5}{sizes['raw']:>10,} bytes"
+            f"  gzip {sizes['gzip']:>9,}  br {sizes['br']:>9,}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
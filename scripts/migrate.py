@@ -0,0 +1,57 @@
+"""
+Migrasi schema database (lihat app/core/migrations.py)
+
+Dijalankan saat deploy, sebelum app di-start. App sendiri tidak lagi
+membuat tabel saat startup.
+
+Usage:
+    python scripts/migrate.py                 # upgrade ke versi terbaru
+    python scripts/migrate.py upgrade 0002    # upgrade sampai versi 0002
+    python scripts/migrate.py status          # daftar migrasi + status
+    python scripts/migrate.py stamp 0003      # tandai sudah jalan (database
+                                              # yang diubah manual via SQL)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import migrations  # noqa: E402
+from app.database import engine  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "command", nargs="?", default="upgrade", choices=["upgrade", "status", "stamp"]
+    )
+    parser.add_argument("version", nargs="?", help="Versi target (NNNN)")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        applied = migrations.applied_versions(engine)
+        for migration in migrations.discover():
+            mark = "x" if migration.version in applied else " "
+            print(
+                f"[{mark}] {migration.version}_{migration.name}: {migration.description}"
+            )
+        return
+
+    if args.command == "stamp":
+        if not args.version:
+            parser.error("stamp butuh versi, mis. stamp 0003")
+        stamped = migrations.stamp(engine, args.version)
+        print(f"✅ Ditandai: {', '.join(stamped) or 'tidak ada (sudah tercatat)'}")
+        return
+
+    executed = migrations.upgrade(engine, target=args.version)
+    if executed:
+        print(f"✅ {len(executed)} migrasi dijalankan")
+    else:
+        print("✅ Schema sudah versi terbaru")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Siapkan bytecode cache template Jinja2 saat deploy
+
+Compile semua template di app/templates dan tulis bytecode-nya ke
+TEMPLATE_BYTECODE_CACHE_DIR, sehingga worker yang baru start cukup memuat
+bytecode (tidak parse + compile ulang source template).
+
+Usage:
+    python scripts/precompile_templates.py
+    python scripts/precompile_templates.py --clear
+
+Jalankan dari root project setelah template berubah (mis. di step build).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core import config
+from app.core.templates import environment, precompile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompile template Jinja2")
+    parser.add_argument(
+        "--clear", action="store_true", help="Hapus bytecode cache lama dulu"
+    )
+    args = parser.parse_args()
+
+    if environment.bytecode_cache is None:
+        print("TEMPLATE_BYTECODE_CACHE_DIR kosong: bytecode cache nonaktif")
+        return 1
+
+    if args.clear:
+        environment.bytecode_cache.clear()
+
+    count = precompile()
+    print(f"{count} template di-compile ke {config.TEMPLATE_BYTECODE_CACHE_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
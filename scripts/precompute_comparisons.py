@@ -0,0 +1,71 @@
+"""
+Batch job: precompute analisis AI untuk perbandingan device yang populer
+
+Yang diproses:
+- N pasangan device yang paling sering dibandingkan (tabel comparison_traffic)
+- Device baru (belum punya analisis) vs rival dengan harga terdekat
+
+Analisis yang masih cocok dengan data device dilewati; hasil disimpan ke
+tabel comparison_analyses dan dipakai langsung oleh /compare/ai.
+
+Usage:
+    python scripts/precompute_comparisons.py
+    python scripts/precompute_comparisons.py --top 100 --concurrency 8
+    python scripts/precompute_comparisons.py --dry-run
+
+Jalankan berkala (mis. cron tiap jam).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core import config
+from app.database import SessionLocal
+from app.services.comparison_store import comparison_traffic, precompute_analyses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute analisis AI perbandingan")
+    parser.add_argument("--top", type=int, default=config.PRECOMPUTE_TOP_PAIRS)
+    parser.add_argument("--new", type=int, default=config.PRECOMPUTE_NEW_DEVICES)
+    parser.add_argument("--rivals", type=int, default=config.PRECOMPUTE_RIVALS)
+    parser.add_argument(
+        "--concurrency", type=int, default=config.PRECOMPUTE_CONCURRENCY
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print("=" * 60)
+        print("  Precompute Analisis AI Perbandingan")
+        print("=" * 60)
+
+        # Tulis traffic yang masih di buffer proses ini (jika ada)
+        comparison_traffic.flush(db)
+
+        summary = precompute_analyses(
+            db,
+            top_n=args.top,
+            new_devices=args.new,
+            rivals=args.rivals,
+            concurrency=args.concurrency,
+            dry_run=args.dry_run,
+        )
+
+        print(f"Kandidat pasangan : {summary['candidates']}")
+        print(f"Sudah up to date  : {summary['fresh']}")
+        print(f"Di-generate       : {summary['generated']}")
+        print(f"Gagal             : {summary['failed']}")
+        if args.dry_run:
+            print("(dry run: AI tidak dipanggil)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
-from app import models
-from app.database import Base, engine
+from app.core import migrations
+from app.database import engine
 
 
 def init_db():
-    print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
+    print("Creating tables (running migrations)...")
+    migrations.upgrade(engine)
     print("Tables created successfully!")
 
 
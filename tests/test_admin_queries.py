@@ -0,0 +1,87 @@
+"""
+Query-count tests untuk admin listing (users & roles).
+Memastikan listing tidak kembali ke pola N+1 query.
+"""
+
+import pytest
+
+from app.crud import user as user_crud
+from app.models import Role, User
+
+# Batas query per listing: COUNT + SELECT (+ GROUP BY untuk roles)
+MAX_USER_LISTING_QUERIES = 2
+MAX_ROLE_LISTING_QUERIES = 3
+
+
+@pytest.fixture
+def seeded_users(db_session):
+    """3 role dan 45 user yang tersebar di role tersebut"""
+    roles = [Role(name=name) for name in ("Super Admin", "Admin", "Viewer")]
+    db_session.add_all(roles)
+    db_session.flush()
+
+    for i in range(45):
+        db_session.add(
+            User(
+                username=f"user{i}",
+                email=f"user{i}@comparely.test",
+                role_id=roles[i % 3].id if i % 5 else None,
+            )
+        )
+    db_session.commit()
+    db_session.expunge_all()
+    return roles
+
+
+class TestAdminUserListing:
+    """Listing users harus memuat role tanpa query per user"""
+
+    def test_users_page_loads_roles_eagerly(
+        self, db_session, seeded_users, assert_max_queries
+    ):
+        with assert_max_queries(MAX_USER_LISTING_QUERIES):
+            users, total_pages = user_crud.get_users_page(db_session, per_page=20)
+            role_names = [user.role.name if user.role else None for user in users]
+
+        assert len(users) == 20
+        assert total_pages == 3
+        assert None in role_names and "Viewer" in role_names
+
+    def test_users_page_search_and_sort(
+        self, db_session, seeded_users, assert_max_queries
+    ):
+        with assert_max_queries(MAX_USER_LISTING_QUERIES):
+            users, total_pages = user_crud.get_users_page(
+                db_session, search="user1", sort="username", order="desc"
+            )
+
+        assert total_pages == 1
+        assert [u.username for u in users] == sorted(
+            [u.username for u in users], reverse=True
+        )
+
+
+class TestAdminRoleListing:
+    """Listing roles harus menghitung user per role dengan 1 query GROUP BY"""
+
+    def test_roles_page_counts_users_in_one_query(
+        self, db_session, seeded_users, assert_max_queries
+    ):
+        with assert_max_queries(MAX_ROLE_LISTING_QUERIES):
+            roles, total_pages, user_counts = user_crud.get_roles_page(db_session)
+
+        assert total_pages == 1
+        assert len(roles) == 3
+        # 9 dari 45 user tidak punya role (i % 5 == 0)
+        assert sum(user_counts.values()) == 36
+        assert user_counts == {
+            role.id: db_session.query(User).filter(User.role_id == role.id).count()
+            for role in roles
+        }
+
+    def test_count_users_by_role_includes_empty_roles(self, db_session):
+        role = Role(name="Empty")
+        db_session.add(role)
+        db_session.commit()
+
+        assert user_crud.count_users_by_role(db_session, [role.id]) == {role.id: 0}
@@ -0,0 +1,116 @@
+"""
+Tests untuk mode deadline AI (fallback lokal + cache dari jawaban terlambat)
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from app import models
+from app.services import ai, background
+
+AI_JSON = json.dumps(
+    {
+        "performa": "Galaxy S24 lebih kencang.",
+        "kamera": "Setara.",
+        "baterai": "Galaxy S24 lebih awet.",
+        "value_for_money": "Galaxy S24 lebih murah.",
+        "rekomendasi": "Pilih Galaxy S24.",
+    }
+)
+
+
+def make_phone(**overrides):
+    data = dict(
+        id=1,
+        name="Galaxy S24",
+        brand="Samsung",
+        cpu="Snapdragon 8 Gen 3",
+        ram="8GB",
+        camera="50MP + 12MP",
+        battery="5000 mAh",
+        release_year=2024,
+        price=12_000_000,
+    )
+    data.update(overrides)
+    return models.Phone(**data)
+
+
+@pytest.fixture
+def phones():
+    return make_phone(), make_phone(
+        id=2,
+        name="iPhone 15",
+        brand="Apple",
+        cpu="A16 Bionic",
+        ram="6GB",
+        camera="48MP",
+        battery="3349 mAh",
+        release_year=2023,
+        price=14_000_000,
+    )
+
+
+@pytest.fixture
+def slow_ai(monkeypatch):
+    """AI palsu yang baru menjawab setelah `release` di-set"""
+    monkeypatch.setattr(ai, "AI_API_KEY", "test-key")
+    ai.ai_cache.clear()
+    state = {"calls": 0, "release": threading.Event()}
+
+    def fake_completion(messages, temperature=0.7):
+        state["calls"] += 1
+        state["release"].wait(timeout=5)
+        return AI_JSON
+
+    monkeypatch.setattr(ai, "request_ai_completion", fake_completion)
+    yield state
+    state["release"].set()
+    background.wait_all(timeout=5)
+    ai.ai_cache.clear()
+
+
+class TestDeadlineMode:
+    """Request tidak menunggu AI lebih dari deadline"""
+
+    def test_late_answer_falls_back_then_fills_cache(self, phones, slow_ai):
+        started = time.perf_counter()
+        first = ai.get_comparison_analysis_within_deadline(*phones, deadline=0.1)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1
+        assert first["ai_source"] == "local"
+        assert first["ai_generated_at"] is None
+        assert "**Performa:**" in first["ai_analysis"]
+        assert "Galaxy S24 unggul dengan RAM lebih besar" in first["ai_analysis"]
+
+        # Panggilan AI tetap berjalan dan mengisi cache
+        slow_ai["release"].set()
+        background.wait_all(timeout=5)
+
+        second = ai.get_comparison_analysis_within_deadline(*phones, deadline=0.1)
+        assert second["ai_source"] == "ai"
+        assert second["ai_generated_at"]
+        assert "Galaxy S24 lebih kencang." in second["ai_analysis"]
+        assert slow_ai["calls"] == 1
+
+    def test_answer_within_deadline_is_returned_directly(self, phones, slow_ai):
+        slow_ai["release"].set()
+
+        result = ai.get_ai_recommendation_within_deadline(
+            list(phones), use_case="gaming", deadline=2
+        )
+
+        assert result["ai_source"] == "ai"
+        assert result["devices"] == list(phones)
+
+    def test_without_api_key_answers_locally(self, phones, monkeypatch):
+        monkeypatch.setattr(ai, "AI_API_KEY", "")
+
+        result = ai.get_ai_recommendation_within_deadline(list(phones), deadline=2)
+
+        assert result["ai_source"] == "local"
+        assert result["ai_recommendation"].startswith("**Top 3 Rekomendasi:**")
+        assert "1. Galaxy S24" in result["ai_recommendation"]
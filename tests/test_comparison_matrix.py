@@ -0,0 +1,60 @@
+"""
+Tests untuk perbandingan N device (/compare/matrix)
+"""
+
+import pytest
+
+from app import models
+from app.services import comparison_service
+from app.services.comparison_matrix import build_comparison_matrix
+
+
+def make_phone(id, **specs):
+    return models.Phone(id=id, name=f"Phone {id}", brand="Brand", **specs)
+
+
+class TestComparisonMatrix:
+    """Pemenang, ranking, dan selisih dalam 1 pass"""
+
+    def test_ranks_winners_and_deltas(self):
+        devices = [
+            make_phone(1, price=5_000_000, ram="8GB", battery="5000 mAh"),
+            make_phone(2, price=3_000_000, ram="12GB", battery="5000 mAh"),
+            make_phone(3, price=7_000_000, ram="1TB"),
+        ]
+
+        matrix = build_comparison_matrix(devices)
+        col = {a["key"]: i for i, a in enumerate(matrix["attributes"])}
+
+        # Harga: lebih murah lebih baik
+        assert matrix["winners"]["price"] == [2]
+        assert [row[col["price"]] for row in matrix["ranks"]] == [2, 1, 3]
+        assert [row[col["price"]] for row in matrix["deltas"]] == [
+            2_000_000,
+            0,
+            4_000_000,
+        ]
+
+        # RAM: "1TB" = 1024 GB
+        assert matrix["winners"]["ram"] == [3]
+        assert [row[col["ram"]] for row in matrix["deltas"]] == [-1016, -1012, 0]
+
+        # Baterai: seri antara device 1 dan 2, device 3 tidak diketahui
+        assert matrix["winners"]["battery"] == [1, 2]
+        assert [row[col["battery"]] for row in matrix["ranks"]] == [1, 1, None]
+
+        # Atribut yang tidak dimiliki device mana pun tidak punya pemenang
+        assert matrix["winners"]["camera"] == []
+        assert matrix["win_counts"] == [1, 2, 1]
+
+    def test_compare_many_devices_reports_missing_ids(self, db_session):
+        db_session.add_all(
+            [make_phone(1, price=1_000_000), make_phone(2, price=2_000_000)]
+        )
+        db_session.commit()
+
+        matrix = comparison_service.compare_many_devices(db_session, [2, 1])
+        assert [d["id"] for d in matrix["devices"]] == [2, 1]
+
+        with pytest.raises(ValueError, match=r"\[99\]"):
+            comparison_service.compare_many_devices(db_session, [1, 99])
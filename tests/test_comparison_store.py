@@ -0,0 +1,196 @@
+"""
+Tests untuk traffic perbandingan dan batch precompute analisis AI
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from app import models
+from app.crud import comparison as comparison_crud
+from app.services import ai, comparison_store
+from app.services.comparison_store import ComparisonTrafficTracker
+
+AI_JSON = json.dumps(
+    {
+        "performa": "Setara.",
+        "kamera": "Setara.",
+        "baterai": "Setara.",
+        "value_for_money": "Pilih yang lebih murah.",
+        "rekomendasi": "Tergantung budget.",
+    }
+)
+
+
+@pytest.fixture
+def phones(db_session):
+    category = models.Category(name="Smartphone")
+    db_session.add(category)
+    db_session.flush()
+    phones = [
+        models.Phone(
+            name=f"Phone {price}",
+            brand="Brand",
+            category_id=category.id,
+            cpu="Chip",
+            ram="8GB",
+            camera="50MP",
+            battery="5000 mAh",
+            release_year=2024,
+            price=price,
+        )
+        for price in (3_000_000, 3_500_000, 9_000_000, 10_000_000)
+    ]
+    db_session.add_all(phones)
+    db_session.commit()
+    return phones
+
+
+@pytest.fixture
+def fake_ai(monkeypatch):
+    state = {"calls": 0, "active": 0, "max_active": 0}
+    lock = threading.Lock()
+
+    def fake_completion(messages, temperature=0.7):
+        with lock:
+            state["calls"] += 1
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        return AI_JSON
+
+    monkeypatch.setattr(ai, "request_ai_completion", fake_completion)
+    return state
+
+
+class TestComparisonTraffic:
+    """Hitungan per pasangan, tanpa memperhatikan urutan"""
+
+    def test_flush_merges_counts_order_independent(self, db_session, phones):
+        a, b, c, _ = phones
+        tracker = ComparisonTrafficTracker(flush_every=1000, flush_interval=3600)
+
+        tracker.record(a.id, b.id)
+        tracker.record(b.id, a.id)
+        tracker.record(a.id, c.id)
+        tracker.record(a.id, a.id)  # bukan perbandingan
+        assert tracker.flush(db_session) == 2
+
+        tracker.record(c.id, a.id)
+        tracker.record(c.id, a.id)
+        tracker.flush(db_session)
+
+        assert tracker.pending() == {}
+        assert comparison_crud.get_top_pairs(db_session, limit=2) == [
+            (a.id, c.id),
+            (a.id, b.id),
+        ]
+
+    def test_overlapping_flushes_do_not_lose_counts(self, tmp_path):
+        """Dua worker flush pasangan yang sama bersamaan (termasuk pasangan baru)"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        engine = create_engine(
+            f"sqlite:///{tmp_path}/traffic.db", connect_args={"timeout": 30}
+        )
+        models.Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        rounds = 20
+        barrier = threading.Barrier(2)
+        errors = []
+
+        def worker(count):
+            tracker = ComparisonTrafficTracker(flush_every=1000, flush_interval=3600)
+            db = Session()
+            try:
+                for round_ in range(rounds):
+                    for _ in range(count):
+                        tracker.record(1, 2)
+                        tracker.record(round_ + 10, 1)  # pasangan baru tiap putaran
+                    barrier.wait()
+                    tracker.flush(db)
+            except Exception as e:  # pragma: no cover - ditampilkan di assert
+                errors.append(e)
+                barrier.abort()
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in (1, 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        db = Session()
+        try:
+            counts = {
+                (row.device_low_id, row.device_high_id): row.request_count
+                for row in db.query(models.ComparisonTraffic)
+            }
+        finally:
+            db.close()
+            engine.dispose()
+        assert errors == []
+        assert counts[(1, 2)] == 3 * rounds
+        assert all(counts[(1, round_ + 10)] == 3 for round_ in range(rounds))
+
+    def test_shutdown_flushes_buffer(self, monkeypatch):
+        import asyncio
+
+        from app.main import shutdown_event
+
+        flushed = []
+        monkeypatch.setattr(
+            comparison_store.comparison_traffic, "flush", lambda: flushed.append(1)
+        )
+        asyncio.run(shutdown_event())
+
+        assert flushed == [1]
+
+
+class TestPrecompute:
+    """Batch job mengisi storage, /compare/ai membaca dari storage"""
+
+    def test_precomputes_top_and_new_pairs_with_bounded_concurrency(
+        self, db_session, phones, fake_ai
+    ):
+        a, b, c, d = phones
+        comparison_crud.add_comparison_counts(db_session, {(a.id, d.id): 5})
+
+        summary = comparison_store.precompute_analyses(
+            db_session, top_n=10, new_devices=10, rivals=1, concurrency=2
+        )
+
+        # (a, d) dari traffic + setiap device vs rival harga terdekat
+        assert summary == {"candidates": 3, "fresh": 0, "generated": 3, "failed": 0}
+        assert fake_ai["max_active"] <= 2
+
+        stored = comparison_store.get_stored_analysis(db_session, d, a)
+        assert stored["ai_source"] == "stored"
+        assert "**Value for Money:** Pilih yang lebih murah." in stored["ai_analysis"]
+        assert comparison_store.get_stored_analysis(db_session, b, a)
+        assert comparison_store.get_stored_analysis(db_session, c, d)
+
+        # Run kedua: semua masih up to date, AI tidak dipanggil lagi
+        again = comparison_store.precompute_analyses(
+            db_session, top_n=10, new_devices=10, rivals=1
+        )
+        assert again["generated"] == 0
+        assert fake_ai["calls"] == 3
+
+    def test_stale_analysis_is_ignored(self, db_session, phones, fake_ai):
+        a, b, _, _ = phones
+        comparison_crud.add_comparison_counts(db_session, {(a.id, b.id): 1})
+        comparison_store.precompute_analyses(
+            db_session, top_n=1, new_devices=0, rivals=0
+        )
+
+        a.price = 2_500_000
+        db_session.commit()
+
+        assert comparison_store.get_stored_analysis(db_session, a, b) is None
@@ -0,0 +1,140 @@
+"""
+Tests untuk kompresi response (CompressionMiddleware + page cache)
+"""
+
+import gzip
+import zlib
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app import models
+from app.core.compression import CompressionMiddleware
+from app.core.deps import get_read_db
+from app.services.page_cache import PageCache
+from tests.test_device_async import make_phone
+
+ROWS = [{"id": i, "name": f"Phone {i}", "brand": "Samsung"} for i in range(200)]
+
+
+def make_client():
+    async def big(request):
+        return JSONResponse(ROWS, headers={"ETag": '"v1"'})
+
+    async def small(request):
+        return JSONResponse({"id": 1})
+
+    async def image(request):
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    async def stream(request):
+        def chunks():
+            for i in range(50):
+                yield f"{i},Phone {i},Samsung\n" * 20
+
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    app = Starlette(
+        routes=[
+            Route("/big", big),
+            Route("/small", small),
+            Route("/image", image),
+            Route("/stream", stream),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+class TestCompressionMiddleware:
+    """gzip sesuai Accept-Encoding, body kecil & gambar dilewati"""
+
+    def test_compresses_large_bodies_only(self):
+        client = make_client()
+
+        big = client.get("/big", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/big", headers={"Accept-Encoding": "identity"})
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+
+        assert big.headers["content-encoding"] == "gzip"
+        assert big.headers["vary"] == "Accept-Encoding"
+        assert big.headers["etag"] == 'W/"v1"'
+        assert int(big.headers["content-length"]) < len(plain.content) / 4
+        assert big.json() == plain.json() == ROWS
+        assert "content-encoding" not in plain.headers
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in image.headers
+
+    def test_streaming_is_compressed_per_chunk(self):
+        client = make_client()
+
+        with client.stream(
+            "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw_chunks = list(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        # Setiap chunk di-flush: bisa di-dekompres sebelum stream selesai
+        decoder = zlib.decompressobj(31)
+        first = decoder.decompress(raw_chunks[0])
+        assert first.startswith(b"0,Phone 0,Samsung\n")
+        body = first + b"".join(decoder.decompress(c) for c in raw_chunks[1:])
+        assert body.decode().count("\n") == 50 * 20
+
+    def test_export_streams_csv(self, db_session, monkeypatch):
+        from app.main import app
+        from app.routers.admin import devices as admin_devices
+
+        # Batch kecil supaya export terkirim dalam beberapa chunk
+        monkeypatch.setattr(admin_devices, "EXPORT_BATCH_SIZE", 10)
+
+        category = models.Category(name="Smartphone")
+        db_session.add(category)
+        db_session.flush()
+        db_session.add_all(make_phone(category.id, name=f"P{i}") for i in range(25))
+        db_session.commit()
+
+        app.dependency_overrides[get_read_db] = lambda: db_session
+        try:
+            response = TestClient(app).get(
+                "/admin/devices/export", headers={"Accept-Encoding": "gzip"}
+            )
+        finally:
+            app.dependency_overrides.pop(get_read_db, None)
+
+        lines = response.text.splitlines()
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(lines) == 26
+        assert lines[1].startswith("1,P0,Samsung,Smartphone,")
+
+
+class TestPageCacheEncoded:
+    """Versi terkompres halaman di-cache & dihitung dalam batas bytes"""
+
+    def test_encoded_variant_is_reused(self, monkeypatch):
+        from app.core import compression
+
+        calls = []
+        original = compression.compress
+
+        def counting(body, encoding, best=False):
+            calls.append(encoding)
+            return original(body, encoding, best)
+
+        monkeypatch.setattr(compression, "compress", counting)
+        cache = PageCache(max_bytes=100_000, ttl=60)
+        html = b"<li>Phone</li>" * 1000
+        cache.put("devices", html)
+
+        first = cache.get_encoded("devices", "gzip")
+        second = cache.get_encoded("devices", "gzip")
+
+        assert first is second
+        assert gzip.decompress(first) == html
+        assert calls == ["gzip"]
+        assert cache.size_bytes == len(html) + len(first)
+        assert cache.get_encoded("missing", "gzip") is None
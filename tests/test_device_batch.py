@@ -0,0 +1,73 @@
+"""
+Tests untuk /devices/batch (banyak device dalam 1 request)
+"""
+
+import asyncio
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import models
+from app.core.deps import get_async_read_db
+from app.database import Base, to_async_url
+from tests.test_device_async import make_phone
+
+
+def run_batch_requests(tmp_path, requests):
+    """Jalankan request ke app dengan database SQLite sementara"""
+    from app.main import app
+
+    async def scenario():
+        engine = create_async_engine(to_async_url(f"sqlite:///{tmp_path / 'b.db'}"))
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with Session() as db:
+            category = models.Category(name="Smartphone")
+            db.add(category)
+            await db.flush()
+            db.add_all([make_phone(category.id, name=f"Phone {i}") for i in range(5)])
+            await db.commit()
+
+        async def override():
+            async with Session() as db:
+                yield db
+
+        app.dependency_overrides[get_async_read_db] = override
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                return [
+                    await client.request(method, url, **options)
+                    for method, url, options in requests
+                ]
+        finally:
+            app.dependency_overrides.pop(get_async_read_db, None)
+            await engine.dispose()
+
+    return asyncio.run(scenario())
+
+
+class TestDeviceBatch:
+    """Urutan request dipertahankan dan ID yang tidak ada dilaporkan"""
+
+    def test_get_and_post_batch(self, tmp_path):
+        get, post, too_many, bad = run_batch_requests(
+            tmp_path,
+            [
+                ("GET", "/devices/batch?ids=3,99,1,3", {}),
+                ("POST", "/devices/batch", {"json": {"ids": [5, 2]}}),
+                ("GET", "/devices/batch?ids=" + ",".join(map(str, range(1, 400))), {}),
+                ("GET", "/devices/batch?ids=1,abc", {}),
+            ],
+        )
+
+        assert get.status_code == 200
+        assert [d["id"] for d in get.json()["devices"]] == [3, 1]
+        assert get.json()["missing"] == [99]
+        assert get.json()["devices"][0]["category"]["name"] == "Smartphone"
+        assert [d["name"] for d in post.json()["devices"]] == ["Phone 4", "Phone 1"]
+        assert too_many.status_code == 400
+        assert bad.status_code == 400
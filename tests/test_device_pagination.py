@@ -0,0 +1,105 @@
+"""
+Tests untuk pagination cursor (keyset) di /devices/
+"""
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from app import models
+from app.core.responses import dumps
+from app.crud import device as device_crud
+from app.utils.cursor import decode_cursor, encode_cursor
+
+
+def crawl(db_session, sort, limit, search=None):
+    """Baca semua halaman sampai habis, seperti client yang mengikuti cursor"""
+    seen, after = [], None
+    while True:
+        devices, has_more = device_crud.get_devices_page(
+            db_session, sort=sort, after=after, limit=limit, search=search
+        )
+        seen += devices
+        if not has_more:
+            return seen
+        after = device_crud.page_position(devices[-1], sort)
+
+
+class TestDevicePagination:
+    """Semua device terbaca tepat 1 kali, urut (kolom sort, id), NULL di akhir"""
+
+    @pytest.fixture
+    def phones(self, db_session):
+        rng = random.Random(1)
+        phones = [
+            models.Phone(
+                name=f"Phone {i}",
+                brand=rng.choice(["Samsung", "Apple"]),
+                # Banyak nilai kembar + NULL untuk menguji tie-break id
+                price=rng.choice([None, 2_000_000, 3_500_000.5, 9_999_999]),
+                release_year=rng.choice([None, 2022, 2023, 2024]),
+            )
+            for i in range(57)
+        ]
+        db_session.add_all(phones)
+        db_session.commit()
+        return phones
+
+    @pytest.mark.parametrize("sort", ["id", "price", "release_year"])
+    def test_crawl_matches_full_sort(self, db_session, phones, sort):
+        def key(phone):
+            value = getattr(phone, sort)
+            return (value is None, value or 0, phone.id)
+
+        for limit in (1, 10, 57, 100):
+            assert [p.id for p in crawl(db_session, sort, limit)] == [
+                p.id for p in sorted(phones, key=key)
+            ]
+
+        samsung = [p for p in sorted(phones, key=key) if p.brand == "Samsung"]
+        assert [p.id for p in crawl(db_session, sort, 7, search="samsung")] == [
+            p.id for p in samsung
+        ]
+
+    def test_insert_between_pages_does_not_repeat(self, db_session, phones):
+        first, _ = device_crud.get_devices_page(db_session, sort="price", limit=20)
+        # Device baru yang lebih murah dari posisi cursor tidak menggeser halaman
+        db_session.add(models.Phone(name="Murah", price=1_000_000))
+        db_session.commit()
+
+        rest, _ = device_crud.get_devices_page(
+            db_session,
+            sort="price",
+            after=device_crud.page_position(first[-1], "price"),
+            limit=100,
+        )
+        assert not {p.id for p in first} & {p.id for p in rest}
+        assert len(first) + len(rest) == len(phones)
+
+    def test_fields_select_only_requested_columns(
+        self, db_session, phones, assert_max_queries
+    ):
+        with assert_max_queries(2) as queries:
+            rows, _ = device_crud.get_devices_page(
+                db_session, sort="price", limit=5, fields=["id", "name", "price"]
+            )
+
+        assert "description" not in " ".join(queries)
+        assert [tuple(row) for row in rows] == [
+            (p.id, p.name, p.price)
+            for p in device_crud.get_devices_page(db_session, sort="price", limit=5)[0]
+        ]
+        # Decimal ditulis sebagai string, sama seperti response Pydantic
+        assert dumps([dict(zip(["id", "price"], (1, Decimal("2000000.00"))))]) == (
+            b'[{"id":1,"price":"2000000.00"}]'
+        )
+
+    def test_cursor_round_trip(self):
+        token = encode_cursor(
+            {"sort": "price", "value": Decimal("3500000.50"), "id": 9}
+        )
+
+        assert decode_cursor(token) == {"sort": "price", "value": "3500000.50", "id": 9}
+        with pytest.raises(ValueError):
+            decode_cursor("bukan-cursor!")
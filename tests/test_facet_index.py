@@ -0,0 +1,141 @@
+"""
+Tests untuk filter halaman /devices (bitmap facet index)
+"""
+
+import random
+
+from app import models
+from app.services.facet_index import FACETS, FacetIndex, memory_tier
+
+# Nilai mentah yang beragam (huruf besar/kecil, kosong) untuk setiap facet
+FACET_SPECS = {
+    "brand": ["Samsung", "samsung", "Apple", "Xiaomi", None],
+    "ram": ["3GB", "4GB", "8GB", "10GB", "16GB", None],
+    "storage": ["64GB", "128GB", "256GB", "1TB", None],
+    "camera": None,
+    "battery": None,
+    "screen": None,
+    "price": lambda rng: rng.choice(
+        [None, rng.randrange(1_000_000, 30_000_000, 250_000)]
+    ),
+    "release_year": lambda rng: rng.randint(2021, 2024),
+}
+
+
+def brute_force(index, phones, filters, min_price=None, max_price=None):
+    """Baseline: cek setiap device satu per satu"""
+    entries = {p.id: index.entry_for(p) for p in phones}
+
+    def matches(device_id, skip=None):
+        values, _, price = entries[device_id]
+        for facet, value in filters.items():
+            if facet != skip and value is not None and values[facet] != value:
+                return False
+        if skip != "price" and (min_price is not None or max_price is not None):
+            if price is None:
+                return False
+            if min_price is not None and price < min_price:
+                return False
+            if max_price is not None and price > max_price:
+                return False
+        return True
+
+    ids = [p.id for p in phones if matches(p.id)]
+    counts = {}
+    for facet in FACETS:
+        counts[facet] = {}
+        for device_id, (values, _, _) in entries.items():
+            if values[facet] is not None and matches(device_id, skip=facet):
+                counts[facet][values[facet]] = counts[facet].get(values[facet], 0) + 1
+    return ids, counts
+
+
+class TestFacetIndex:
+    """Hasil bitmap sama dengan filter satu per satu"""
+
+    def test_memory_tier(self):
+        assert memory_tier("10GB", (4, 6, 8, 12, 16)) == "8GB"
+        assert memory_tier("24GB", (4, 6, 8, 12, 16)) == "16GB"
+        assert memory_tier("1TB", (64, 128, 256, 512, 1024)) == "1TB"
+        assert memory_tier("2GB", (4, 6, 8, 12, 16)) is None
+
+    def test_search_matches_brute_force_after_updates(self, random_phone):
+        rng = random.Random(5)
+        phones = [random_phone(rng, i, **FACET_SPECS) for i in range(1, 401)]
+        index = FacetIndex()
+        index.rebuild(phones[:300])
+
+        changes = {p.id: index.entry_for(p) for p in phones[300:]}
+        for phone in phones[:20]:
+            phone.brand = "Apple"
+            phone.price = 4_000_000
+            changes[phone.id] = index.entry_for(phone)
+        for phone in phones[20:50]:
+            changes[phone.id] = None
+        index.apply(changes)
+        # Device yang diubah mendapat slot baru di akhir
+        alive = phones[50:] + phones[:20]
+
+        cases = [
+            ({}, None, None),
+            ({"brand": "samsung"}, None, None),
+            ({"category": 1, "ram": "8GB"}, None, 10_000_000),
+            ({"storage": "1TB", "year": 2023}, 3_000_000, None),
+            ({"brand": "apple"}, 4_000_000, 4_000_000),
+            ({"category": 2}, 0, 50_000_000),
+        ]
+        for filters, min_price, max_price in cases:
+            result = index.search(filters, min_price, max_price, limit=25)
+            ids, counts = brute_force(index, alive, filters, min_price, max_price)
+            assert result["ids"] == ids[:25]
+            assert result["total"] == len(ids)
+            assert result["counts"] == counts
+
+    def test_brand_options_use_original_label(self):
+        index = FacetIndex()
+        index.rebuild(
+            [
+                models.Phone(id=1, name="A", brand="Samsung", ram="8GB"),
+                models.Phone(id=2, name="B", brand="samsung ", ram="12GB"),
+                models.Phone(id=3, name="C", brand="Apple", ram="8GB"),
+            ]
+        )
+
+        result = index.search({"brand": "samsung"})
+        options = index.options(result["counts"])
+
+        assert result["ids"] == [1, 2]
+        assert options["brand"] == [
+            {"value": "Apple", "count": 1},
+            {"value": "Samsung", "count": 2},
+        ]
+        assert {"value": "8GB", "count": 1} in options["ram"]
+        assert {"value": "6GB", "count": 0} in options["ram"]
+
+
+class TestColdStart:
+    """Index belum dibangun: 503 + Retry-After, bukan rebuild di request"""
+
+    def test_pages_and_api_answer_503(self, monkeypatch):
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+        from app.routers import frontend
+        from app.services import recommendation_service
+        from app.services.value_frontier import ValueFrontierIndex
+
+        facets, frontier = FacetIndex(), ValueFrontierIndex()
+        for index in (facets, frontier):
+            monkeypatch.setattr(index, "ensure_fresh", lambda: None)
+        monkeypatch.setattr(frontend, "facet_index", facets)
+        monkeypatch.setattr(recommendation_service, "value_frontier", frontier)
+        client = TestClient(app)
+
+        page = client.get("/devices")
+        api = client.get("/recommendation/best-value")
+
+        assert page.status_code == 503
+        assert page.headers["retry-after"] == "5"
+        assert 'http-equiv="refresh"' in page.text
+        assert api.status_code == 503
+        assert api.headers["retry-after"] == "5"
@@ -0,0 +1,61 @@
+"""
+Tests untuk rule engine highlight (dipakai /compare/ dan /compare-page)
+"""
+
+from app import models
+from app.services import comparison_service
+from app.services.comparison_rules import highlight_engine
+
+
+def make_phone(id, **specs):
+    return models.Phone(id=id, name=f"Phone {id}", brand="Brand", **specs)
+
+
+class TestHighlightEngine:
+    """Semua atribut dievaluasi dari rule yang sama"""
+
+    def test_generate_highlights_covers_all_rules(self):
+        phone1 = make_phone(
+            1,
+            price=3_000_000,
+            release_year=2023,
+            ram="8GB",
+            storage="1TB",
+            camera="50MP + 12MP",
+            battery="5000 mAh",
+            screen='6.7" AMOLED',
+        )
+        phone2 = make_phone(
+            2,
+            price=4_500_000,
+            release_year=2024,
+            ram="12GB",
+            storage="256GB",
+            camera="108MP",
+            battery="5000 mAh",
+            screen="6.1 inch",
+        )
+
+        assert comparison_service.generate_highlights(phone1, phone2) == [
+            "Phone 1 lebih murah Rp 1,500,000",
+            "Phone 2 lebih baru (Rilis 2024)",
+            "Phone 2 lebih besar (12GB vs 8GB)",
+            "Phone 1 lebih besar (1TB vs 256GB)",
+            "Phone 2 lebih tinggi (108MP vs 50MP)",
+            'Phone 1 lebih besar (6.7" vs 6.1")',
+        ]
+
+    def test_unparseable_specs_are_skipped(self):
+        phone1 = make_phone(1, ram="unknown", camera="50MP")
+        phone2 = make_phone(2, ram="8GB", camera="48MP")
+
+        highlights = highlight_engine.evaluate(
+            phone1,
+            phone2,
+            highlight_engine.parse(phone1),
+            highlight_engine.parse(phone2),
+        )
+
+        assert [(h["key"], h["icon"], h["winner_id"]) for h in highlights] == [
+            ("camera", "fa-camera", 1)
+        ]
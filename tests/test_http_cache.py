@@ -0,0 +1,163 @@
+"""
+Tests untuk HTTP conditional GET (ETag / Last-Modified)
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+from app import models
+from app.core import http_cache
+from app.core.deps import get_async_read_db
+from app.core.http_cache import device_validators, is_fresh
+from app.database import Base, to_async_url
+from tests.test_device_async import make_phone
+
+
+class TestPhoneRevision:
+    """revision & updated_at berubah di setiap jalur tulis"""
+
+    def test_orm_and_bulk_update_bump_revision(self, db_session):
+        category = models.Category(name="Smartphone")
+        db_session.add(category)
+        db_session.flush()
+        phone = make_phone(category.id)
+        db_session.add(phone)
+        db_session.commit()
+        assert phone.revision == 1
+        assert phone.updated_at is not None
+
+        phone.price = 11_000_000
+        db_session.commit()
+        assert phone.revision == 2
+
+        # Jalur admin bulk update (query.update tanpa flush)
+        db_session.query(models.Phone).filter(models.Phone.id == phone.id).update(
+            {"category_id": category.id}, synchronize_session=False
+        )
+        db_session.commit()
+        db_session.refresh(phone)
+        assert phone.revision == 3
+
+
+class TestConditionalGet:
+    """304 jika ETag masih cocok, 200 + ETag baru setelah device berubah"""
+
+    def test_device_api_etag(self, tmp_path):
+        from app.main import app
+
+        async def scenario():
+            engine = create_async_engine(to_async_url(f"sqlite:///{tmp_path / 'c.db'}"))
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            Session = async_sessionmaker(engine, expire_on_commit=False)
+            async with Session() as db:
+                category = models.Category(name="Smartphone")
+                db.add(category)
+                await db.flush()
+                phone = make_phone(category.id)
+                db.add(phone)
+                await db.commit()
+
+            async def override():
+                async with Session() as db:
+                    yield db
+
+            app.dependency_overrides[get_async_read_db] = override
+            try:
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(
+                    transport=transport, base_url="http://test"
+                ) as client:
+                    first = await client.get(f"/devices/{phone.id}")
+                    etag = first.headers["etag"]
+                    cached = await client.get(
+                        f"/devices/{phone.id}", headers={"If-None-Match": etag}
+                    )
+                    weak = await client.get(
+                        f"/devices/{phone.id}",
+                        headers={"If-None-Match": f'"other", W/{etag}'},
+                    )
+                    since = await client.get(
+                        f"/devices/{phone.id}",
+                        headers={"If-Modified-Since": first.headers["last-modified"]},
+                    )
+
+                    async with Session() as db:
+                        stored = await db.get(models.Phone, phone.id)
+                        stored.price = 9_000_000
+                        await db.commit()
+                    changed = await client.get(
+                        f"/devices/{phone.id}", headers={"If-None-Match": etag}
+                    )
+                    return first, cached, weak, since, changed
+            finally:
+                app.dependency_overrides.pop(get_async_read_db, None)
+                await engine.dispose()
+
+        first, cached, weak, since, changed = asyncio.run(scenario())
+
+        assert first.status_code == 200
+        assert "s-maxage" in first.headers["cache-control"]
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == first.headers["etag"]
+        assert weak.status_code == 304
+        assert since.status_code == 304
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != first.headers["etag"]
+        assert changed.json()["price"] == "9000000.00"
+
+
+def make_request(**headers):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "query_string": b"",
+            "headers": [
+                (k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()
+            ],
+        }
+    )
+
+
+class TestIfModifiedSinceOnly:
+    """Revalidasi hanya dengan If-Modified-Since tidak boleh 304 untuk isi basi"""
+
+    def test_derived_data_change_is_not_304(self):
+        phone = models.Phone(id=1, revision=1, updated_at=datetime(2026, 1, 1))
+        before = device_validators(
+            "device-page", [phone], ["Top 10% kamera"], cache_control=""
+        )
+        after = device_validators(
+            "device-page", [phone], ["Top 25% kamera"], cache_control=""
+        )
+        # Status enrichment /compare/ "pending" -> selesai: updated_at tetap
+        pending = device_validators(
+            "compare-api", [phone], None, "pending", cache_control=""
+        )
+
+        assert before.last_modified is None and pending.last_modified is None
+        assert "Last-Modified" not in before.headers()
+        since = make_request(if_modified_since="Fri, 01 Jan 2100 00:00:00 GMT")
+        assert not is_fresh(since, after)
+        assert not is_fresh(make_request(if_none_match=before.etag), after)
+
+    def test_deploy_moves_last_modified(self, monkeypatch):
+        phone = models.Phone(id=1, revision=1, updated_at=datetime(2020, 1, 1))
+        old = device_validators("device-api", [phone], cache_control="")
+        header = old.headers()["Last-Modified"]
+        assert is_fresh(make_request(if_modified_since=header), old)
+
+        monkeypatch.setattr(
+            http_cache, "_build_time", datetime(2030, 1, 1, tzinfo=timezone.utc)
+        )
+        new = device_validators("device-api", [phone], cache_control="")
+
+        assert new.last_modified == datetime(2030, 1, 1, tzinfo=timezone.utc)
+        assert not is_fresh(make_request(if_modified_since=header), new)
@@ -0,0 +1,101 @@
+"""
+Tests untuk migrasi schema bernomor versi (app/core/migrations.py)
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.core import migrations
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/migrate.db")
+    yield engine
+    engine.dispose()
+
+
+def quiet(message):
+    pass
+
+
+class TestMigrations:
+    """upgrade menjalankan migrasi yang belum, sekali saja, urut versi"""
+
+    def test_upgrade_fresh_database(self, engine):
+        versions = [m.version for m in migrations.discover()]
+
+        assert migrations.upgrade(engine, log=quiet) == versions
+        assert migrations.upgrade(engine, log=quiet) == []
+        assert migrations.applied_versions(engine) == set(versions)
+        assert migrations.pending(engine) == []
+        assert {"phones", "categories", "users"} <= set(
+            inspect(engine).get_table_names()
+        )
+
+    def test_upgrade_legacy_database(self, engine):
+        # Database lama: tabel phones sebelum kolom revision & index pagination
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE phones (id INTEGER PRIMARY KEY, name VARCHAR(100), "
+                    "price NUMERIC(12, 2), release_year INTEGER)"
+                )
+            )
+            connection.execute(text("INSERT INTO phones (id, name) VALUES (1, 'Lama')"))
+
+        migrations.upgrade(engine, log=quiet)
+
+        columns = {c["name"] for c in inspect(engine).get_columns("phones")}
+        indexes = {i["name"] for i in inspect(engine).get_indexes("phones")}
+        assert {"updated_at", "revision"} <= columns
+        assert {"ix_phones_price_id", "ix_phones_release_year_id"} <= indexes
+        with engine.connect() as connection:
+            assert connection.scalar(text("SELECT revision FROM phones")) == 1
+
+    def test_migrated_schema_matches_models(self, engine):
+        from app.models import Base
+
+        migrations.upgrade(engine, log=quiet)
+
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            assert columns == {c.name for c in table.columns}, table.name
+            assert {i.name for i in table.indexes} <= indexes, table.name
+
+    def test_initial_schema_is_frozen(self, engine):
+        # 0001 tidak ikut berubah saat model berubah; kolom baru lewat 0003
+        migrations.upgrade(engine, target="0001", log=quiet)
+
+        columns = {c["name"] for c in inspect(engine).get_columns("phones")}
+        assert "revision" not in columns
+
+    def test_target_and_stamp(self, engine):
+        assert migrations.upgrade(engine, target="0001", log=quiet) == ["0001"]
+        assert migrations.stamp(engine, "0002") == ["0002"]
+        assert [m.version for m in migrations.pending(engine)] == ["0003"]
+        with pytest.raises(ValueError):
+            migrations.stamp(engine, "9999")
+
+
+class TestStartupHasNoDDL:
+    """Import app.main tidak membuat tabel / menyentuh database"""
+
+    def test_import_does_not_create_tables(self, tmp_path):
+        database = tmp_path / "untouched.db"
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+
+        subprocess.run(
+            [sys.executable, "-c", "import app.main"], cwd=ROOT, env=env, check=True
+        )
+
+        assert not database.exists()
@@ -0,0 +1,127 @@
+"""
+Tests untuk enrichment n8n di background (compare tidak menunggu n8n)
+"""
+
+import threading
+import time
+
+import pytest
+
+from app import models
+from app.core import config
+from app.services import background, comparison_service, n8n_service
+
+N8N_RESPONSE = {
+    "ai_highlights": [
+        {"category": "Performa", "winner": "Galaxy S24", "reason": "Chip lebih baru"}
+    ],
+    "ai_summary": "Galaxy S24 unggul di performa.",
+    "scores": {"Galaxy S24": 8.5, "iPhone 15": 8.0},
+}
+
+
+@pytest.fixture
+def devices(db_session):
+    category = models.Category(name="Smartphone")
+    db_session.add(category)
+    db_session.flush()
+    phones = [
+        models.Phone(
+            name=name,
+            brand=brand,
+            category_id=category.id,
+            price=price,
+            release_year=year,
+        )
+        for name, brand, price, year in (
+            ("Galaxy S24", "Samsung", 12_000_000, 2024),
+            ("iPhone 15", "Apple", 14_000_000, 2023),
+        )
+    ]
+    db_session.add_all(phones)
+    db_session.commit()
+    return phones
+
+
+@pytest.fixture
+def n8n(monkeypatch):
+    """n8n aktif dengan webhook palsu yang bisa ditahan (simulasi n8n lambat)"""
+    monkeypatch.setattr(config, "N8N_ENABLED", True)
+    monkeypatch.setattr(config, "N8N_WEBHOOK_URL", "http://n8n.test/webhook")
+    n8n_service.enrichment_cache.clear()
+
+    state = {"calls": 0, "release": threading.Event(), "response": N8N_RESPONSE}
+
+    def fake_post(payload):
+        state["calls"] += 1
+        state["release"].wait(timeout=5)
+        return state["response"]
+
+    monkeypatch.setattr(n8n_service, "post_to_n8n", fake_post)
+    yield state
+    state["release"].set()
+    background.wait_all(timeout=5)
+    n8n_service.enrichment_cache.clear()
+
+
+class TestBackgroundEnrichment:
+    """Rule-based langsung, versi n8n di request berikutnya"""
+
+    def test_slow_n8n_does_not_block_compare(self, db_session, devices, n8n):
+        phone1, phone2 = devices
+
+        started = time.perf_counter()
+        first = comparison_service.compare_two_devices(db_session, phone1.id, phone2.id)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1
+        assert first["source"] == "rule_based"
+        assert first["enrichment"] == "pending"
+        assert first["enriched_at"] is None
+        assert "Galaxy S24 lebih murah" in first["highlights"][0]["reason"]
+
+        # Request lain selagi n8n masih berjalan tidak memicu panggilan baru
+        comparison_service.compare_two_devices(db_session, phone1.id, phone2.id)
+
+        n8n["release"].set()
+        background.wait_all(timeout=5)
+
+        enriched = comparison_service.compare_two_devices(
+            db_session, phone1.id, phone2.id
+        )
+        assert n8n["calls"] == 1
+        assert enriched["source"] == "n8n_ai"
+        assert enriched["enrichment"] == "ready"
+        assert enriched["enriched_at"]
+        assert enriched["highlights"] == N8N_RESPONSE["ai_highlights"]
+
+    def test_failed_enrichment_is_not_retried_immediately(
+        self, db_session, devices, n8n
+    ):
+        phone1, phone2 = devices
+        n8n["response"] = None
+        n8n["release"].set()
+
+        comparison_service.compare_two_devices(db_session, phone1.id, phone2.id)
+        background.wait_all(timeout=5)
+        result = comparison_service.compare_two_devices(
+            db_session, phone1.id, phone2.id
+        )
+
+        assert result["source"] == "rule_based"
+        assert result["enrichment"] == "failed"
+        assert n8n["calls"] == 1
+
+    def test_price_change_uses_new_cache_entry(self, db_session, devices, n8n):
+        phone1, phone2 = devices
+        n8n["release"].set()
+        comparison_service.compare_two_devices(db_session, phone1.id, phone2.id)
+        background.wait_all(timeout=5)
+
+        phone1.price = 10_000_000
+        db_session.commit()
+        result = comparison_service.compare_two_devices(
+            db_session, phone1.id, phone2.id
+        )
+
+        assert result["enrichment"] == "pending"
@@ -0,0 +1,96 @@
+"""
+Tests untuk cache HTML halaman publik (PageCache)
+"""
+
+import jinja2
+from starlette.requests import Request
+
+from app.services.page_cache import CachedJinja2Templates, PageCache
+
+
+def make_request(host="test"):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "server": (host, 80),
+            "path": "/",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", host.encode())],
+        }
+    )
+
+
+class TestPageCache:
+    """LRU dibatasi bytes, invalidasi per device dan per katalog"""
+
+    def test_lru_bounded_by_bytes(self):
+        cache = PageCache(max_bytes=10, ttl=60)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        assert cache.get("a") == b"aaaa"  # "a" jadi paling baru dipakai
+        cache.put("c", b"cccc")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"aaaa"
+        assert cache.size_bytes == 8
+        cache.put("huge", b"x" * 11)
+        assert cache.get("huge") is None
+
+    def test_catalog_change_invalidates_related_pages(self):
+        cache = PageCache(max_bytes=1000, ttl=60)
+        cache.put(("device", 1), b"<p>1</p>", device_ids=[1])
+        cache.put(("compare", 2, 3), b"<p>2 vs 3</p>", device_ids=[2, 3])
+        old_version = cache.version
+        cache.put(("devices", old_version), b"<ul></ul>", catalog_wide=True)
+
+        cache.apply({3: None})
+
+        assert cache.get(("device", 1)) == b"<p>1</p>"
+        assert cache.get(("compare", 2, 3)) is None
+        assert cache.get(("devices", old_version)) is None
+        assert cache.version == old_version + 1
+
+        cache.mark_stale()
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
+
+    def test_catalog_pages_expire(self):
+        now = [0.0]
+        cache = PageCache(max_bytes=1000, ttl=60, clock=lambda: now[0])
+        cache.put("home", b"<h1></h1>", catalog_wide=True)
+        cache.put("device", b"<p></p>", device_ids=[1])
+
+        now[0] = 61
+        assert cache.get("home") is None
+        assert cache.get("device") == b"<p></p>"
+
+
+class TestCachedTemplates:
+    """Halaman di-render 1 kali sampai katalog berubah"""
+
+    def test_render_then_hit(self, tmp_path):
+        (tmp_path / "page.html").write_text("{{ request.base_url }}|{{ value }}")
+        templates = CachedJinja2Templates(
+            env=jinja2.Environment(loader=jinja2.FileSystemLoader(str(tmp_path))),
+            cache=PageCache(max_bytes=1000, ttl=60),
+        )
+        request = make_request()
+
+        key = templates.page_key(request, "page.html", "q", catalog_wide=True)
+        assert templates.cached_page(request, key) is None
+        rendered = templates.render_page(
+            key, "page.html", {"request": request, "value": 1}
+        )
+        hit = templates.cached_page(request, key, headers={"ETag": '"x"'})
+
+        assert rendered.body == b"http://test/|1"
+        assert hit.body == rendered.body
+        assert hit.headers["etag"] == '"x"'
+        # Host lain = URL absolut lain
+        assert templates.page_key(make_request("other"), "page.html", "q") != key
+
+        templates.cache.apply({1: None})
+        assert templates.page_key(request, "page.html", "q", catalog_wide=True) != key
@@ -0,0 +1,134 @@
+"""
+Tests untuk percentile index (badge "Top X% di kategori")
+"""
+
+from app import models
+from app.core import config
+from app.services.percentile_index import PercentileIndex, percentile_index
+
+
+def make_phone(id, battery, price, category_id=1):
+    return models.Phone(
+        id=id,
+        name=f"Phone {id}",
+        brand="Brand",
+        category_id=category_id,
+        battery=f"{battery} mAh",
+        price=price,
+    )
+
+
+class TestPercentileIndex:
+    """Rank per kategori dan price band, update incremental"""
+
+    def test_rank_and_badges_per_scope(self):
+        index = PercentileIndex(bands=[5_000_000], badge_top_percent=25, min_devices=3)
+        phones = [make_phone(i, 4000 + i * 100, 1_000_000 * i) for i in range(1, 11)]
+        phones.append(make_phone(99, 9000, 1_000_000, category_id=2))
+        index.rebuild(phones)
+
+        # Baterai terbesar ke-2 dari 10 di kategori 1 (kategori 2 tidak dihitung)
+        assert index.rank(9, "battery", "category") == {
+            "rank": 2,
+            "total": 10,
+            "top_percent": 20,
+        }
+        # Di rentang harga > Rp 5 jt (device 5-10): rank 2 dari 6
+        assert index.rank(9, "battery", "price_band")["top_percent"] == 34
+
+        # Harga: lebih murah = lebih baik
+        assert index.rank(1, "price", "category")["rank"] == 1
+
+        badges = {badge["key"]: badge for badge in index.badges(phones[3])}
+        assert badges["battery"]["scope"] == "price_band"
+        assert badges["battery"]["text"] == "Baterai: Top 25% di rentang < Rp 5 jt"
+        assert "price" not in badges
+
+    def test_catalog_changes_update_index_on_commit(self, db_session, monkeypatch):
+        rebuilds = []
+        monkeypatch.setattr(
+            percentile_index, "ensure_fresh", lambda: rebuilds.append(1)
+        )
+        percentile_index.rebuild([])
+        category = models.Category(name="Smartphone")
+        db_session.add(category)
+        db_session.flush()
+        phones = [
+            models.Phone(name=f"Phone {i}", category_id=category.id, ram=f"{i}GB")
+            for i in (4, 8, 12)
+        ]
+        db_session.add_all(phones)
+        db_session.commit()
+        assert percentile_index.rank(phones[0].id, "ram")["rank"] == 3
+
+        phones[0].ram = "16GB"
+        db_session.commit()
+        assert percentile_index.rank(phones[0].id, "ram")["rank"] == 1
+
+        # Rollback tidak mengubah index
+        phones[1].ram = "32GB"
+        db_session.flush()
+        db_session.rollback()
+        assert percentile_index.rank(phones[1].id, "ram")["rank"] == 3
+
+        db_session.delete(phones[2])
+        db_session.commit()
+        assert percentile_index.rank(phones[0].id, "ram")["total"] == 2
+        assert len(percentile_index) == 2
+
+        # Perubahan massal -> index ditandai basi, rebuild di background
+        db_session.query(models.Phone).delete()
+        db_session.commit()
+        assert percentile_index.stale
+        assert rebuilds == [1]
+
+    def test_large_commit_rebuilds_instead_of_applying(self, db_session, monkeypatch):
+        rebuilds = []
+        monkeypatch.setattr(
+            percentile_index, "ensure_fresh", lambda: rebuilds.append(1)
+        )
+        monkeypatch.setattr(config, "CATALOG_INCREMENTAL_MAX_CHANGES", 3)
+        percentile_index.rebuild([])
+
+        db_session.add_all(models.Phone(name=f"Phone {i}", ram="8GB") for i in range(3))
+        db_session.commit()
+        assert len(percentile_index) == 3
+        assert rebuilds == []
+
+        # Import massal: tidak diterapkan per device di dalam commit
+        db_session.add_all(models.Phone(name=f"Baru {i}", ram="8GB") for i in range(4))
+        db_session.commit()
+        assert len(percentile_index) == 3
+        assert percentile_index.stale
+        assert rebuilds == [1]
+
+    def test_changes_during_rebuild_are_not_lost(self, db_engine, monkeypatch):
+        from sqlalchemy.orm import sessionmaker
+
+        from app import database
+
+        Session = sessionmaker(bind=db_engine)
+        monkeypatch.setattr(database, "SessionLocal", Session)
+        index = PercentileIndex()
+        rebuild = index.rebuild
+        snapshots = []
+
+        def slow_rebuild(devices):
+            devices = list(devices)
+            snapshots.append(len(devices))
+            if len(snapshots) == 1:
+                # Commit lain selesai setelah snapshot dibaca, sebelum rebuild selesai
+                db = Session()
+                phone = make_phone(None, 5000, 1_000_000)
+                db.add(phone)
+                db.commit()
+                index.apply({phone.id: index.entry_for(phone)})
+                db.close()
+            rebuild(devices)
+
+        monkeypatch.setattr(index, "rebuild", slow_rebuild)
+        index.rebuild_from_db()
+
+        assert snapshots == [0, 1]
+        assert len(index) == 1
+        assert not index.stale
@@ -0,0 +1,61 @@
+"""
+Tests untuk konfigurasi dan instrumentasi connection pool
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pool_metrics import InstrumentedQueuePool, PoolMetrics, tag_session_route
+from app.database import get_pool_options
+
+
+class TestPoolOptions:
+    """Opsi pool dari environment"""
+
+    def test_sqlite_uses_default_pool(self):
+        assert get_pool_options("sqlite:///./comparely.db") == {}
+
+    def test_server_database_gets_sized_pool(self):
+        options = get_pool_options("mysql+mysqlconnector://root:@localhost/comparely")
+
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["pool_pre_ping"] is True
+        assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle"} <= set(
+            options
+        )
+
+
+class TestPoolMetrics:
+    """Metrik wait time dan durasi checkout per route"""
+
+    def test_records_wait_and_checkout_per_route(self, tmp_path):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=2,
+            max_overflow=1,
+        )
+        metrics = PoolMetrics()
+        metrics.attach(engine)
+        Session = sessionmaker(bind=engine)
+
+        for _ in range(3):
+            session = Session()
+            tag_session_route(session, "GET /devices/")
+            session.execute(text("SELECT 1"))
+            session.close()
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert metrics.snapshot()["pool"]["checked_out"] == 1
+
+        stats = metrics.snapshot()
+        assert stats["pool"]["size"] == 2
+        assert stats["pool"]["checked_out"] == 0
+        assert stats["wait_time"]["count"] == 4
+        assert stats["checkout_duration_by_route"]["GET /devices/"]["count"] == 3
+        assert stats["checkout_duration_by_route"]["other"]["count"] == 1
+
+        metrics.reset()
+        assert metrics.snapshot()["wait_time"]["count"] == 0
+        engine.dispose()
@@ -0,0 +1,140 @@
+"""
+Tests untuk routing read ke replica (2 file SQLite: primary + replica)
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.replicas import Replica, ReplicaRouter, query_lag_probe
+from app.database import to_async_url
+
+LAG_QUERY = "SELECT lag FROM heartbeat"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_db(path, label):
+    """Buat database SQLite berisi penanda asal data + tabel heartbeat"""
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE origin (name TEXT)"))
+        conn.execute(text("INSERT INTO origin VALUES (:name)"), {"name": label})
+        conn.execute(text("CREATE TABLE heartbeat (lag REAL)"))
+        conn.execute(text("INSERT INTO heartbeat VALUES (0)"))
+    return engine
+
+
+def set_lag(engine, seconds):
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE heartbeat SET lag = :lag"), {"lag": seconds})
+
+
+def origin(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT name FROM origin")).scalar()
+
+
+@pytest.fixture
+def databases(tmp_path):
+    primary = make_db(tmp_path / "primary.db", "primary")
+    replica = make_db(tmp_path / "replica.db", "replica")
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+class TestReplicaRouter:
+    """Read ke replica, fallback ke primary saat lag / down"""
+
+    def make_router(self, primary, replicas, clock):
+        return ReplicaRouter(
+            primary=primary,
+            replicas=[Replica(engine=engine) for engine in replicas],
+            max_lag=5,
+            check_interval=10,
+            lag_probe=query_lag_probe(LAG_QUERY),
+            clock=clock,
+        )
+
+    def test_reads_go_to_replica_and_writes_stay_on_primary(self, databases):
+        primary, replica = databases
+        router = self.make_router(primary, [replica], FakeClock())
+
+        Session = sessionmaker(bind=primary)
+        read_db = Session(bind=router.read_engine())
+        assert read_db.execute(text("SELECT name FROM origin")).scalar() == "replica"
+        read_db.close()
+
+        write_db = Session()
+        write_db.execute(text("UPDATE origin SET name = 'primary-updated'"))
+        write_db.commit()
+        write_db.close()
+
+        assert origin(primary) == "primary-updated"
+        assert origin(replica) == "replica"
+        assert router.status()["replica_reads"] == 1
+
+    def test_lagging_replica_falls_back_until_it_catches_up(self, databases):
+        primary, replica = databases
+        clock = FakeClock()
+        router = self.make_router(primary, [replica], clock)
+
+        set_lag(replica, 30)
+        assert router.read_engine() is primary
+
+        # Status di-cache: lag yang sudah pulih baru terlihat setelah interval
+        set_lag(replica, 1)
+        assert router.read_engine() is primary
+        clock.now += 10
+        assert router.read_engine() is replica
+
+        status = router.status()
+        assert status["primary_fallbacks"] == 2
+        assert status["replicas"][0]["lag"] == 1
+
+    def test_unreachable_replica_is_skipped(self, databases, tmp_path):
+        primary, replica = databases
+        broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        router = self.make_router(primary, [broken, replica], FakeClock())
+
+        engines = {router.read_engine() for _ in range(4)}
+
+        assert engines == {replica}
+        assert router.status()["replicas"][0]["healthy"] is False
+        assert router.status()["replicas"][0]["error"]
+
+    def test_async_read_engine_uses_async_replica(self, databases):
+        primary, replica = databases
+        async_primary = create_async_engine(to_async_url(str(primary.url)))
+        async_replica = create_async_engine(to_async_url(str(replica.url)))
+        router = ReplicaRouter(
+            primary=primary,
+            async_primary=async_primary,
+            replicas=[Replica(engine=replica, async_engine=async_replica)],
+            max_lag=5,
+            lag_probe=query_lag_probe(LAG_QUERY),
+        )
+
+        async def scenario():
+            first = await router.async_read_engine()
+            set_lag(replica, 60)
+            router.invalidate()
+            second = await router.async_read_engine()
+            await async_primary.dispose()
+            await async_replica.dispose()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert first is async_replica
+        assert second is async_primary
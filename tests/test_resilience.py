@@ -0,0 +1,137 @@
+"""
+Tests untuk circuit breaker dan AIMD limiter (panggilan AI / n8n)
+"""
+
+import pytest
+import requests
+
+from app.services import ai, resilience
+from app.services.resilience import (
+    AIMDLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    ConcurrencyLimitError,
+    Upstream,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def failing():
+    raise requests.exceptions.ConnectionError("down")
+
+
+def make_upstream(clock, **limiter):
+    breaker = CircuitBreaker(
+        window_size=10, min_calls=4, failure_rate=0.5, open_seconds=30, clock=clock
+    )
+    return Upstream("test", breaker, AIMDLimiter(**limiter))
+
+
+class TestCircuitBreaker:
+    """Closed -> open -> half-open -> closed"""
+
+    def test_opens_after_failures_and_fails_fast(self):
+        clock = FakeClock()
+        upstream = make_upstream(clock)
+        calls = []
+
+        def down():
+            calls.append(1)
+            failing()
+
+        for _ in range(4):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                upstream.call(down)
+
+        assert upstream.breaker.state == resilience.OPEN
+        with pytest.raises(CircuitOpenError):
+            upstream.call(down)
+        assert len(calls) == 4
+
+    def test_half_open_probe_closes_on_success(self):
+        clock = FakeClock()
+        upstream = make_upstream(clock)
+        for _ in range(4):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                upstream.call(failing)
+
+        clock.now += 30
+        assert upstream.call(lambda: "ok") == "ok"
+
+        assert upstream.breaker.state == resilience.CLOSED
+        assert upstream.snapshot()["circuit"]["times_opened"] == 1
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        upstream = make_upstream(clock)
+        for _ in range(4):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                upstream.call(failing)
+
+        clock.now += 30
+        with pytest.raises(requests.exceptions.ConnectionError):
+            upstream.call(failing)
+
+        assert upstream.breaker.state == resilience.OPEN
+        with pytest.raises(CircuitOpenError):
+            upstream.call(lambda: "ok")
+
+
+class TestAIMDLimiter:
+    """Naik pelan saat sukses, turun setengah saat gagal"""
+
+    def test_additive_increase_multiplicative_decrease(self):
+        limiter = AIMDLimiter(initial_limit=4, min_limit=1, max_limit=8)
+
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release(congested=False)
+        assert limiter.snapshot()["limit"] == 4
+        assert limiter.limit > 4.9
+
+        limiter.acquire()
+        limiter.release(congested=True)
+        assert limiter.snapshot()["limit"] == 2
+
+    def test_rejects_when_limit_reached(self):
+        limiter = AIMDLimiter(initial_limit=2)
+        limiter.acquire()
+        limiter.acquire()
+
+        with pytest.raises(ConcurrencyLimitError):
+            limiter.acquire()
+        assert limiter.snapshot()["rejected"] == 1
+
+
+class TestAIFallback:
+    """AI yang down tidak lagi ditunggu sampai timeout"""
+
+    def test_open_circuit_skips_request(self, monkeypatch):
+        monkeypatch.setattr(ai, "AI_API_KEY", "test-key")
+        posts = []
+
+        def fake_post(*args, **kwargs):
+            posts.append(1)
+            raise requests.exceptions.ConnectionError("down")
+
+        monkeypatch.setattr(requests, "post", fake_post)
+        resilience.ai_upstream.reset()
+        messages = [{"role": "user", "content": "halo"}]
+
+        try:
+            for _ in range(10):
+                ai.call_ai_api(messages)
+
+            min_calls = resilience.ai_upstream.breaker.min_calls
+            assert len(posts) == min_calls
+            assert "AI sedang tidak tersedia" in ai.call_ai_api(messages)
+            assert resilience.snapshot()["ai"]["circuit"]["state"] == "open"
+        finally:
+            resilience.ai_upstream.reset()
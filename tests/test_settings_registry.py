@@ -0,0 +1,90 @@
+"""
+Tests untuk SettingsRegistry (cache app_settings dengan version stamp)
+"""
+
+from sqlalchemy import event
+
+from app.core.settings_registry import VERSION_KEY, SettingsRegistry
+from app.models import AppSettings
+
+
+class TestSettingsRegistry:
+    """Read dari cache, write dalam 1 transaksi, invalidasi antar worker"""
+
+    def test_reads_are_typed_and_served_from_cache(
+        self, db_session, assert_max_queries
+    ):
+        db_session.add_all(
+            [
+                AppSettings(key="items_per_page", value="50"),
+                AppSettings(key="maintenance_mode", value="true"),
+            ]
+        )
+        db_session.commit()
+        registry = SettingsRegistry(check_interval=60)
+
+        # Load pertama: 1 query untuk semua baris
+        with assert_max_queries(1):
+            values = registry.get_many(
+                db_session, ["items_per_page", "maintenance_mode", "date_format"]
+            )
+
+        assert values == {
+            "items_per_page": 50,
+            "maintenance_mode": True,
+            "date_format": "YYYY-MM-DD",
+        }
+
+        # Pembacaan berikutnya tidak menyentuh database
+        with assert_max_queries(0):
+            assert registry.get(db_session, "items_per_page") == 50
+            assert registry.get(db_session, "unknown_key", "x") == "x"
+
+    def test_set_many_writes_all_keys_and_bumps_version(
+        self, db_session, db_engine, assert_max_queries
+    ):
+        registry = SettingsRegistry(check_interval=60)
+        registry.get(db_session, "items_per_page")
+        commits = []
+        event.listen(db_engine, "commit", lambda conn: commits.append(1))
+
+        registry.set_many(db_session, {"items_per_page": 30, "date_format": "DD/MM"})
+
+        assert len(commits) == 1
+        assert registry.version == 1
+        with assert_max_queries(0):
+            assert registry.get(db_session, "items_per_page") == 30
+            assert registry.get(db_session, "date_format") == "DD/MM"
+
+        version_row = (
+            db_session.query(AppSettings).filter(AppSettings.key == VERSION_KEY).one()
+        )
+        assert version_row.value == "1"
+
+    def test_set_many_writes_descriptions(self, db_session):
+        db_session.add(AppSettings(key="site_name", value="Lama", description=None))
+        db_session.commit()
+        registry = SettingsRegistry(check_interval=60)
+
+        registry.set_many(
+            db_session,
+            {"site_name": "COMPARELY", "custom_key": "x", "date_format": "DD/MM"},
+            descriptions={"site_name": "Nama aplikasi", "custom_key": "Key kustom"},
+        )
+
+        rows = {row.key: row.description for row in db_session.query(AppSettings)}
+        assert rows["site_name"] == "Nama aplikasi"
+        assert rows["custom_key"] == "Key kustom"
+        # Tanpa deskripsi eksplisit: baris baru memakai deskripsi dari SETTINGS
+        assert rows["date_format"] == "Date format for display"
+
+    def test_other_worker_sees_write_after_version_change(self, db_session):
+        worker_a = SettingsRegistry(check_interval=0)
+        worker_b = SettingsRegistry(check_interval=0)
+
+        assert worker_b.get(db_session, "items_per_page") == 20
+
+        worker_a.set(db_session, "items_per_page", 75)
+
+        assert worker_b.get(db_session, "items_per_page") == 75
+        assert worker_b.version == 1
@@ -0,0 +1,139 @@
+"""
+Tests untuk similarity index (k-NN /devices/{id}/similar)
+"""
+
+import asyncio
+import random
+
+import httpx
+import numpy as np
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import models
+from app.core.deps import get_async_read_db
+from app.database import Base, to_async_url
+from app.services.similarity_index import SimilarityIndex, brute_force_neighbors
+
+# Storage kosong ikut diuji (diisi median saat vektorisasi)
+STORAGE = ["64GB", "128GB", "256GB", "512GB", None]
+
+
+def assert_matches_brute_force(index, k):
+    vectors, categories, ids = index.snapshot()
+    for row, device_id in enumerate(ids.tolist()):
+        expected = brute_force_neighbors(vectors, categories, ids, row, k)
+        actual = index.similar(device_id, k)
+        assert [n for _, n in actual] == [n for _, n in expected]
+        assert np.allclose([d for d, _ in actual], [d for d, _ in expected])
+
+
+class TestSimilarityIndex:
+    """Hasil index sama dengan brute force, juga setelah update incremental"""
+
+    def test_rebuild_matches_brute_force(self, random_phone):
+        rng = random.Random(1)
+        index = SimilarityIndex(k=5)
+        index.rebuild(random_phone(rng, i, storage=STORAGE) for i in range(1, 81))
+
+        assert_matches_brute_force(index, k=5)
+
+    def test_incremental_updates_match_brute_force(self, random_phone):
+        rng = random.Random(2)
+        phones = [random_phone(rng, i, storage=STORAGE) for i in range(1, 61)]
+        index = SimilarityIndex(k=5)
+        index.rebuild(phones[:40])
+
+        changes = {phone.id: index.entry_for(phone) for phone in phones[40:]}
+        for phone in phones[:5]:
+            phone.price = rng.randrange(1_000_000, 25_000_000, 10_000)
+            changes[phone.id] = index.entry_for(phone)
+        for phone in phones[10:15]:
+            changes[phone.id] = None
+        index.apply(changes)
+
+        assert len(index) == 55
+        assert index.similar(phones[10].id) is None
+        assert_matches_brute_force(index, k=5)
+
+    def test_many_rounds_of_inserts_and_deletes(self, random_phone):
+        rng = random.Random(3)
+        index = SimilarityIndex(k=4)
+        index.rebuild([])
+        live = []
+        for round_ in range(6):
+            start = round_ * 20 + 1
+            added = [random_phone(rng, i) for i in range(start, start + 20)]
+            removed = rng.sample(live, min(len(live), 8))
+            changes = {phone.id: index.entry_for(phone) for phone in added}
+            changes.update({device_id: None for device_id in removed})
+            index.apply(changes)
+            live = [d for d in live if d not in removed] + [p.id for p in added]
+
+            assert len(index) == len(live)
+            assert_matches_brute_force(index, k=4)
+
+    def test_only_same_category_and_identical_device_first(self):
+        base = dict(brand="Brand", ram="8GB", battery="5000 mAh", release_year=2024)
+        index = SimilarityIndex(k=3)
+        index.rebuild(
+            [
+                models.Phone(id=1, category_id=1, price=5_000_000, **base),
+                models.Phone(id=2, category_id=1, price=5_000_000, **base),
+                models.Phone(id=3, category_id=1, price=9_000_000, **base),
+                models.Phone(id=4, category_id=2, price=5_000_000, **base),
+            ]
+        )
+
+        assert index.similar(1) == [(0.0, 2), (index.similar(1)[1][0], 3)]
+        assert index.similar(4) == []
+
+
+class TestSimilarEndpoint:
+    """503 hanya saat cold start; device yang belum ter-index -> list kosong"""
+
+    def test_cold_start_and_unindexed_device(self, tmp_path, monkeypatch):
+        from app.main import app
+        from app.routers import devices
+
+        index = SimilarityIndex(k=3)
+        monkeypatch.setattr(index, "ensure_fresh", lambda: None)
+        monkeypatch.setattr(devices, "similarity_index", index)
+
+        async def scenario():
+            engine = create_async_engine(to_async_url(f"sqlite:///{tmp_path / 's.db'}"))
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            Session = async_sessionmaker(engine, expire_on_commit=False)
+            async with Session() as db:
+                phone = models.Phone(name="Baru", category_id=1, price=1_000_000)
+                db.add(phone)
+                await db.commit()
+
+            async def override():
+                async with Session() as db:
+                    yield db
+
+            app.dependency_overrides[get_async_read_db] = override
+            try:
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(
+                    transport=transport, base_url="http://test"
+                ) as client:
+                    cold = await client.get(f"/devices/{phone.id}/similar")
+                    # Index sudah dibangun, tapi tanpa device ini (worker lain)
+                    index.rebuild([])
+                    unindexed = await client.get(f"/devices/{phone.id}/similar")
+                    missing = await client.get("/devices/999/similar")
+                    return cold, unindexed, missing
+            finally:
+                app.dependency_overrides.pop(get_async_read_db, None)
+                await engine.dispose()
+
+        cold, unindexed, missing = asyncio.run(scenario())
+
+        assert cold.status_code == 503
+        assert cold.headers["retry-after"] == "5"
+        assert unindexed.status_code == 200
+        assert unindexed.json() == []
+        assert index.stale
+        assert missing.status_code == 404
@@ -0,0 +1,79 @@
+"""
+Tests untuk static asset pipeline (fingerprint + precompress)
+"""
+
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.core import static_assets
+from app.core.static_assets import PrecompressedStaticFiles, accepted_encodings
+
+CSS = b"body { color: #333; }\n" * 200
+
+
+@pytest.fixture
+def built(tmp_path, monkeypatch):
+    source = tmp_path / "static"
+    (source / "css").mkdir(parents=True)
+    (source / "images").mkdir()
+    (source / "css" / "style.css").write_bytes(CSS)
+    (source / "images" / "logo.png").write_bytes(b"\x89PNG" + bytes(range(256)))
+
+    target = tmp_path / "build"
+    monkeypatch.setattr(static_assets.config, "STATIC_BUILD_DIR", str(target))
+    monkeypatch.setattr(static_assets, "_manifest", None)
+    manifest = static_assets.build(source, target)
+
+    app = Starlette(
+        routes=[Mount("/static", PrecompressedStaticFiles(directory=str(target)))]
+    )
+    return manifest, target, TestClient(app)
+
+
+class TestStaticBuild:
+    """Nama ber-hash + manifest + varian terkompresi"""
+
+    def test_build_and_static_url(self, built):
+        manifest, target, _ = built
+        hashed = manifest["css/style.css"]
+
+        assert hashed.startswith("css/style.") and hashed.endswith(".css")
+        assert (target / hashed).read_bytes() == CSS
+        assert gzip.decompress((target / f"{hashed}.gz").read_bytes()) == CSS
+        # PNG tidak dikompres ulang
+        assert not (target / (manifest["images/logo.png"] + ".gz")).exists()
+        assert static_assets.static_url("/css/style.css") == f"/static/{hashed}"
+        assert static_assets.static_url("js/unknown.js") == "/static/js/unknown.js"
+
+
+class TestPrecompressedStaticFiles:
+    """Varian dipilih dari Accept-Encoding; file ber-hash immutable"""
+
+    def test_serves_precompressed_variant(self, built):
+        manifest, target, client = built
+        url = f"/static/{manifest['css/style.css']}"
+
+        compressed = client.get(url, headers={"Accept-Encoding": "br;q=0, gzip"})
+        plain = client.get(url, headers={"Accept-Encoding": "identity"})
+        original = client.get("/static/css/style.css")
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["content-type"].startswith("text/css")
+        assert compressed.headers["content-length"] == str(
+            (target / f"{manifest['css/style.css']}.gz").stat().st_size
+        )
+        assert compressed.content == CSS
+        assert compressed.headers["cache-control"].endswith("immutable")
+        assert compressed.headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in plain.headers
+        assert plain.content == CSS
+        assert original.headers["cache-control"] == "public, no-cache"
+
+    def test_accepted_encodings(self):
+        assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+        assert accepted_encodings("br;q=0, gzip;q=0.5") == {"gzip"}
+        assert accepted_encodings("") == set()
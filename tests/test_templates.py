@@ -0,0 +1,29 @@
+"""
+Tests untuk environment Jinja2 bersama (bytecode cache + precompile)
+"""
+
+from app.core import config
+from app.core import templates as core_templates
+
+
+class TestSharedTemplates:
+    """Semua router memakai 1 environment; precompile mengisi bytecode cache"""
+
+    def test_routers_share_environment(self):
+        from app.routers import frontend
+        from app.routers.admin import dashboard, devices
+
+        assert frontend.templates.env is core_templates.environment
+        assert devices.templates.env is core_templates.environment
+        assert dashboard.templates is core_templates.templates
+
+    def test_precompile_writes_bytecode_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "TEMPLATE_BYTECODE_CACHE_DIR", str(tmp_path))
+        env = core_templates.create_environment()
+
+        count = core_templates.precompile(env)
+
+        assert count == len(env.list_templates(extensions=["html"]))
+        assert len(list(tmp_path.iterdir())) == count
+        # Environment baru (worker lain) memuat bytecode yang sama
+        assert core_templates.create_environment().get_template("base.html")
@@ -0,0 +1,110 @@
+"""
+Tests untuk skor rekomendasi per use case
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from app import models
+from app.services import recommendation_service
+from app.services.catalog_events import IndexNotReady
+from app.services.use_case_scoring import UseCaseScoringIndex, use_case_index
+
+
+def full_scan(index, phones, use_case, category_id=None, max_price=None, limit=5):
+    """Baseline: filter dan urutkan semua device tanpa list top-K"""
+    candidates = [
+        (index.scores_for(p.id)[use_case], p.id)
+        for p in phones
+        if (category_id is None or p.category_id == category_id)
+        and (max_price is None or p.price <= max_price)
+    ]
+    return sorted(candidates, key=lambda item: (-item[0], item[1]))[:limit]
+
+
+class TestUseCaseScoring:
+    """Top-K per (use case, kategori, price band) sama dengan scan penuh"""
+
+    def test_weights_follow_use_case(self):
+        index = UseCaseScoringIndex()
+        base = dict(brand="Brand", category_id=1, release_year=2024, price=5_000_000)
+        index.rebuild(
+            [
+                models.Phone(id=1, name="Kamera", camera="200MP", ram="4GB", **base),
+                models.Phone(id=2, name="Gaming", camera="12MP", ram="16GB", **base),
+            ]
+        )
+
+        assert index.recommend("fotografi", limit=1) == [
+            (index.scores_for(1)["fotografi"], 1)
+        ]
+        assert index.recommend("gaming", limit=1)[0][1] == 2
+
+    def test_top_k_lists_match_full_scan_after_updates(self, random_phone):
+        rng = random.Random(3)
+        phones = [random_phone(rng, i) for i in range(1, 201)]
+        index = UseCaseScoringIndex(bands=[5_000_000, 12_000_000], top_k=5)
+        index.rebuild(phones[:150])
+
+        changes = {p.id: index.entry_for(p) for p in phones[150:]}
+        for phone in phones[:10]:
+            phone.camera = "300MP"
+            changes[phone.id] = index.entry_for(phone)
+        for phone in phones[20:30]:
+            changes[phone.id] = None
+        index.apply(changes)
+        alive = phones[:20] + phones[30:]
+
+        # limit 3: cukup dari list top-K, limit 8: perlu scan penuh
+        for use_case in ("gaming", "fotografi", "kuliah"):
+            for category_id in (None, 1):
+                for max_price in (None, 4_000_000, 15_000_000):
+                    for limit in (3, 8):
+                        assert index.recommend(
+                            use_case, category_id, max_price, limit=limit
+                        ) == full_scan(
+                            index, alive, use_case, category_id, max_price, limit
+                        )
+
+    def test_scored_recommendations_include_scores(self, db_session):
+        category = models.Category(name="Smartphone")
+        db_session.add(category)
+        db_session.flush()
+        db_session.add_all(
+            [
+                models.Phone(
+                    name=f"Phone {i}",
+                    category_id=category.id,
+                    battery=f"{4000 + i * 500} mAh",
+                    price=3_000_000,
+                )
+                for i in range(3)
+            ]
+        )
+        db_session.commit()
+        # Index global biasanya dibangun di background saat startup
+        use_case_index.rebuild(db_session.query(models.Phone))
+
+        result = recommendation_service.get_scored_recommendations(
+            db_session, use_case="kerja", limit=2
+        )
+
+        assert [item["device"].name for item in result] == ["Phone 2", "Phone 1"]
+        assert all(item["use_case"] == "kerja" for item in result)
+        assert np.all(np.diff([item["score"] for item in result]) <= 0)
+
+    def test_cold_start_schedules_rebuild_instead_of_blocking(
+        self, db_session, monkeypatch
+    ):
+        index = UseCaseScoringIndex()
+        scheduled = []
+        monkeypatch.setattr(index, "ensure_fresh", lambda: scheduled.append(1))
+        monkeypatch.setattr(recommendation_service, "use_case_index", index)
+
+        with pytest.raises(IndexNotReady):
+            recommendation_service.get_scored_recommendations(db_session)
+
+        assert scheduled == [1]
+        assert index.built_at is None
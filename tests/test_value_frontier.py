@@ -0,0 +1,92 @@
+"""
+Tests untuk Pareto frontier harga vs performa (/recommendation/best-value)
+"""
+
+import random
+
+from app import models
+from app.services.value_frontier import ValueFrontierIndex
+
+# Spesifikasi dan harga kasar supaya banyak device kembar / berharga sama
+COARSE_SPECS = {
+    "camera": lambda rng: f"{rng.choice([12, 48, 50, 108])}MP",
+    "battery": lambda rng: f"{rng.choice([4000, 5000, 6000])} mAh",
+    "screen": '6.5"',
+    "price": lambda rng: rng.randrange(1_000_000, 15_000_000, 1_000_000),
+    "release_year": lambda rng: rng.randint(2021, 2024),
+}
+
+
+def brute_force_frontier(index, phones, category_id):
+    """Baseline: bandingkan setiap pasangan device (O(n^2))"""
+    points = [
+        (float(p.price), index.performance_of(p.id), p.id)
+        for p in phones
+        if p.category_id == category_id and p.price is not None
+    ]
+    frontier = []
+    for price, performance, device_id in points:
+        dominated = any(
+            other_price <= price and other_performance >= performance
+            # Kembar (harga dan performa sama): ID terkecil yang disimpan
+            and (other_price, -other_performance, other_id)
+            < (price, -performance, device_id)
+            for other_price, other_performance, other_id in points
+        )
+        if not dominated:
+            frontier.append((performance, price, device_id))
+    return sorted(frontier, key=lambda item: item[1])
+
+
+class TestValueFrontier:
+    """Frontier per kategori sama dengan pengecekan dominasi brute force"""
+
+    def test_cheaper_and_faster_device_dominates(self):
+        index = ValueFrontierIndex()
+        base = dict(brand="Brand", category_id=1, release_year=2024)
+        index.rebuild(
+            [
+                models.Phone(id=1, name="Murah", ram="4GB", price=2_000_000, **base),
+                models.Phone(id=2, name="Kalah", ram="4GB", price=3_000_000, **base),
+                models.Phone(id=3, name="Kencang", ram="16GB", price=6_000_000, **base),
+                models.Phone(id=4, name="Tanpa Harga", ram="16GB", **base),
+            ]
+        )
+
+        assert [item[2] for item in index.frontier(1)] == [1, 3]
+        assert [item[2] for item in index.best_value(max_price=5_000_000)] == [1]
+        assert [item[2] for item in index.best_value()] == [3, 1]
+
+    def test_frontier_matches_brute_force_after_updates(self, random_phone):
+        rng = random.Random(11)
+        phones = [random_phone(rng, i, **COARSE_SPECS) for i in range(1, 301)]
+        index = ValueFrontierIndex()
+        index.rebuild(phones[:200])
+
+        changes = {p.id: index.entry_for(p) for p in phones[200:]}
+        for phone in phones[:15]:
+            phone.ram = "16GB"
+            phone.price = 1_000_000
+            changes[phone.id] = index.entry_for(phone)
+        for phone in phones[15:25]:
+            phone.category_id = 3 - phone.category_id
+            changes[phone.id] = index.entry_for(phone)
+        for phone in phones[40:60]:
+            changes[phone.id] = None
+        index.apply(changes)
+        alive = phones[:40] + phones[60:]
+
+        for category_id in (1, 2):
+            expected = brute_force_frontier(index, alive, category_id)
+            assert index.frontier(category_id) == expected
+
+            for max_price in (500_000, 3_000_000, 8_000_000, None):
+                within = [
+                    item
+                    for item in expected
+                    if max_price is None or item[1] <= max_price
+                ]
+                assert (
+                    index.best_value(max_price, category_id, limit=3)
+                    == sorted(within, key=lambda item: (-item[0], item[1], item[2]))[:3]
+                )